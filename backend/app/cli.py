@@ -0,0 +1,86 @@
+import argparse
+import sys
+from datetime import datetime
+from backend.app.database import engine
+
+def import_loads(args):
+    from backend.app.services.load_import import detect_format, import_file
+    fmt = args.format or detect_format(args.path)
+    with open(args.path, "rb") as stream:
+        report = import_file(engine, stream, fmt, args.batch_size)
+    print(f"{report['inserted']} of {report['rows']} rows imported, {report['failed']} failed")
+    for error in report["errors"]:
+        print(f"  row {error['row']}: {error['error']}", file=sys.stderr)
+    return 1 if report["failed"] else 0
+
+def recalculate_detention(args):
+    import json
+    from backend.app.services.detention_recalc import recalculate
+    report = recalculate(
+        engine, shipper_name=args.shipper, start_date=args.start_date, end_date=args.end_date,
+        free_time_minutes=args.free_time_minutes, detention_rate=args.detention_rate,
+        dry_run=not args.apply, verify=args.verify, chunk_size=args.chunk_size)
+    print(json.dumps(report, indent=2))
+    return 0
+
+def check_earnings(args):
+    import json
+    from backend.app.services.driver_earnings import check_earnings as check
+    mismatches = check(engine, repair=args.repair)
+    for mismatch in mismatches:
+        print(json.dumps(mismatch))
+    if not mismatches:
+        print("Earnings ledger matches detention events")
+    elif args.repair:
+        print(f"{len(mismatches)} ledger rows repaired")
+        return 0
+    return 1 if mismatches else 0
+
+def rebuild_scorecards(args):
+    from backend.app.services.shipper_scorecards import rebuild_scorecards as rebuild
+    with engine.begin() as connection:
+        events = rebuild(connection)
+    print(f"Shipper scorecards rebuilt from {events} completed events")
+    return 0
+
+def main(argv=None):
+    from backend.app.services.load_import import DEFAULT_BATCH_SIZE
+    parser = argparse.ArgumentParser(prog="python -m backend.app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    loads = commands.add_parser("import-loads", help="bulk import loads from CSV or NDJSON")
+    loads.add_argument("path")
+    loads.add_argument("--format", choices=["csv", "ndjson"])
+    loads.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    loads.set_defaults(handler=import_loads)
+
+    recalc = commands.add_parser(
+        "recalculate-detention",
+        help="recompute detention minutes/amounts for completed events (dry run unless --apply)")
+    recalc.add_argument("--shipper", help="only events on this shipper's loads")
+    recalc.add_argument("--start-date", type=datetime.fromisoformat)
+    recalc.add_argument("--end-date", type=datetime.fromisoformat)
+    recalc.add_argument("--free-time-minutes", type=int, help="new contract free time")
+    recalc.add_argument("--detention-rate", type=float, help="new contract hourly rate")
+    recalc.add_argument("--apply", action="store_true", help="write the changes")
+    recalc.add_argument("--verify", action="store_true",
+                        help="check every row against calculate_detention")
+    recalc.add_argument("--chunk-size", type=int, default=50_000)
+    recalc.set_defaults(handler=recalculate_detention)
+
+    earnings = commands.add_parser(
+        "check-earnings", help="verify the driver earnings ledger against detention events")
+    earnings.add_argument("--repair", action="store_true",
+                          help="overwrite drifted ledger rows with recomputed totals")
+    earnings.set_defaults(handler=check_earnings)
+
+    scorecards = commands.add_parser(
+        "rebuild-scorecards",
+        help="recompute shipper dwell-time sketches, e.g. after renaming a shipper")
+    scorecards.set_defaults(handler=rebuild_scorecards)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""
+Conditional GETs for tables that change rarely.
+
+Every write to a versioned table bumps its row in table_versions inside the
+same transaction, so the version doubles as a validator for every list and
+detail response built from that table. The check runs as a route dependency
+before the handler: a matching If-None-Match costs one primary-key lookup and
+never touches the table itself. The version lives in the database, so all
+workers agree on it.
+"""
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from backend.app import models
+from backend.app.database import get_db
+
+# Bump when the response schema of a versioned table changes, so clients
+# holding a representation from an older deploy are not told it is current.
+REPRESENTATION_VERSION = 1
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+def _not_modified_since(if_modified_since: str, last_modified: datetime) -> bool:
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP dates have whole-second precision
+    return last_modified.replace(microsecond=0) <= since
+
+def bump_version(db: Session, table: str):
+    """Invalidate cached GETs of table; call before the write's commit."""
+    version = models.TableVersion
+    db.execute(update(version).where(version.table_name == table).values(
+        version=version.version + 1, updated_at=datetime.now(timezone.utc)))
+
+def conditional_get(table: str):
+    """Route dependency answering If-None-Match/If-Modified-Since from table's version."""
+    def check(request: Request, response: Response, db: Session = Depends(get_db)):
+        row = db.execute(
+            select(models.TableVersion.version, models.TableVersion.updated_at)
+            .where(models.TableVersion.table_name == table)
+        ).first()
+        if row is None:
+            return  # not seeded yet; serve without validators
+        last_modified = row.updated_at
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        headers = {
+            "ETag": f'"{table}-{REPRESENTATION_VERSION}-{row.version}"',
+            "Last-Modified": format_datetime(last_modified, usegmt=True),
+            "Cache-Control": "private, no-cache",
+        }
+        if_none_match = request.headers.get("if-none-match")
+        if etag_matches(if_none_match, headers["ETag"]) or (
+                if_none_match is None
+                and _not_modified_since(request.headers.get("if-modified-since"), last_modified)):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+    return check
@@ -1,10 +1,52 @@
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    # Optional async driver URL (e.g. postgresql+asyncpg://..., sqlite+aiosqlite:///...).
+    # When set, the hot endpoints are served from AsyncSession handlers.
+    ASYNC_DATABASE_URL: Optional[str] = None
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    DEFAULT_PAGE_SIZE: int = 100
+    MAX_PAGE_SIZE: int = 500
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536  # KiB
+    ARGON2_PARALLELISM: int = 4
+    PASSWORD_HASH_CONCURRENCY: int = 2
+    PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS: float = 5.0
+    REPORT_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    REPORT_RENDER_WORKERS: int = 2
+    SYNC_MAX_OPERATIONS: int = 500
+    SYNC_MAX_OFFLINE_HOURS: int = 72
+    SYNC_MAX_CLOCK_SKEW_SECONDS: int = 300
+    SERVER_TIMING_ENABLED: bool = True
+    SLOW_QUERY_MS: float = 200.0
+    SLOW_REQUEST_MS: float = 1000.0
+    SLOW_REQUEST_QUERY_COUNT: int = 50
+    METRICS_GAUGE_RESYNC_SECONDS: int = 300
+    MIGRATE_ON_STARTUP: bool = False
+    WARMUP_ON_STARTUP: bool = True
+    WARMUP_DB_CONNECTIONS: int = 2
+    ARCHIVE_RETENTION_DAYS: int = 180
+    ARCHIVE_INTERVAL_SECONDS: int = 3600
+    ARCHIVE_BATCH_SIZE: int = 1000
+    DETENTION_TIMER_CATCHUP_SECONDS: int = 300
+    DETENTION_TIMER_RESYNC_SECONDS: int = 300
+    DETENTION_WEBHOOK_URLS: str = ""  # comma-separated
+    DETENTION_WEBHOOK_SECRET: str = ""
+    WEBHOOK_WORKERS: int = 4
+    WEBHOOK_QUEUE_SIZE: int = 10000
+    WEBHOOK_TIMEOUT_SECONDS: float = 5.0
+    WEBHOOK_MAX_ATTEMPTS: int = 3
 
     class Config:
         env_file = ".env"
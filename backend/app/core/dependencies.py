@@ -1,30 +1,113 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from backend.app.database import get_db
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+from backend.app.database import get_async_db, get_db
 from backend.app import models
+from backend.app.core.cache import TTLCache
+from backend.app.core.config import settings
 from backend.app.core.security import decode_access_token
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+@dataclass(frozen=True)
+class Principal:
+    """The parts of a User that authorization needs, safe to share across requests."""
+    id: int
+    email: str
+    role: str
+    driver_id: Optional[int]
+    is_active: bool
+
+# Keyed by raw bearer token; entries never outlive the token's own expiry
+principal_cache = TTLCache(maxsize=settings.PRINCIPAL_CACHE_SIZE,
+                           ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS)
+# Session.info key for the users a transaction has changed
+_CHANGED_USERS = "principal_cache_changed_users"
+
+def invalidate_user(user_id: int) -> int:
+    return principal_cache.invalidate_where(lambda principal: principal.id == user_id)
+
+@event.listens_for(models.User, "after_update")
+@event.listens_for(models.User, "after_delete")
+def _evict_changed_user(mapper, connection, target):
+    # Evicting at flush time is not enough: until the commit, other requests
+    # still read the old row and may cache it again. So evict once more after
+    # the commit makes the change visible.
+    invalidate_user(target.id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_CHANGED_USERS, set()).add(target.id)
+
+@event.listens_for(Session, "after_commit")
+def _evict_committed_users(session):
+    for user_id in session.info.pop(_CHANGED_USERS, ()):
+        invalidate_user(user_id)
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_users(session):
+    session.info.pop(_CHANGED_USERS, None)
+
+def _decode_token(token: str) -> dict:
     payload = decode_access_token(token)
     if payload is None:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
-    email = payload.get("sub")
-    if email is None:
+    if payload.get("sub") is None:
         raise HTTPException(status_code=401, detail="Invalid token")
-    user = db.query(models.User).filter(models.User.email == email).first()
+    return payload
+
+def _remember_principal(token: str, payload: dict, user, generation: int) -> Principal:
     if user is None:
         raise HTTPException(status_code=401, detail="User not found")
-    return user
+    if not user.is_active:
+        raise HTTPException(status_code=401, detail="Inactive user")
+    principal = Principal(id=user.id, email=user.email, role=user.role,
+                          driver_id=user.driver_id, is_active=user.is_active)
+    expires_in = payload["exp"] - datetime.now(timezone.utc).timestamp()
+    # Not cached if the user may have changed while it was being looked up
+    principal_cache.set(token, principal, ttl=expires_in, generation=generation)
+    return principal
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+    payload = _decode_token(token)
+    generation = principal_cache.generation
+    user = db.query(models.User).filter(models.User.email == payload["sub"]).first()
+    return _remember_principal(token, payload, user, generation)
+
+def get_stream_user(token: str = Depends(oauth2_scheme),
+                    db: Session = Depends(get_db, scope="function")):
+    # For streaming responses: get_db's default request scope would keep its
+    # connection checked out until the last byte is sent, so this session is
+    # closed as soon as the handler returns
+    return get_current_user(token, db)
 
-def require_dispatcher(current_user: models.User = Depends(get_current_user)):
+async def get_current_user_async(token: str = Depends(oauth2_scheme),
+                                 db: AsyncSession = Depends(get_async_db)):
+    # Installed over get_current_user by main.py when ASYNC_DATABASE_URL is set
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+    payload = _decode_token(token)
+    generation = principal_cache.generation
+    result = await db.execute(select(models.User).where(models.User.email == payload["sub"]))
+    return _remember_principal(token, payload, result.scalars().first(), generation)
+
+def require_dispatcher(current_user: Principal = Depends(get_current_user)):
     if current_user.role != "dispatcher":
         raise HTTPException(status_code=403, detail="Dispatcher access required")
     return current_user
 
-def require_driver(current_user: models.User = Depends(get_current_user)):
+def require_driver(current_user: Principal = Depends(get_current_user)):
     if current_user.role != "driver":
         raise HTTPException(status_code=403, detail="Driver access required")
-    return current_user
\ No newline at end of file
+    return current_user
+
+def require_stream_dispatcher(current_user: Principal = Depends(get_stream_user)):
+    return require_dispatcher(current_user)
@@ -19,4 +19,12 @@ class UnauthorizedError(HTTPException):
         super().__init__(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Not authorized"
+        )
+
+class ServiceBusyError(HTTPException):
+    def __init__(self, retry_after: int = 1):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Service busy, please retry",
+            headers={"Retry-After": str(retry_after)}
         )
\ No newline at end of file
@@ -0,0 +1,46 @@
+from typing import Literal, Optional
+from fastapi import Query, Response
+from backend.app.core.config import settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+class PageParams:
+    """Keyset pagination parameters shared by the list endpoints."""
+
+    def __init__(
+        self,
+        cursor: Optional[int] = Query(None, description="Last id seen on the previous page"),
+        limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+        order: Literal["asc", "desc"] = Query("asc", description="desc pages from the newest id down"),
+    ):
+        self.cursor = cursor
+        self.limit = limit
+        self.order = order
+
+    def seek(self, column):
+        """The keyset condition for rows after the cursor in this page's order."""
+        return column < self.cursor if self.order == "desc" else column > self.cursor
+
+    def ordering(self, column):
+        return column.desc() if self.order == "desc" else column
+
+def _trim_page(rows, column, page: PageParams, response: Response):
+    if len(rows) > page.limit:
+        rows = rows[:page.limit]
+        response.headers[NEXT_CURSOR_HEADER] = str(getattr(rows[-1], column.key))
+    return rows
+
+def paginate(query, column, page: PageParams, response: Response):
+    # Seek past the cursor on an indexed, monotonically increasing column so the
+    # cost of a page depends on its size, never on how deep into the table it is.
+    if page.cursor is not None:
+        query = query.filter(page.seek(column))
+    rows = query.order_by(page.ordering(column)).limit(page.limit + 1).all()
+    return _trim_page(rows, column, page, response)
+
+async def paginate_async(db, stmt, column, page: PageParams, response: Response):
+    """paginate() for a select() statement on an AsyncSession."""
+    if page.cursor is not None:
+        stmt = stmt.where(page.seek(column))
+    result = await db.execute(stmt.order_by(page.ordering(column)).limit(page.limit + 1))
+    return _trim_page(result.scalars().all(), column, page, response)
@@ -0,0 +1,196 @@
+import functools
+import inspect
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+from backend.app.core.config import settings
+from backend.app.core.metrics import http_request_duration, http_requests, http_requests_in_flight
+
+logger = logging.getLogger(__name__)
+
+class RequestTimings:
+    """Where one request spent its time; filled in by the hooks below."""
+
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.render_seconds = 0.0
+        self.endpoint_returned = None
+
+    @property
+    def route_template(self) -> str:
+        # Templates, not raw paths, keep label cardinality bounded
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or "unmatched"
+
+    @property
+    def route_name(self) -> str:
+        route = self.scope.get("route")
+        return getattr(route, "name", None) or self.scope.get("path", "?")
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def server_timing(self) -> str:
+        return ", ".join([
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.queries} queries"',
+            f"serialize;dur={self.serialize_seconds * 1000:.1f}",
+            f"render;dur={self.render_seconds * 1000:.1f}",
+            f"total;dur={self.elapsed_ms():.1f}",
+        ])
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+@contextmanager
+def track(phase: str):
+    """Add the time spent in the block to the current request's phase."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings = _current.get()
+        if timings is not None:
+            attribute = f"{phase}_seconds"
+            setattr(timings, attribute, getattr(timings, attribute) + time.perf_counter() - started)
+
+# --- SQL ---
+
+def parameter_shape(parameters, executemany: bool = False) -> str:
+    """Describe bound parameters by name and type, never by value."""
+    if executemany and parameters:
+        return f"{len(parameters)} x {parameter_shape(parameters[0])}"
+    if isinstance(parameters, dict):
+        shape = "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in parameters.items()) + "}"
+    elif isinstance(parameters, (list, tuple)):
+        shape = "(" + ", ".join(type(value).__name__ for value in parameters) + ")"
+    else:
+        shape = type(parameters).__name__
+    return shape if len(shape) <= 200 else shape[:197] + "..."
+
+def instrument_engine(engine):
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context.query_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        seconds = time.perf_counter() - context.query_started
+        timings = _current.get()
+        if timings is not None:
+            timings.queries += 1
+            timings.db_seconds += seconds
+        if seconds * 1000 >= settings.SLOW_QUERY_MS:
+            logger.warning(
+                "Slow query %.1fms route=%s params=%s sql=%s", seconds * 1000,
+                timings.route_name if timings else "-", parameter_shape(parameters, executemany),
+                " ".join(statement.split())[:500])
+
+# --- Serialization ---
+
+def _mark_return(endpoint):
+    # Records when the endpoint itself returned, so the rest of the route
+    # handler (response_model validation, jsonable_encoder, JSON rendering)
+    # can be attributed to serialization
+    def returned(result):
+        timings = _current.get()
+        if timings is not None:
+            timings.endpoint_returned = (time.perf_counter(), timings.db_seconds)
+        return result
+
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def timed(*args, **kwargs):
+            return returned(await endpoint(*args, **kwargs))
+    else:
+        @functools.wraps(endpoint)
+        def timed(*args, **kwargs):
+            return returned(endpoint(*args, **kwargs))
+    return timed
+
+class TimedRoute(APIRoute):
+    """APIRoute that reports its serialization time to the current request."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, _mark_return(endpoint), **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            response = await handler(request)
+            timings = _current.get()
+            if timings is not None and timings.endpoint_returned is not None:
+                returned_at, db_seconds = timings.endpoint_returned
+                # Lazy loads triggered while encoding already count as db time
+                timings.serialize_seconds += (
+                    time.perf_counter() - returned_at - (timings.db_seconds - db_seconds))
+                timings.endpoint_returned = None
+            return response
+
+        return timed_handler
+
+# --- Middleware ---
+
+class ServerTimingMiddleware:
+    """
+    Times each HTTP request, adds a Server-Timing header broken down into
+    db/serialize/render/total, records the request metrics served on
+    /metrics, and logs requests that are slow or issue more queries than
+    SLOW_REQUEST_QUERY_COUNT.
+
+    Work done while a streaming body is being sent happens after the header
+    has gone out; it still counts towards the slow-request log.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings(scope)
+        token = _current.set(timings)
+        response = {"status": None, "streaming": False}
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                response["status"] = message["status"]
+                response["streaming"] = headers.get("content-type", "").startswith("text/event-stream")
+                if settings.SERVER_TIMING_ENABLED:
+                    headers.append("Server-Timing", timings.server_timing())
+            await send(message)
+
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            http_requests_in_flight.dec()
+            method, route = scope["method"], timings.route_template
+            http_requests.inc(method=method, route=route, status=str(response["status"] or 500))
+            # Event streams stay open on purpose; their duration is not latency
+            if not response["streaming"]:
+                http_request_duration.observe(timings.elapsed_ms() / 1000, method=method, route=route)
+                self._log_if_slow(timings, method, response["status"])
+
+    @staticmethod
+    def _log_if_slow(timings: RequestTimings, method: str, status):
+        elapsed_ms = timings.elapsed_ms()
+        if elapsed_ms < settings.SLOW_REQUEST_MS and timings.queries <= settings.SLOW_REQUEST_QUERY_COUNT:
+            return
+        logger.warning(
+            "Slow request %s %s route=%s status=%s total=%.1fms db=%.1fms queries=%d "
+            "serialize=%.1fms render=%.1fms", method, timings.scope.get("path"),
+            timings.route_name, status, elapsed_ms, timings.db_seconds * 1000, timings.queries,
+            timings.serialize_seconds * 1000, timings.render_seconds * 1000)
@@ -1,15 +1,122 @@
-from sqlalchemy import create_engine
+import threading
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 from backend.app.core.config import settings
+from backend.app.core.metrics import Collected, registry
+from backend.app.core.timing import instrument_engine
 
-engine = create_engine(settings.DATABASE_URL)
+class PoolStats:
+    """Counters fed by pool events; read through pool_stats()."""
 
-SessionLocal = sessionmaker(
-    autocommit=False,
-    autoflush=False,
-    bind=engine
-)
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.connects = 0
+            self.checkouts = 0
+            self.checkins = 0
+            self.invalidations = 0
+            self.timeouts = 0
+            self.overflow_checkouts = 0
+            self.max_overflow_seen = 0
+            self.wait_seconds_total = 0.0
+            self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def increment(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def record_overflow(self, overflow: int):
+        with self._lock:
+            if overflow > 0:
+                self.overflow_checkouts += 1
+            self.max_overflow_seen = max(self.max_overflow_seen, overflow)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "overflow_checkouts": self.overflow_checkouts,
+                "max_overflow_seen": self.max_overflow_seen,
+                "wait_ms_total": round(self.wait_seconds_total * 1000, 2),
+                "wait_ms_avg": round(self.wait_seconds_total * 1000 / self.checkouts, 3)
+                if self.checkouts else 0.0,
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 2),
+            }
+
+stats = PoolStats()
+
+class InstrumentedQueuePool(QueuePool):
+    # Pool events fire only once a connection has been handed out, so the
+    # time spent queueing for one is measured around the pool's own getter.
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            stats.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        stats.record_wait(time.perf_counter() - started)
+        stats.record_overflow(self.overflow())
+        return connection
+
+def _pool_options(url: str) -> dict:
+    url = make_url(url)
+    # In-memory SQLite keeps one connection per thread and takes no sizing
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+def _instrument(pool_owner):
+    @event.listens_for(pool_owner, "connect")
+    def _connect(dbapi_connection, connection_record):
+        stats.increment("connects")
+
+    @event.listens_for(pool_owner, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        stats.increment("checkouts")
+
+    @event.listens_for(pool_owner, "checkin")
+    def _checkin(dbapi_connection, connection_record):
+        stats.increment("checkins")
+
+    @event.listens_for(pool_owner, "invalidate")
+    def _invalidate(dbapi_connection, connection_record, exception):
+        stats.increment("invalidations")
+
+_engine_options = _pool_options(settings.DATABASE_URL)
+if _engine_options:
+    _engine_options["poolclass"] = InstrumentedQueuePool
+
+engine = create_engine(settings.DATABASE_URL, **_engine_options)
+_instrument(engine)
+instrument_engine(engine)
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
@@ -20,27 +127,52 @@ def get_db():
     finally:
         db.close()
 
+def pool_stats() -> dict:
+    pool = engine.pool
+    live = {"class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        live.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "max_overflow": pool._max_overflow,
+            "timeout_seconds": pool.timeout(),
+        })
+    return {"pool": live, "events": stats.snapshot()}
 
-# 👇 THIS is what is missing
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+def _pool_metric(name: str, documentation: str, read, type: str = "gauge"):
+    def collect():
+        pool = engine.pool
+        return read(pool) if isinstance(pool, QueuePool) else None
+    registry.register(Collected(name, documentation, collect, type=type))
 
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from backend.app.core.config import settings
+_pool_metric("db_pool_size", "Connections the pool keeps open.", lambda pool: pool.size())
+_pool_metric("db_pool_checked_out", "Connections currently in use.", lambda pool: pool.checkedout())
+_pool_metric("db_pool_overflow", "Connections open beyond pool_size.", lambda pool: max(pool.overflow(), 0))
+_pool_metric("db_pool_checkouts_total", "Connection checkouts.",
+             lambda pool: stats.checkouts, type="counter")
+_pool_metric("db_pool_timeouts_total", "Checkouts that timed out waiting for a connection.",
+             lambda pool: stats.timeouts, type="counter")
+_pool_metric("db_pool_wait_seconds_total", "Time spent waiting for a connection.",
+             lambda pool: stats.wait_seconds_total, type="counter")
 
-engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
+# --- Optional async session path (enabled by ASYNC_DATABASE_URL) ---
 
-def get_db():
-    db = SessionLocal()
-    try:
+async_engine = (
+    create_async_engine(settings.ASYNC_DATABASE_URL, **_pool_options(settings.ASYNC_DATABASE_URL))
+    if settings.ASYNC_DATABASE_URL else None
+)
+if async_engine is not None:
+    _instrument(async_engine.sync_engine)
+    instrument_engine(async_engine.sync_engine)
+# expire_on_commit=False: attribute access after commit must not trigger an
+# implicit (sync) refresh on an AsyncSession
+AsyncSessionLocal = (
+    async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+    if async_engine is not None else None
+)
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
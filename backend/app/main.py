@@ -1,13 +1,56 @@
+import logging
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from backend.app.database import Base, engine
-from backend.app import models
-from backend.app.routers import shipments, drivers, warehouses, customers, auth
+from backend.app.database import engine
+from backend.app import migrations
+from backend.app.core.config import settings
+from backend.app.core.dependencies import get_current_user, get_current_user_async
+from backend.app.core.pagination import NEXT_CURSOR_HEADER
+from backend.app.core.security import shutdown_hash_pool
+from backend.app.core.timing import ServerTimingMiddleware, TimedRoute
+from backend.app.services.detention_archive import start_archiver, stop_archiver
+from backend.app.services.detention_report import shutdown_render_pool
+from backend.app.services.detention_timers import detention_timers
+from backend.app.services.webhooks import webhooks
+from backend.app.routers import (
+    shipments, drivers, warehouses, customers, auth, async_routes, loads, detention, system
+)
+from backend.app.warmup import warm_up
+
+logger = logging.getLogger(__name__)
+
+# Global error handler
+async def global_exception_handler(request: Request, exc: Exception):
+    return JSONResponse(
+        status_code=500,
+        content={"detail": "An unexpected error occurred"}
+    )
+
+async def prepare_worker():
+    # Runs before uvicorn starts accepting connections. The schema is normally
+    # brought up to date by `python -m backend.app.migrations upgrade` at
+    # deploy time, not by every worker that boots.
+    if settings.MIGRATE_ON_STARTUP:
+        await run_in_threadpool(migrations.upgrade, engine)
+    if settings.WARMUP_ON_STARTUP:
+        logger.info("Warm-up finished: %s", await warm_up())
+    start_archiver()
+    webhooks.start()
+    await detention_timers.start()
+
+def stop_worker_pools():
+    stop_archiver()
+    detention_timers.stop()
+    webhooks.stop()
+    shutdown_hash_pool()
+    shutdown_render_pool()
 
-app = FastAPI(
-    title="Logistics Management API",
-    description="""
+def create_app() -> FastAPI:
+    app = FastAPI(
+        title="Logistics Management API",
+        description="""
     A professional logistics management system API.
     
     ## Features
@@ -17,52 +60,56 @@ app = FastAPI(
     * **Customers** — Manage customer records
     * **Authentication** — JWT-based secure login system
     """,
-    version="1.0.0",
-    contact={
-        "name": "Aymen Berkani",
-        "email": "your-email@example.com",
-    },
-    license_info={
-        "name": "MIT",
-    },
-    redirect_slashes=False,
-)
+        version="1.0.0",
+        contact={
+            "name": "Aymen Berkani",
+            "email": "your-email@example.com",
+        },
+        license_info={
+            "name": "MIT",
+        },
+        redirect_slashes=False,
+        # Response models are validated and dumped by each route's pydantic
+        # TypeAdapter; orjson only has to encode the resulting plain data
+        default_response_class=ORJSONResponse,
+    )
 
-# CORS must be added before anything else
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=[
-        "http://localhost:5173",
-        "http://localhost:3000",
-        "https://logistics-management-app.vercel.app"
-    ],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+    # CORS must be added before anything else
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=[
+            "http://localhost:5173",
+            "http://localhost:3000",
+            "https://logistics-management-app.vercel.app"
+        ],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
+    )
 
-# Create all database tables
-Base.metadata.create_all(bind=engine)
+    # Outermost, so the timing covers every other middleware too
+    app.add_middleware(ServerTimingMiddleware)
+    app.router.route_class = TimedRoute
 
-# Register routers
-app.include_router(shipments.router)
-app.include_router(drivers.router)
-app.include_router(warehouses.router)
-app.include_router(customers.router)
-app.include_router(auth.router)
+    # Async hot paths take precedence over their sync twins when configured
+    if settings.ASYNC_DATABASE_URL:
+        app.include_router(async_routes.router)
+        app.dependency_overrides[get_current_user] = get_current_user_async
 
-# Global error handler
-@app.exception_handler(Exception)
-async def global_exception_handler(request: Request, exc: Exception):
-    return JSONResponse(
-        status_code=500,
-        content={"detail": "An unexpected error occurred"}
-    )
+    # Register routers
+    app.include_router(shipments.router)
+    app.include_router(drivers.router)
+    app.include_router(warehouses.router)
+    app.include_router(customers.router)
+    app.include_router(auth.router)
+    app.include_router(system.router)
+    app.include_router(loads.router)
+    app.include_router(detention.router)
 
-@app.get("/")
-def root():
-    return {"message": "Logistics API running 🚀"}
+    app.add_exception_handler(Exception, global_exception_handler)
+    app.add_event_handler("startup", prepare_worker)
+    app.add_event_handler("shutdown", stop_worker_pools)
+    return app
 
-from backend.app.routers import loads, detention
-app.include_router(loads.router)
-app.include_router(detention.router)
\ No newline at end of file
+app = create_app()
@@ -0,0 +1,83 @@
+"""Tables as they existed when migrations were introduced."""
+from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Integer, MetaData, String, Table, func
+
+# Frozen copy of models.py just before this migration, i.e. what create_all
+# used to build. Later schema changes belong in later migrations.
+metadata = MetaData()
+
+Table(
+    "drivers", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String, index=True),
+    Column("phone", String),
+    Column("license_number", String, unique=True),
+)
+
+Table(
+    "warehouses", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String, index=True),
+    Column("location", String),
+    Column("capacity", Integer),
+)
+
+Table(
+    "customers", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String, index=True),
+    Column("email", String, unique=True),
+    Column("phone", String),
+)
+
+Table(
+    "users", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("email", String, unique=True, index=True),
+    Column("username", String, unique=True, index=True),
+    Column("hashed_password", String),
+    Column("is_active", Boolean),
+    Column("role", String),
+    Column("driver_id", Integer, ForeignKey("drivers.id"), nullable=True),
+)
+
+Table(
+    "shipments", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("origin", String, index=True),
+    Column("destination", String, index=True),
+    Column("status", String, index=True),
+    Column("driver_id", Integer, ForeignKey("drivers.id"), nullable=True, index=True),
+    Column("warehouse_id", Integer, ForeignKey("warehouses.id"), nullable=True),
+    Column("customer_id", Integer, ForeignKey("customers.id"), nullable=True),
+)
+
+Table(
+    "loads", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("load_number", String, unique=True, index=True),
+    Column("shipper_name", String, index=True),
+    Column("shipper_address", String),
+    Column("driver_id", Integer, ForeignKey("drivers.id"), nullable=True, index=True),
+    Column("shipment_id", Integer, ForeignKey("shipments.id"), nullable=True),
+    Column("status", String, index=True),
+    Column("created_at", DateTime, server_default=func.now()),
+)
+
+Table(
+    "detention_events", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("load_id", Integer, ForeignKey("loads.id")),
+    Column("driver_id", Integer, ForeignKey("drivers.id")),
+    Column("checkin_time", DateTime, nullable=False),
+    Column("checkout_time", DateTime, nullable=True),
+    Column("free_time_minutes", Integer),
+    Column("detention_rate", Float),
+    Column("detention_minutes", Integer),
+    Column("detention_amount", Float),
+    Column("status", String),
+    Column("notes", String, nullable=True),
+    Column("payment_status", String),
+)
+
+def upgrade(connection):
+    metadata.create_all(bind=connection, checkfirst=True)
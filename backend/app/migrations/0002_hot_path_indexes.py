@@ -0,0 +1,30 @@
+"""Indexes for the detention hot paths and the list endpoint filters."""
+from sqlalchemy import text
+
+# Plain DDL so the migration does not change if the models do later.
+# Partial indexes (WHERE ...) are supported by both PostgreSQL and SQLite.
+INDEXES = [
+    # get_by_driver and per-driver date ranges
+    "CREATE INDEX IF NOT EXISTS ix_detention_events_driver_checkin "
+    "ON detention_events (driver_id, checkin_time)",
+    # get_by_load
+    "CREATE INDEX IF NOT EXISTS ix_detention_events_load_id ON detention_events (load_id)",
+    # date-range filters on stats, payment requests and exports
+    "CREATE INDEX IF NOT EXISTS ix_detention_events_checkin_time ON detention_events (checkin_time)",
+    "CREATE INDEX IF NOT EXISTS ix_detention_events_payment_checkin "
+    "ON detention_events (payment_status, checkin_time)",
+    # get_active: only the live working set is indexed
+    "CREATE INDEX IF NOT EXISTS ix_detention_events_active "
+    "ON detention_events (checkin_time) WHERE status = 'active'",
+    # get_payment_requests: only open requests are indexed
+    "CREATE INDEX IF NOT EXISTS ix_detention_events_payment_requested "
+    "ON detention_events (driver_id) WHERE payment_status = 'requested'",
+    "CREATE INDEX IF NOT EXISTS ix_loads_status ON loads (status)",
+    "CREATE INDEX IF NOT EXISTS ix_loads_driver_id ON loads (driver_id)",
+    "CREATE INDEX IF NOT EXISTS ix_shipments_status ON shipments (status)",
+    "CREATE INDEX IF NOT EXISTS ix_shipments_driver_id ON shipments (driver_id)",
+]
+
+def upgrade(connection):
+    for ddl in INDEXES:
+        connection.execute(text(ddl))
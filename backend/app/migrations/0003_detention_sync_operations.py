@@ -0,0 +1,25 @@
+"""Idempotency log for batched offline check-in/check-out sync."""
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, MetaData, String, Table, UniqueConstraint
+
+metadata = MetaData()
+
+# Only the keys the foreign keys point at; these tables already exist
+Table("drivers", metadata, Column("id", Integer, primary_key=True))
+Table("detention_events", metadata, Column("id", Integer, primary_key=True))
+
+SYNC_OPERATIONS = Table(
+    "detention_sync_operations", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("driver_id", Integer, ForeignKey("drivers.id"), nullable=False),
+    Column("idempotency_key", String, nullable=False),
+    Column("op", String, nullable=False),
+    Column("client_seq", Integer, nullable=False),
+    Column("client_time", DateTime, nullable=False),
+    Column("received_at", DateTime, nullable=False),
+    # Dropped on PostgreSQL by 0005 once events can move to the archive
+    Column("event_id", Integer, ForeignKey("detention_events.id"), nullable=True),
+    UniqueConstraint("driver_id", "idempotency_key", name="uq_detention_sync_driver_key"),
+)
+
+def upgrade(connection):
+    SYNC_OPERATIONS.create(bind=connection, checkfirst=True)
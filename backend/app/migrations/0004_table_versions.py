@@ -0,0 +1,20 @@
+"""Per-table write counters behind ETag/Last-Modified on drivers, warehouses and customers."""
+from datetime import datetime, timezone
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, insert, select
+
+TABLES = ["drivers", "warehouses", "customers"]
+
+VERSIONS = Table(
+    "table_versions", MetaData(),
+    Column("table_name", String, primary_key=True),
+    Column("version", Integer, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+def upgrade(connection):
+    VERSIONS.create(bind=connection, checkfirst=True)
+    seeded = set(connection.execute(select(VERSIONS.c.table_name)).scalars())
+    now = datetime.now(timezone.utc)
+    for table in TABLES:
+        if table not in seeded:
+            connection.execute(insert(VERSIONS).values(table_name=table, version=0, updated_at=now))
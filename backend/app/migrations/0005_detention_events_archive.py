@@ -0,0 +1,64 @@
+"""Cold storage for paid detention events, partitioned by month on PostgreSQL."""
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, MetaData, String, Table, text
+
+# Plain DDL: SQLAlchemy cannot declare a partitioned table. Month partitions
+# are created by the archiver as it needs them; the default partition only
+# catches rows that arrive before theirs exists.
+POSTGRESQL = [
+    """CREATE TABLE IF NOT EXISTS detention_events_archive (
+        id INTEGER NOT NULL,
+        load_id INTEGER REFERENCES loads (id),
+        driver_id INTEGER REFERENCES drivers (id),
+        checkin_time TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+        checkout_time TIMESTAMP WITHOUT TIME ZONE,
+        free_time_minutes INTEGER,
+        detention_rate FLOAT,
+        detention_minutes INTEGER,
+        detention_amount FLOAT,
+        status VARCHAR,
+        notes VARCHAR,
+        payment_status VARCHAR,
+        archived_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+        PRIMARY KEY (id, checkin_time)
+    ) PARTITION BY RANGE (checkin_time)""",
+    "CREATE TABLE IF NOT EXISTS detention_events_archive_default "
+    "PARTITION OF detention_events_archive DEFAULT",
+    "CREATE INDEX IF NOT EXISTS ix_detention_events_archive_driver_checkin "
+    "ON detention_events_archive (driver_id, checkin_time)",
+    "CREATE INDEX IF NOT EXISTS ix_detention_events_archive_load_id "
+    "ON detention_events_archive (load_id)",
+    # Archived events keep their ids, so sync evidence may point at either table
+    "ALTER TABLE detention_sync_operations "
+    "DROP CONSTRAINT IF EXISTS detention_sync_operations_event_id_fkey",
+]
+
+# SQLite has no partitioning; the same columns in one plain table
+metadata = MetaData()
+Table("loads", metadata, Column("id", Integer, primary_key=True))
+Table("drivers", metadata, Column("id", Integer, primary_key=True))
+
+ARCHIVE = Table(
+    "detention_events_archive", metadata,
+    Column("id", Integer, primary_key=True, autoincrement=False),
+    Column("load_id", Integer, ForeignKey("loads.id")),
+    Column("driver_id", Integer, ForeignKey("drivers.id")),
+    Column("checkin_time", DateTime, primary_key=True),
+    Column("checkout_time", DateTime, nullable=True),
+    Column("free_time_minutes", Integer),
+    Column("detention_rate", Float),
+    Column("detention_minutes", Integer),
+    Column("detention_amount", Float),
+    Column("status", String),
+    Column("notes", String, nullable=True),
+    Column("payment_status", String),
+    Column("archived_at", DateTime, nullable=False),
+    Index("ix_detention_events_archive_driver_checkin", "driver_id", "checkin_time"),
+    Index("ix_detention_events_archive_load_id", "load_id"),
+)
+
+def upgrade(connection):
+    if connection.dialect.name == "postgresql":
+        for ddl in POSTGRESQL:
+            connection.execute(text(ddl))
+    else:
+        ARCHIVE.create(bind=connection, checkfirst=True)
@@ -0,0 +1,44 @@
+"""Per-driver, per-month earnings ledger, backfilled from existing events."""
+from sqlalchemy import Column, Float, ForeignKey, Integer, MetaData, String, Table, text
+
+metadata = MetaData()
+Table("drivers", metadata, Column("id", Integer, primary_key=True))
+
+EARNINGS = Table(
+    "driver_earnings", metadata,
+    Column("driver_id", Integer, ForeignKey("drivers.id"), primary_key=True),
+    Column("period", String, primary_key=True),
+    Column("events", Integer, nullable=False),
+    Column("detention_minutes", Integer, nullable=False),
+    Column("amount_owed", Float, nullable=False),
+    Column("amount_requested", Float, nullable=False),
+    Column("amount_paid", Float, nullable=False),
+)
+
+PERIOD = {
+    "postgresql": "to_char(checkin_time, 'YYYY-MM')",
+    "sqlite": "strftime('%Y-%m', checkin_time)",
+}
+
+BACKFILL = """
+INSERT INTO driver_earnings (driver_id, period, events, detention_minutes,
+                             amount_owed, amount_requested, amount_paid)
+SELECT driver_id, {period}, COUNT(*), SUM(detention_minutes), SUM(detention_amount),
+       SUM(CASE WHEN payment_status = 'requested' THEN detention_amount ELSE 0 END),
+       SUM(CASE WHEN payment_status = 'paid' THEN detention_amount ELSE 0 END)
+FROM (
+    SELECT driver_id, checkin_time, detention_minutes, detention_amount, payment_status, status
+    FROM detention_events
+    UNION ALL
+    SELECT driver_id, checkin_time, detention_minutes, detention_amount, payment_status, status
+    FROM detention_events_archive
+) AS events
+WHERE status = 'completed' AND driver_id IS NOT NULL
+GROUP BY driver_id, {period}
+"""
+
+def upgrade(connection):
+    EARNINGS.create(bind=connection, checkfirst=True)
+    if connection.execute(text("SELECT COUNT(*) FROM driver_earnings")).scalar():
+        return
+    connection.execute(text(BACKFILL.format(period=PERIOD[connection.dialect.name])))
@@ -0,0 +1,67 @@
+"""Per-shipper daily dwell-time sketches behind /detention/scorecards, backfilled from existing events."""
+import math
+from datetime import timezone
+from sqlalchemy import Column, Date, DateTime, Index, Integer, MetaData, String, Table, bindparam, text
+
+# Frozen copy of the bucketing in services/shipper_scorecards.py as of this
+# migration, so the backfill does not change if the service does later.
+RELATIVE_ACCURACY = 0.01
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+MIN_DWELL_MINUTES = 1 / 60
+ZERO_BUCKET = -(2 ** 31)
+BATCH_SIZE = 5000
+
+SKETCHES = Table(
+    "shipper_dwell_sketches", MetaData(),
+    Column("shipper_name", String, primary_key=True),
+    Column("day", Date, primary_key=True),
+    Column("bucket", Integer, primary_key=True, autoincrement=False),
+    Column("events", Integer, nullable=False),
+    Column("over_free_time", Integer, nullable=False),
+    Index("ix_shipper_dwell_sketches_day", "day"),
+)
+
+EVENTS = text("""
+SELECT loads.shipper_name, events.checkin_time, events.checkout_time, events.detention_minutes
+FROM (
+    SELECT load_id, checkin_time, checkout_time, detention_minutes, status FROM detention_events
+    UNION ALL
+    SELECT load_id, checkin_time, checkout_time, detention_minutes, status FROM detention_events_archive
+) AS events
+JOIN loads ON loads.id = events.load_id
+WHERE events.status = 'completed' AND events.checkout_time IS NOT NULL
+  AND loads.shipper_name IS NOT NULL
+""").columns(shipper_name=String, checkin_time=DateTime, checkout_time=DateTime,
+             detention_minutes=Integer)
+
+INSERT = text("""
+INSERT INTO shipper_dwell_sketches (shipper_name, day, bucket, events, over_free_time)
+VALUES (:shipper_name, :day, :bucket, :events, :over_free_time)
+""").bindparams(bindparam("day", type_=Date))
+
+def _utc(value):
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+def _bucket(minutes: float) -> int:
+    if minutes < MIN_DWELL_MINUTES:
+        return ZERO_BUCKET
+    return math.ceil(math.log(minutes) / math.log(GAMMA))
+
+def upgrade(connection):
+    SKETCHES.create(bind=connection, checkfirst=True)
+    if connection.execute(text("SELECT COUNT(*) FROM shipper_dwell_sketches")).scalar():
+        return
+    # Bucketing needs log(), which SQLite lacks, so the backfill runs in Python
+    counts = {}
+    rows = connection.execute(EVENTS.execution_options(yield_per=BATCH_SIZE))
+    for shipper, checkin, checkout, detention_minutes in rows:
+        checkin, checkout = _utc(checkin), _utc(checkout)
+        key = (shipper, checkin.date(), _bucket((checkout - checkin).total_seconds() / 60))
+        entry = counts.setdefault(key, [0, 0])
+        entry[0] += 1
+        entry[1] += int((detention_minutes or 0) > 0)
+    values = [{"shipper_name": shipper, "day": day, "bucket": bucket,
+               "events": events, "over_free_time": over}
+              for (shipper, day, bucket), (events, over) in counts.items()]
+    for start in range(0, len(values), BATCH_SIZE):
+        connection.execute(INSERT, values[start:start + BATCH_SIZE])
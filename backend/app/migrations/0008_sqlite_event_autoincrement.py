@@ -0,0 +1,51 @@
+"""Stop SQLite from reusing detention event ids once the newest event is archived."""
+from sqlalchemy import text
+
+# A plain INTEGER PRIMARY KEY hands out max(id) + 1 of the rows still in the
+# table, so archiving the newest event frees its id for the next check-in and
+# all_events() then sees two events with one id. AUTOINCREMENT never reuses
+# an id; SQLite can only add it by rebuilding the table. PostgreSQL sequences
+# never go backwards and need nothing.
+CREATE = """CREATE TABLE detention_events_rebuild (
+    id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+    load_id INTEGER REFERENCES loads (id),
+    driver_id INTEGER REFERENCES drivers (id),
+    checkin_time DATETIME NOT NULL,
+    checkout_time DATETIME,
+    free_time_minutes INTEGER,
+    detention_rate FLOAT,
+    detention_minutes INTEGER,
+    detention_amount FLOAT,
+    status VARCHAR,
+    notes VARCHAR,
+    payment_status VARCHAR
+)"""
+
+COLUMNS = ("id, load_id, driver_id, checkin_time, checkout_time, free_time_minutes, detention_rate, "
+           "detention_minutes, detention_amount, status, notes, payment_status")
+
+def upgrade(connection):
+    if connection.dialect.name != "sqlite":
+        return
+    table_sql = connection.execute(text(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'detention_events'")).scalar()
+    if "AUTOINCREMENT" not in table_sql.upper():
+        indexes = connection.execute(text(
+            "SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'detention_events' "
+            "AND sql IS NOT NULL")).scalars().all()
+        connection.execute(text(CREATE))
+        connection.execute(text(
+            f"INSERT INTO detention_events_rebuild ({COLUMNS}) SELECT {COLUMNS} FROM detention_events"))
+        connection.execute(text("DROP TABLE detention_events"))
+        connection.execute(text("ALTER TABLE detention_events_rebuild RENAME TO detention_events"))
+        for ddl in indexes:
+            connection.execute(text(ddl))
+    # Ids already handed to archived events must not come back either
+    last_id = connection.execute(text(
+        "SELECT MAX(id) FROM (SELECT id FROM detention_events "
+        "UNION ALL SELECT id FROM detention_events_archive "
+        "UNION ALL SELECT seq FROM sqlite_sequence WHERE name = 'detention_events')")).scalar()
+    if last_id:
+        connection.execute(text("DELETE FROM sqlite_sequence WHERE name = 'detention_events'"))
+        connection.execute(text("INSERT INTO sqlite_sequence (name, seq) VALUES ('detention_events', :seq)"),
+                           {"seq": last_id})
@@ -0,0 +1,65 @@
+"""
+Versioned schema migrations.
+
+Each module in this package named NNNN_description.py defines an
+upgrade(connection) function. upgrade() applies, in order, every version not
+yet recorded in the schema_migrations table, each in its own transaction.
+Migrations must tolerate objects that already exist, because databases
+created before this mechanism was introduced were built with create_all.
+A migration never imports models: it declares the tables it creates as they
+stood at that version, so replaying it later builds the same schema.
+
+    python -m backend.app.migrations upgrade
+    python -m backend.app.migrations status
+    python -m backend.app.migrations check-plans
+"""
+import importlib
+import pkgutil
+from datetime import datetime, timezone
+from sqlalchemy import Column, DateTime, MetaData, String, Table, inspect, select, text
+
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations", _metadata,
+    Column("version", String, primary_key=True),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+# Arbitrary constant; serializes concurrent upgrades from several workers on PostgreSQL
+_ADVISORY_LOCK_ID = 72_410_001
+
+def available_migrations() -> list:
+    names = sorted(
+        module.name for module in pkgutil.iter_modules(__path__)
+        if module.name[:4].isdigit()
+    )
+    return [(name.split("_", 1)[0], importlib.import_module(f"{__name__}.{name}")) for name in names]
+
+def applied_versions(connection) -> set:
+    if not inspect(connection).has_table(schema_migrations.name):
+        return set()
+    return set(connection.execute(select(schema_migrations.c.version)).scalars())
+
+def upgrade(engine) -> list:
+    """Apply pending migrations; returns the versions that were applied."""
+    applied = []
+    with engine.begin() as connection:
+        if connection.dialect.name == "postgresql":
+            connection.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": _ADVISORY_LOCK_ID})
+        schema_migrations.create(connection, checkfirst=True)
+        done = applied_versions(connection)
+        for version, module in available_migrations():
+            if version in done:
+                continue
+            with connection.begin_nested():
+                module.upgrade(connection)
+                connection.execute(schema_migrations.insert().values(
+                    version=version, applied_at=datetime.now(timezone.utc)))
+            applied.append(version)
+    return applied
+
+def status(engine) -> list:
+    with engine.connect() as connection:
+        done = applied_versions(connection)
+    return [(version, module.__name__.rsplit(".", 1)[1], version in done)
+            for version, module in available_migrations()]
@@ -0,0 +1,27 @@
+import argparse
+import sys
+from backend.app.database import engine
+from backend.app.migrations import status, upgrade
+from backend.app.migrations.plan_check import check_plans
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m backend.app.migrations")
+    parser.add_argument("command", choices=["upgrade", "status", "check-plans"])
+    args = parser.parse_args()
+
+    if args.command == "upgrade":
+        applied = upgrade(engine)
+        print("Applied: " + ", ".join(applied) if applied else "Schema is up to date")
+    elif args.command == "status":
+        for version, name, applied in status(engine):
+            print(f"[{'x' if applied else ' '}] {name}")
+    else:
+        failures = check_plans(engine)
+        for name, lines in failures.items():
+            print(f"FULL SCAN {name}: {' | '.join(lines)}")
+        if failures:
+            sys.exit(1)
+        print("All hot queries use an index")
+
+if __name__ == "__main__":
+    main()
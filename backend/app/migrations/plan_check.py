@@ -0,0 +1,69 @@
+"""
+Query-plan regression check for the detention hot paths.
+
+Runs EXPLAIN on the statements behind get_active, get_payment_requests,
+get_by_driver, get_by_load, the date-range filters, the archiver and the
+shipper scorecards, and reports any that fall back to a full scan of
+detention_events, its archive or the dwell sketches. On PostgreSQL sequential scans
+are disabled for the check so that tiny tables do not mask a missing index.
+The whole-table aggregates in get_stats scan by design and are not checked.
+"""
+from datetime import date, datetime
+from sqlalchemy import func, select, text
+from backend.app import models
+
+TABLES = (models.DetentionEvent.__tablename__, models.ArchivedDetentionEvent.__tablename__,
+          models.ShipperDwellSketch.__tablename__)
+
+def hot_queries() -> dict:
+    Event = models.DetentionEvent
+    Archived = models.ArchivedDetentionEvent
+    Sketch = models.ShipperDwellSketch
+    return {
+        "get_active": select(Event).where(Event.status == "active"),
+        "get_payment_requests": select(Event, models.Driver.name, models.Load.load_number)
+            .outerjoin(models.Driver, models.Driver.id == Event.driver_id)
+            .outerjoin(models.Load, models.Load.id == Event.load_id)
+            .where(Event.payment_status == "requested"),
+        "get_by_driver": select(Event).where(Event.driver_id == 1).order_by(Event.id).limit(101),
+        "get_by_load": select(Event).where(Event.load_id == 1).order_by(Event.id).limit(101),
+        "checkin_date_range": select(Event).where(Event.checkin_time >= datetime(2024, 1, 1)),
+        "archive_candidates": select(Event.id).where(
+            Event.payment_status == "paid", Event.checkin_time < datetime(2024, 1, 1)
+        ).order_by(Event.checkin_time).limit(1000),
+        "archived_by_driver": select(Archived).where(Archived.driver_id == 1),
+        "archived_by_load": select(Archived).where(Archived.load_id == 1),
+        "archived_by_id": select(Archived).where(Archived.id == 1),
+        "scorecard_shipper": select(Sketch.bucket, func.sum(Sketch.events)).where(
+            Sketch.shipper_name == "ACME", Sketch.day >= date(2024, 1, 1)
+        ).group_by(Sketch.bucket),
+        "scorecard_window": select(Sketch.shipper_name, Sketch.bucket, func.sum(Sketch.events)).where(
+            Sketch.day >= date(2024, 1, 1), Sketch.day <= date(2024, 1, 31)
+        ).group_by(Sketch.shipper_name, Sketch.bucket),
+    }
+
+def _explain(connection, stmt) -> list:
+    sql = str(stmt.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True}))
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("SET LOCAL enable_seqscan = off"))
+        return [row[0] for row in connection.execute(text("EXPLAIN " + sql))]
+    return [row[-1] for row in connection.execute(text("EXPLAIN QUERY PLAN " + sql))]
+
+def _is_full_scan(line: str) -> bool:
+    # On PostgreSQL archive partitions are named detention_events_archive_*
+    if any(f"Seq Scan on {table}" in line for table in TABLES):
+        return True
+    # SQLite: "SCAN detention_events" without "USING ... INDEX" is a table scan
+    return any(line.startswith(f"SCAN {table}") and "INDEX" not in line for table in TABLES)
+
+def check_plans(engine) -> dict:
+    """Map each hot query to its plan lines that are full scans (empty = ok)."""
+    failures = {}
+    with engine.connect() as connection:
+        for name, stmt in hot_queries().items():
+            with connection.begin():
+                plan = _explain(connection, stmt)
+            full_scans = [line for line in plan if _is_full_scan(line.strip())]
+            if full_scans:
+                failures[name] = full_scans
+    return failures
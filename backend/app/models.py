@@ -2,8 +2,8 @@ from sqlalchemy import Column, Integer, String, ForeignKey
 from sqlalchemy.orm import relationship
 from backend.app.database import Base
 from sqlalchemy import Column, Integer, String, ForeignKey, Boolean
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, DateTime, Float
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, Date, DateTime, Float, Index, UniqueConstraint
+from sqlalchemy.sql import func, text
 
 class Driver(Base):
     __tablename__ = "drivers"
@@ -49,8 +49,8 @@ class Shipment(Base):
     id = Column(Integer, primary_key=True, index=True)
     origin = Column(String, index=True)
     destination = Column(String, index=True)
-    status = Column(String, default="pending")
-    driver_id = Column(Integer, ForeignKey("drivers.id"), nullable=True)
+    status = Column(String, default="pending", index=True)
+    driver_id = Column(Integer, ForeignKey("drivers.id"), nullable=True, index=True)
     warehouse_id = Column(Integer, ForeignKey("warehouses.id"), nullable=True)
     customer_id = Column(Integer, ForeignKey("customers.id"), nullable=True)
     driver = relationship("Driver", back_populates="shipments")
@@ -64,15 +64,30 @@ class Load(Base):
     load_number = Column(String, unique=True, index=True)
     shipper_name = Column(String, index=True)
     shipper_address = Column(String)
-    driver_id = Column(Integer, ForeignKey("drivers.id"), nullable=True)
+    driver_id = Column(Integer, ForeignKey("drivers.id"), nullable=True, index=True)
     shipment_id = Column(Integer, ForeignKey("shipments.id"), nullable=True)
-    status = Column(String, default="pending")
+    status = Column(String, default="pending", index=True)
     created_at = Column(DateTime, server_default=func.now())
     driver = relationship("Driver", back_populates="loads")
     detention_events = relationship("DetentionEvent", back_populates="load")
 
 class DetentionEvent(Base):
     __tablename__ = "detention_events"
+    # Kept in step with migrations/0002_hot_path_indexes.py
+    __table_args__ = (
+        Index("ix_detention_events_driver_checkin", "driver_id", "checkin_time"),
+        Index("ix_detention_events_load_id", "load_id"),
+        Index("ix_detention_events_checkin_time", "checkin_time"),
+        Index("ix_detention_events_payment_checkin", "payment_status", "checkin_time"),
+        Index("ix_detention_events_active", "checkin_time",
+              postgresql_where=text("status = 'active'"),
+              sqlite_where=text("status = 'active'")),
+        Index("ix_detention_events_payment_requested", "driver_id",
+              postgresql_where=text("payment_status = 'requested'"),
+              sqlite_where=text("payment_status = 'requested'")),
+        # Ids of archived events must never be handed out again (migration 0008)
+        {"sqlite_autoincrement": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     load_id = Column(Integer, ForeignKey("loads.id"))
@@ -86,4 +101,91 @@ class DetentionEvent(Base):
     status = Column(String, default="active")
     notes = Column(String, nullable=True)
     load = relationship("Load", back_populates="detention_events")
-    payment_status = Column(String, default="none")  # none, requested, paid
\ No newline at end of file
+    payment_status = Column(String, default="none")  # none, requested, paid
+
+class ArchivedDetentionEvent(Base):
+    """
+    A paid detention event moved out of detention_events by
+    services/detention_archive.py, keeping its id. On PostgreSQL the table is
+    range-partitioned by month of checkin_time (migrations/0005), which is why
+    checkin_time is part of the primary key.
+    """
+    __tablename__ = "detention_events_archive"
+    # Kept in step with migrations/0005_detention_events_archive.py
+    __table_args__ = (
+        Index("ix_detention_events_archive_driver_checkin", "driver_id", "checkin_time"),
+        Index("ix_detention_events_archive_load_id", "load_id"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    load_id = Column(Integer, ForeignKey("loads.id"))
+    driver_id = Column(Integer, ForeignKey("drivers.id"))
+    checkin_time = Column(DateTime, primary_key=True)
+    checkout_time = Column(DateTime, nullable=True)
+    free_time_minutes = Column(Integer)
+    detention_rate = Column(Float)
+    detention_minutes = Column(Integer)
+    detention_amount = Column(Float)
+    status = Column(String)
+    notes = Column(String, nullable=True)
+    payment_status = Column(String)
+    archived_at = Column(DateTime, nullable=False)
+
+class DriverEarnings(Base):
+    """
+    Per-driver, per-month totals of completed detention events, maintained by
+    services/driver_earnings.py in the same transaction as the event change.
+    Covers archived events too.
+    """
+    __tablename__ = "driver_earnings"
+
+    driver_id = Column(Integer, ForeignKey("drivers.id"), primary_key=True)
+    period = Column(String, primary_key=True)  # "YYYY-MM" of checkin_time, UTC
+    events = Column(Integer, nullable=False, default=0)
+    detention_minutes = Column(Integer, nullable=False, default=0)
+    amount_owed = Column(Float, nullable=False, default=0.0)
+    amount_requested = Column(Float, nullable=False, default=0.0)
+    amount_paid = Column(Float, nullable=False, default=0.0)
+
+class ShipperDwellSketch(Base):
+    """
+    One bucket of a shipper's daily dwell-time sketch (see
+    services/shipper_scorecards.py): how many completed events that checked
+    in that UTC day had a dwell time in the bucket, and how many of those ran
+    past free time.
+    """
+    __tablename__ = "shipper_dwell_sketches"
+    __table_args__ = (
+        Index("ix_shipper_dwell_sketches_day", "day"),
+    )
+
+    shipper_name = Column(String, primary_key=True)
+    day = Column(Date, primary_key=True)
+    bucket = Column(Integer, primary_key=True, autoincrement=False)
+    events = Column(Integer, nullable=False, default=0)
+    over_free_time = Column(Integer, nullable=False, default=0)
+
+class DetentionSyncOperation(Base):
+    """An offline check-in/check-out applied through /detention/sync, kept for idempotency and evidence."""
+    __tablename__ = "detention_sync_operations"
+    __table_args__ = (
+        UniqueConstraint("driver_id", "idempotency_key", name="uq_detention_sync_driver_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    driver_id = Column(Integer, ForeignKey("drivers.id"), nullable=False)
+    idempotency_key = Column(String, nullable=False)
+    op = Column(String, nullable=False)  # "checkin" or "checkout"
+    client_seq = Column(Integer, nullable=False)
+    client_time = Column(DateTime, nullable=False)
+    received_at = Column(DateTime, nullable=False)  # server receipt time
+    # No foreign key: the event may since have moved to detention_events_archive
+    event_id = Column(Integer, nullable=True)
+
+class TableVersion(Base):
+    """Write counter for a rarely-changing table; validates cached GETs (see core/conditional.py)."""
+    __tablename__ = "table_versions"
+
+    table_name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False)
@@ -0,0 +1,75 @@
+from datetime import datetime, timezone
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.app.database import get_async_db
+from backend.app import models, schemas
+from backend.app.core.dependencies import get_current_user, require_dispatcher, require_driver
+from backend.app.core.pagination import PageParams, paginate_async
+from backend.app.core.timing import TimedRoute
+from backend.app.routers.detention import (
+    ALREADY_CHECKED_OUT, active_events_stmt, announce_checkin, announce_checkout, claim_checkout,
+    finish_detention, start_detention
+)
+from backend.app.routers.loads import load_filters
+from backend.app.services.detention_feed import active_event_view
+from backend.app.services.driver_earnings import earnings_contribution, record_earnings_async
+from backend.app.services.shipper_scorecards import record_dwell_async
+
+# AsyncSession versions of the hottest endpoints. main.py registers this router
+# ahead of the sync ones only when ASYNC_DATABASE_URL is configured, so the
+# matching sync handlers stay in place as the default path. Behaviour and
+# business rules are shared with the sync handlers.
+router = APIRouter(route_class=TimedRoute)
+
+@router.post("/detention/checkin/", response_model=schemas.DetentionEvent, tags=["Detention"])
+async def checkin(data: schemas.DetentionCheckin, db: AsyncSession = Depends(get_async_db),
+                  current_user=Depends(require_driver)):
+    # Driver can only check in for themselves
+    if current_user.driver_id != data.driver_id:
+        raise HTTPException(status_code=403, detail="You can only check in for yourself")
+
+    load = await db.get(models.Load, data.load_id)
+    event = start_detention(data, load, current_user)
+    db.add(event)
+    await db.commit()
+    await db.refresh(event)
+    announce_checkin(event)
+    return event
+
+@router.post("/detention/checkout/{event_id}/", response_model=schemas.DetentionEvent,
+             tags=["Detention"])
+async def checkout(event_id: int, data: schemas.DetentionCheckout,
+                   db: AsyncSession = Depends(get_async_db),
+                   current_user=Depends(require_driver)):
+    event = await db.get(models.DetentionEvent, event_id)
+    before = earnings_contribution(event)
+    finish_detention(event, data, current_user)
+    if not (await db.execute(claim_checkout(event.id))).rowcount:
+        raise HTTPException(status_code=409, detail=ALREADY_CHECKED_OUT)
+    await record_earnings_async(db, event, before)
+    await record_dwell_async(db, event)
+    await db.commit()
+    await db.refresh(event)
+    announce_checkout(event)
+    return event
+
+@router.get("/detention/active", tags=["Detention"])
+async def get_active(db: AsyncSession = Depends(get_async_db),
+                     current_user=Depends(require_dispatcher)):
+    events = (await db.execute(active_events_stmt)).scalars().all()
+    now = datetime.now(timezone.utc)
+    return [active_event_view(event, now) for event in events]
+
+@router.get("/loads/", response_model=list[schemas.Load], tags=["Loads"])
+async def get_loads(response: Response,
+                    status: Optional[str] = None,
+                    driver_id: Optional[int] = None,
+                    shipper_name: Optional[str] = None,
+                    page: PageParams = Depends(),
+                    db: AsyncSession = Depends(get_async_db),
+                    current_user=Depends(get_current_user)):
+    stmt = select(models.Load).where(
+        *load_filters(current_user, status, driver_id, shipper_name))
+    return await paginate_async(db, stmt, models.Load.id, page, response)
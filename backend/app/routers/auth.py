@@ -1,70 +1,106 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from backend.app.database import get_db
 from backend.app import models, schemas
-from backend.app.core.security import hash_password, verify_password, create_access_token
-from backend.app.core.dependencies import get_current_user
+from backend.app.core.security import hash_password_async, verify_password_async, create_access_token
+from backend.app.core.dependencies import (
+    Principal, get_current_user, principal_cache, require_dispatcher
+)
+from backend.app.core.timing import TimedRoute
 
-router = APIRouter(prefix="/auth", tags=["Authentication"])
+router = APIRouter(prefix="/auth", tags=["Authentication"], route_class=TimedRoute)
 
-@router.post("/register", response_model=schemas.User)
-def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
-    existing = db.query(models.User).filter(models.User.email == user.email).first()
-    if existing:
+# The handlers below are async so that the Argon2 work can be awaited on the
+# password hashing pool; their (short) database work is pushed to the
+# threadpool explicitly to keep the event loop free. Read transactions are
+# ended before hashing so a login burst does not pin pooled connections.
+
+def _check_new_user(db: Session, email: str, username: str):
+    if db.query(models.User).filter(models.User.email == email).first():
         raise HTTPException(status_code=400, detail="Email already registered")
-    existing_username = db.query(models.User).filter(models.User.username == user.username).first()
-    if existing_username:
+    if db.query(models.User).filter(models.User.username == username).first():
         raise HTTPException(status_code=400, detail="Username already taken")
+    db.rollback()
+
+def _check_new_driver_account(db: Session, payload: schemas.CreateDriverAccount):
+    driver = db.query(models.Driver).filter(models.Driver.id == payload.driver_id).first()
+    if not driver:
+        raise HTTPException(status_code=404, detail="Driver not found")
+    _check_new_user(db, payload.email, payload.username)
+    if db.query(models.User).filter(models.User.driver_id == payload.driver_id).first():
+        raise HTTPException(status_code=400, detail="This driver already has an account")
+    db.rollback()
+
+def _save_user(db: Session, db_user: models.User) -> models.User:
+    db.add(db_user)
+    db.commit()
+    db.refresh(db_user)
+    return db_user
+
+def _credentials_by_email(db: Session, email: str):
+    credentials = db.query(
+        models.User.email, models.User.role, models.User.driver_id, models.User.hashed_password
+    ).filter(models.User.email == email).first()
+    db.rollback()
+    return credentials
+
+@router.post("/register", response_model=schemas.User)
+async def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
+    await run_in_threadpool(_check_new_user, db, user.email, user.username)
     db_user = models.User(
         email=user.email,
         username=user.username,
-        hashed_password=hash_password(user.password),
+        hashed_password=await hash_password_async(user.password),
         role=user.role or "dispatcher",
         driver_id=user.driver_id
     )
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
-    return db_user
+    return await run_in_threadpool(_save_user, db, db_user)
 
 @router.post("/register-driver", response_model=schemas.User)
-def register_driver(
+async def register_driver(
     payload: schemas.CreateDriverAccount,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     if current_user.role != "dispatcher":
         raise HTTPException(status_code=403, detail="Only dispatchers can create driver accounts")
 
-    driver = db.query(models.Driver).filter(models.Driver.id == payload.driver_id).first()
-    if not driver:
-        raise HTTPException(status_code=404, detail="Driver not found")
-
-    if db.query(models.User).filter(models.User.email == payload.email).first():
-        raise HTTPException(status_code=400, detail="Email already registered")
-    if db.query(models.User).filter(models.User.username == payload.username).first():
-        raise HTTPException(status_code=400, detail="Username already taken")
-
-    if db.query(models.User).filter(models.User.driver_id == payload.driver_id).first():
-        raise HTTPException(status_code=400, detail="This driver already has an account")
+    await run_in_threadpool(_check_new_driver_account, db, payload)
 
     db_user = models.User(
         email=payload.email,
         username=payload.username,
-        hashed_password=hash_password(payload.password),
+        hashed_password=await hash_password_async(payload.password),
         role="driver",
         driver_id=payload.driver_id
     )
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
-    return db_user
+    return await run_in_threadpool(_save_user, db, db_user)
 
 @router.post("/login", response_model=schemas.Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    db_user = db.query(models.User).filter(models.User.email == form_data.username).first()
-    if not db_user or not verify_password(form_data.password, db_user.hashed_password):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+    db_user = await run_in_threadpool(_credentials_by_email, db, form_data.username)
+    if not db_user or not await verify_password_async(form_data.password, db_user.hashed_password):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     token = create_access_token(data={"sub": db_user.email, "role": db_user.role, "driver_id": db_user.driver_id})
-    return {"access_token": token, "token_type": "bearer"}
\ No newline at end of file
+    return {"access_token": token, "token_type": "bearer"}
+
+@router.post("/users/{user_id}/deactivate", response_model=schemas.User)
+def deactivate_user(
+    user_id: int,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(require_dispatcher)
+):
+    db_user = db.query(models.User).filter(models.User.id == user_id).first()
+    if not db_user:
+        raise HTTPException(status_code=404, detail="User not found")
+    db_user.is_active = False
+    # The User listeners in core.dependencies evict its cached principals
+    db.commit()
+    db.refresh(db_user)
+    return db_user
+
+@router.get("/principal-cache")
+def principal_cache_stats(current_user: Principal = Depends(require_dispatcher)):
+    return principal_cache.stats()
\ No newline at end of file
@@ -1,36 +1,50 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, Response, HTTPException
 from sqlalchemy.orm import Session
 from backend.app.database import get_db
 from backend.app import models, schemas
+from backend.app.core.conditional import bump_version, conditional_get
+from backend.app.core.pagination import PageParams, paginate
+from backend.app.core.timing import TimedRoute
 
-router = APIRouter(prefix="/customers", tags=["Customers"])
+router = APIRouter(prefix="/customers", tags=["Customers"], route_class=TimedRoute)
 
-@router.post("/")
+@router.post("/", response_model=schemas.CustomerSummary)
 def create_customer(customer: schemas.CustomerCreate, db: Session = Depends(get_db)):
     db_customer = models.Customer(**customer.dict())
     db.add(db_customer)
+    bump_version(db, "customers")
     db.commit()
     db.refresh(db_customer)
     return db_customer
 
-@router.get("/")
-def get_customers(db: Session = Depends(get_db)):
-    return db.query(models.Customer).all()
+@router.get("/", dependencies=[Depends(conditional_get("customers"))],
+            response_model=list[schemas.CustomerSummary])
+def get_customers(response: Response,
+                  name: Optional[str] = None,
+                  page: PageParams = Depends(),
+                  db: Session = Depends(get_db)):
+    query = db.query(models.Customer)
+    if name:
+        query = query.filter(models.Customer.name == name)
+    return paginate(query, models.Customer.id, page, response)
 
-@router.get("/{customer_id}")
+@router.get("/{customer_id}", dependencies=[Depends(conditional_get("customers"))],
+            response_model=schemas.CustomerSummary)
 def get_customer(customer_id: int, db: Session = Depends(get_db)):
     customer = db.query(models.Customer).filter(models.Customer.id == customer_id).first()
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
     return customer
 
-@router.put("/{customer_id}")
+@router.put("/{customer_id}", response_model=schemas.CustomerSummary)
 def update_customer(customer_id: int, updated: schemas.CustomerUpdate, db: Session = Depends(get_db)):
     customer = db.query(models.Customer).filter(models.Customer.id == customer_id).first()
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
     for key, value in updated.dict(exclude_unset=True).items():
         setattr(customer, key, value)
+    bump_version(db, "customers")
     db.commit()
     db.refresh(customer)
     return customer
@@ -41,5 +55,6 @@ def delete_customer(customer_id: int, db: Session = Depends(get_db)):
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
     db.delete(customer)
+    bump_version(db, "customers")
     db.commit()
     return {"message": "Customer deleted successfully"}
\ No newline at end of file
@@ -1,30 +1,67 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
+from sqlalchemy import case, func, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from backend.app.database import get_db
+from backend.app.database import SessionLocal, get_db
 from backend.app import models, schemas
-from backend.app.core.dependencies import get_current_user, require_dispatcher, require_driver
+from backend.app.core.conditional import etag_matches
+from backend.app.core.config import settings
+from backend.app.core.dependencies import (
+    get_current_user, get_stream_user, require_dispatcher, require_driver, require_stream_dispatcher
+)
 from backend.app.core.exceptions import NotFoundError
-from datetime import datetime, timezone
-import io
-
-router = APIRouter(prefix="/detention", tags=["Detention"])
-
-def calculate_detention(checkin: datetime, checkout: datetime,
-                        free_time_minutes: int, rate: float):
-    total_minutes = int((checkout - checkin).total_seconds() / 60)
-    detention_minutes = max(0, total_minutes - free_time_minutes)
-    detention_amount = round((detention_minutes / 60) * rate, 2)
-    return detention_minutes, detention_amount
-
-@router.post("/checkin/")
-def checkin(data: schemas.DetentionCheckin, db: Session = Depends(get_db),
-            current_user=Depends(require_driver)):
-    # Driver can only check in for themselves
-    if current_user.driver_id != data.driver_id:
-        raise HTTPException(status_code=403, detail="You can only check in for yourself")
-
-    load = db.query(models.Load).filter(models.Load.id == data.load_id).first()
+from backend.app.core.pagination import PageParams, paginate
+from backend.app.core.timing import TimedRoute
+from backend.app.services.detention_export import (
+    EXPORT_BATCH_SIZE, MEDIA_TYPES, export_statement, stream_export
+)
+from backend.app.services.detention_archive import all_events
+from backend.app.services.detention_feed import active_event_view, detention_feed, format_sse
+from backend.app.services.detention_metrics import detention_gauges
+from backend.app.services.detention_recalc import as_utc, calculate_detention
+from backend.app.services.detention_timers import detention_timers
+from backend.app.services.driver_earnings import (
+    earnings_contribution, earnings_summary, record_earnings
+)
+from backend.app.services.shipper_scorecards import DEFAULT_PERCENTILES, record_dwell, scorecards
+from backend.app.services.detention_report import (
+    cached_report, report_cache, report_context, report_etag, stream_report_zip
+)
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+import asyncio
+
+router = APIRouter(prefix="/detention", tags=["Detention"], route_class=TimedRoute)
+
+STREAM_HEARTBEAT_SECONDS = 15
+ALREADY_CHECKED_OUT = "Event already checked out"
+CHECKOUT_BEFORE_CHECKIN = "Checkout time is before the check-in time"
+PAYMENT_STATUS_CHANGED = "Payment status was changed by another request"
+
+def _filter_events(query, driver_id: Optional[int] = None, shipper_name: Optional[str] = None,
+                   start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
+                   payment_status: Optional[str] = None, Event=models.DetentionEvent):
+    # shipper_name filtering expects Load to be joined into the query already.
+    # Event is models.DetentionEvent or all_events() for reads that include the archive.
+    if driver_id is not None:
+        query = query.filter(Event.driver_id == driver_id)
+    if shipper_name:
+        query = query.filter(models.Load.shipper_name == shipper_name)
+    if start_date:
+        query = query.filter(Event.checkin_time >= start_date)
+    if end_date:
+        query = query.filter(Event.checkin_time <= end_date)
+    if payment_status:
+        query = query.filter(Event.payment_status == payment_status)
+    return query
+
+# Check-in/check-out rules shared by the sync handlers below and the
+# AsyncSession variants in routers/async_routes.py
+
+def start_detention(data: schemas.DetentionCheckin, load, current_user,
+                    checkin_time: datetime = None) -> models.DetentionEvent:
     if not load:
         raise NotFoundError("Load")
 
@@ -32,35 +69,38 @@ def checkin(data: schemas.DetentionCheckin, db: Session = Depends(get_db),
     if load.driver_id != current_user.driver_id:
         raise HTTPException(status_code=403, detail="This load is not assigned to you")
 
-    event = models.DetentionEvent(
+    load.status = "in_transit"
+    return models.DetentionEvent(
         load_id=data.load_id,
         driver_id=data.driver_id,
-        checkin_time=datetime.now(timezone.utc),
+        checkin_time=checkin_time or datetime.now(timezone.utc),
         free_time_minutes=data.free_time_minutes,
         detention_rate=data.detention_rate,
         notes=data.notes,
         status="active"
     )
-    db.add(event)
-    load.status = "in_transit"
-    db.commit()
-    db.refresh(event)
-    return event
 
-@router.post("/checkout/{event_id}/")
-def checkout(event_id: int, data: schemas.DetentionCheckout,
-             db: Session = Depends(get_db),
-             current_user=Depends(require_driver)):
-    event = db.query(models.DetentionEvent).filter(
-        models.DetentionEvent.id == event_id).first()
+def announce_checkin(event: models.DetentionEvent):
+    detention_gauges.adjust(active=1)
+    detention_feed.publish("checkin", active_event_view(event))
+    detention_timers.add(event)
+
+def finish_detention(event, data: schemas.DetentionCheckout, current_user,
+                     checkout_time: datetime = None):
     if not event:
         raise NotFoundError("Detention event")
 
     # Driver can only check out their own events
     if event.driver_id != current_user.driver_id:
         raise HTTPException(status_code=403, detail="You can only check out your own events")
-
-    checkout_time = datetime.now(timezone.utc)
+    # A repeat checkout would count the event again in the gauges and ledgers
+    if event.status != "active":
+        raise HTTPException(status_code=409, detail=ALREADY_CHECKED_OUT)
+
+    checkout_time = checkout_time or datetime.now(timezone.utc)
+    # An offline device whose clock ran behind would otherwise bill a negative dwell
+    if as_utc(checkout_time) < as_utc(event.checkin_time):
+        raise HTTPException(status_code=400, detail=CHECKOUT_BEFORE_CHECKIN)
     detention_minutes, detention_amount = calculate_detention(
         event.checkin_time, checkout_time,
         event.free_time_minutes, event.detention_rate
@@ -71,10 +111,170 @@ def checkout(event_id: int, data: schemas.DetentionCheckout,
     event.status = "completed"
     if data.notes:
         event.notes = data.notes
+
+def claim_transition(event_id: int, column, expected, value):
+    """
+    Conditional UPDATE moving an event's column from the state this request
+    read to value. When concurrent requests read the same state, only the
+    first matches a row; the others see rowcount 0 and must not apply their
+    ledger deltas a second time.
+    """
+    return update(models.DetentionEvent).where(
+        models.DetentionEvent.id == event_id, column == expected
+    ).values({column.key: value}).execution_options(synchronize_session=False)
+
+def claim_checkout(event_id: int):
+    return claim_transition(event_id, models.DetentionEvent.status, "active", "completed")
+
+def announce_checkout(event: models.DetentionEvent):
+    detention_gauges.adjust(active=-1)
+    detention_timers.remove(event.id)
+    detention_feed.publish("checkout", {
+        "id": event.id,
+        "load_id": event.load_id,
+        "driver_id": event.driver_id,
+        "checkout_time": event.checkout_time,
+        "detention_minutes": event.detention_minutes,
+        "detention_amount": event.detention_amount,
+    })
+
+active_events_stmt = select(models.DetentionEvent).where(
+    models.DetentionEvent.status == "active")
+
+@router.post("/checkin/", response_model=schemas.DetentionEvent)
+def checkin(data: schemas.DetentionCheckin, db: Session = Depends(get_db),
+            current_user=Depends(require_driver)):
+    # Driver can only check in for themselves
+    if current_user.driver_id != data.driver_id:
+        raise HTTPException(status_code=403, detail="You can only check in for yourself")
+
+    load = db.query(models.Load).filter(models.Load.id == data.load_id).first()
+    event = start_detention(data, load, current_user)
+    db.add(event)
     db.commit()
     db.refresh(event)
+    announce_checkin(event)
     return event
 
+@router.post("/checkout/{event_id}/", response_model=schemas.DetentionEvent)
+def checkout(event_id: int, data: schemas.DetentionCheckout,
+             db: Session = Depends(get_db),
+             current_user=Depends(require_driver)):
+    event = db.query(models.DetentionEvent).filter(
+        models.DetentionEvent.id == event_id).first()
+    before = earnings_contribution(event)
+    finish_detention(event, data, current_user)
+    if not db.execute(claim_checkout(event.id)).rowcount:
+        raise HTTPException(status_code=409, detail=ALREADY_CHECKED_OUT)
+    record_earnings(db, event, before)
+    record_dwell(db, event)
+    db.commit()
+    db.refresh(event)
+    announce_checkout(event)
+    return event
+
+def _sync_client_time(op: schemas.DetentionSyncOperation, received_at: datetime) -> datetime:
+    client_time = as_utc(op.client_time)
+    if client_time > received_at + timedelta(seconds=settings.SYNC_MAX_CLOCK_SKEW_SECONDS):
+        raise HTTPException(status_code=400, detail="client_time is in the future")
+    if client_time < received_at - timedelta(hours=settings.SYNC_MAX_OFFLINE_HOURS):
+        raise HTTPException(status_code=400, detail="client_time is older than the offline window")
+    return min(client_time, received_at)
+
+def _apply_sync_operation(db: Session, op: schemas.DetentionSyncOperation, current_user,
+                          received_at: datetime, applied: dict) -> models.DetentionEvent:
+    happened_at = _sync_client_time(op, received_at)
+    if op.op == "checkin":
+        data = schemas.DetentionCheckin(
+            load_id=op.load_id or 0, driver_id=current_user.driver_id,
+            free_time_minutes=op.free_time_minutes, detention_rate=op.detention_rate,
+            notes=op.notes)
+        load = db.get(models.Load, op.load_id) if op.load_id else None
+        event = start_detention(data, load, current_user, checkin_time=happened_at)
+        db.add(event)
+    else:
+        event_id = op.event_id
+        if event_id is None and op.checkin_key in applied:
+            event_id = applied[op.checkin_key].event_id
+        event = db.get(models.DetentionEvent, event_id) if event_id else None
+        before = earnings_contribution(event)
+        finish_detention(event, schemas.DetentionCheckout(notes=op.notes), current_user,
+                         checkout_time=happened_at)
+        if not db.execute(claim_checkout(event.id)).rowcount:
+            raise HTTPException(status_code=409, detail=ALREADY_CHECKED_OUT)
+        record_earnings(db, event, before)
+        record_dwell(db, event)
+    db.flush()
+    applied[op.idempotency_key] = models.DetentionSyncOperation(
+        driver_id=current_user.driver_id,
+        idempotency_key=op.idempotency_key,
+        op=op.op,
+        client_seq=op.client_seq,
+        client_time=as_utc(op.client_time),
+        received_at=received_at,
+        event_id=event.id,
+    )
+    db.add(applied[op.idempotency_key])
+    db.flush()
+    return event
+
+@router.post("/sync", response_model=list[schemas.DetentionSyncResult])
+def sync(payload: schemas.DetentionSyncRequest, db: Session = Depends(get_db),
+         current_user=Depends(require_driver)):
+    # Replays a driver device's offline queue in client_seq order inside one
+    # transaction. Each operation runs in a savepoint so a bad item is
+    # rejected on its own; idempotency keys make retries after a dropped
+    # connection return the original outcome instead of a duplicate event.
+    if len(payload.operations) > settings.SYNC_MAX_OPERATIONS:
+        raise HTTPException(status_code=413, detail=f"At most {settings.SYNC_MAX_OPERATIONS} operations per sync")
+    received_at = datetime.now(timezone.utc)
+    operations = sorted(payload.operations, key=lambda op: op.client_seq)
+    keys = {op.idempotency_key for op in operations} | {
+        op.checkin_key for op in operations if op.checkin_key}
+    applied = {
+        row.idempotency_key: row for row in db.query(models.DetentionSyncOperation).filter(
+            models.DetentionSyncOperation.driver_id == current_user.driver_id,
+            models.DetentionSyncOperation.idempotency_key.in_(keys))
+    }
+
+    results = []
+    changed = []
+    for op in operations:
+        result = {"idempotency_key": op.idempotency_key, "client_seq": op.client_seq}
+        previous = applied.get(op.idempotency_key)
+        if previous is not None:
+            results.append({**result, "status": "duplicate", "event_id": previous.event_id})
+            continue
+        try:
+            with db.begin_nested():
+                event = _apply_sync_operation(db, op, current_user, received_at, applied)
+        except HTTPException as exc:
+            applied.pop(op.idempotency_key, None)
+            results.append({**result, "status": "rejected", "error": exc.detail})
+            continue
+        except IntegrityError:
+            # A retry of this batch that was still in flight stored the key first
+            applied.pop(op.idempotency_key, None)
+            previous = db.query(models.DetentionSyncOperation).filter(
+                models.DetentionSyncOperation.driver_id == current_user.driver_id,
+                models.DetentionSyncOperation.idempotency_key == op.idempotency_key).first()
+            if previous is None:
+                raise
+            applied[op.idempotency_key] = previous
+            results.append({**result, "status": "duplicate", "event_id": previous.event_id})
+            continue
+        changed.append((op.op, event))
+        results.append({**result, "status": "applied", "event_id": event.id})
+    db.commit()
+
+    for op_type, event in changed:
+        db.refresh(event)
+        if op_type == "checkin":
+            announce_checkin(event)
+        else:
+            announce_checkout(event)
+    return results
+
 @router.post("/{event_id}/request-payment")
 def request_payment(
     event_id: int,
@@ -91,36 +291,52 @@ def request_payment(
         raise HTTPException(status_code=400, detail="Can only request payment for completed events")
     if event.payment_status == "requested":
         raise HTTPException(status_code=400, detail="Payment already requested")
+    before = earnings_contribution(event)
+    claim = claim_transition(event.id, models.DetentionEvent.payment_status, event.payment_status, "requested")
+    if not db.execute(claim).rowcount:
+        raise HTTPException(status_code=409, detail=PAYMENT_STATUS_CHANGED)
     event.payment_status = "requested"
+    record_earnings(db, event, before)
     db.commit()
     db.refresh(event)
+    detention_gauges.adjust(pending_payments=1)
     return {"message": "Payment request sent successfully"}
 
 @router.get("/payment-requests")
 def get_payment_requests(
+    driver_id: Optional[int] = None,
+    shipper_name: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
     db: Session = Depends(get_db),
     current_user=Depends(require_dispatcher)
 ):
-    events = db.query(models.DetentionEvent).filter(
-        models.DetentionEvent.payment_status == "requested"
-    ).all()
-    result = []
-    for event in events:
-        driver = db.query(models.Driver).filter(models.Driver.id == event.driver_id).first()
-        load = db.query(models.Load).filter(models.Load.id == event.load_id).first()
-        result.append({
+    # Driver name and load number come back in the same row as the event
+    query = db.query(
+        models.DetentionEvent, models.Driver.name, models.Load.load_number
+    ).outerjoin(
+        models.Driver, models.Driver.id == models.DetentionEvent.driver_id
+    ).outerjoin(
+        models.Load, models.Load.id == models.DetentionEvent.load_id
+    )
+    query = _filter_events(query, driver_id, shipper_name, start_date, end_date,
+                           payment_status="requested")
+
+    return [
+        {
             "id": event.id,
             "driver_id": event.driver_id,
-            "driver_name": driver.name if driver else "Unknown",
+            "driver_name": driver_name or "Unknown",
             "load_id": event.load_id,
-            "load_number": load.load_number if load else "Unknown",
+            "load_number": load_number or "Unknown",
             "detention_minutes": event.detention_minutes,
             "detention_amount": event.detention_amount,
             "payment_status": event.payment_status,
             "checkin_time": event.checkin_time,
             "checkout_time": event.checkout_time,
-        })
-    return result
+        }
+        for event, driver_name, load_number in query.order_by(models.DetentionEvent.id).all()
+    ]
 
 @router.post("/{event_id}/mark-paid")
 def mark_paid(
@@ -132,206 +348,295 @@ def mark_paid(
         models.DetentionEvent.id == event_id).first()
     if not event:
         raise NotFoundError("Detention event")
+    was_requested = event.payment_status == "requested"
+    before = earnings_contribution(event)
+    claim = claim_transition(event.id, models.DetentionEvent.payment_status, event.payment_status, "paid")
+    if not db.execute(claim).rowcount:
+        raise HTTPException(status_code=409, detail=PAYMENT_STATUS_CHANGED)
     event.payment_status = "paid"
+    record_earnings(db, event, before)
     db.commit()
     db.refresh(event)
+    if was_requested:
+        detention_gauges.adjust(pending_payments=-1)
     return {"message": "Marked as paid"}
 
 @router.get("/active")
 def get_active(db: Session = Depends(get_db),
                current_user=Depends(require_dispatcher)):
     # Only dispatchers see all active detentions
-    events = db.query(models.DetentionEvent).filter(
-        models.DetentionEvent.status == "active").all()
-    result = []
-    for event in events:
+    events = db.execute(active_events_stmt).scalars().all()
+    now = datetime.now(timezone.utc)
+    return [active_event_view(event, now) for event in events]
+
+def _active_snapshot():
+    with SessionLocal() as db:
+        events = db.execute(active_events_stmt).scalars().all()
         now = datetime.now(timezone.utc)
-        checkin = event.checkin_time
-        if checkin.tzinfo is None:
-            checkin = checkin.replace(tzinfo=timezone.utc)
-        elapsed_minutes = int((now - checkin).total_seconds() / 60)
-        detention_minutes = max(0, elapsed_minutes - event.free_time_minutes)
-        result.append({
-            "id": event.id,
-            "load_id": event.load_id,
-            "driver_id": event.driver_id,
-            "checkin_time": event.checkin_time,
-            "elapsed_minutes": elapsed_minutes,
-            "free_time_remaining": max(0, event.free_time_minutes - elapsed_minutes),
-            "detention_minutes": detention_minutes,
-            "detention_amount": round((detention_minutes / 60) * event.detention_rate, 2),
-            "status": event.status,
-        })
-    return result
-
-@router.get("/load/{load_id}")
-def get_by_load(load_id: int, db: Session = Depends(get_db),
+        return [active_event_view(event, now) for event in events]
+
+@router.get("/active/stream")
+async def stream_active(request: Request,
+                        current_user=Depends(require_stream_dispatcher)):
+    # Server-Sent Events: one snapshot, then checkin / checkout /
+    # free_time_expired / detention_accrued deltas pushed by the in-process
+    # detention feed
+    async def events():
+        queue = detention_feed.subscribe()
+        try:
+            snapshot = await run_in_threadpool(_active_snapshot)
+            yield format_sse("snapshot", snapshot)
+            while not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(queue.get(), STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if message is None:
+                    break
+                yield message
+        finally:
+            detention_feed.unsubscribe(queue)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@router.get("/load/{load_id}", response_model=list[schemas.DetentionEvent])
+def get_by_load(load_id: int, response: Response,
+                status: Optional[str] = None,
+                page: PageParams = Depends(),
+                db: Session = Depends(get_db),
                 current_user=Depends(get_current_user)):
     # Drivers can only see events for their own loads
     if current_user.role == "driver":
         load = db.query(models.Load).filter(models.Load.id == load_id).first()
         if not load or load.driver_id != current_user.driver_id:
             raise HTTPException(status_code=403, detail="Access denied")
-    return db.query(models.DetentionEvent).filter(
-        models.DetentionEvent.load_id == load_id).all()
-
-@router.get("/driver/{driver_id}")
-def get_by_driver(driver_id: int, db: Session = Depends(get_db),
+    Event = all_events()
+    query = db.query(Event).filter(Event.load_id == load_id)
+    if status:
+        query = query.filter(Event.status == status)
+    return paginate(query, Event.id, page, response)
+
+@router.get("/driver/{driver_id}", response_model=list[schemas.DetentionEvent])
+def get_by_driver(driver_id: int, response: Response,
+                  status: Optional[str] = None,
+                  payment_status: Optional[str] = None,
+                  page: PageParams = Depends(),
+                  db: Session = Depends(get_db),
                   current_user=Depends(get_current_user)):
     # Drivers can only see their own history
     if current_user.role == "driver" and current_user.driver_id != driver_id:
         raise HTTPException(status_code=403, detail="You can only view your own detention history")
-    return db.query(models.DetentionEvent).filter(
-        models.DetentionEvent.driver_id == driver_id).all()
+    Event = all_events()
+    query = db.query(Event).filter(Event.driver_id == driver_id)
+    if status:
+        query = query.filter(Event.status == status)
+    if payment_status:
+        query = query.filter(Event.payment_status == payment_status)
+    return paginate(query, Event.id, page, response)
+
+@router.get("/driver/{driver_id}/earnings", response_model=schemas.DriverEarningsSummary)
+def get_driver_earnings(driver_id: int, db: Session = Depends(get_db),
+                        current_user=Depends(get_current_user)):
+    # Totals come from the ledger, one row per month, not from the events
+    if current_user.role == "driver" and current_user.driver_id != driver_id:
+        raise HTTPException(status_code=403, detail="You can only view your own earnings")
+    return earnings_summary(db, driver_id)
+
+def _sync_receipts():
+    # Server receipt time of offline-synced check-ins/check-outs, one row per event
+    Op = models.DetentionSyncOperation
+    return select(
+        Op.event_id,
+        func.max(case((Op.op == "checkin", Op.received_at))).label("checkin"),
+        func.max(case((Op.op == "checkout", Op.received_at))).label("checkout"),
+    ).group_by(Op.event_id).subquery("sync_receipts")
 
 @router.get("/{event_id}/report")
-def generate_report(event_id: int, db: Session = Depends(get_db),
+def generate_report(event_id: int, request: Request, db: Session = Depends(get_db),
                     current_user=Depends(get_current_user)):
-    from reportlab.lib.pagesizes import letter # type: ignore
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, HRFlowable, Table, TableStyle # type: ignore
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib import colors
-    from reportlab.lib.units import inch # type: ignore
-
-    event = db.query(models.DetentionEvent).filter(
-        models.DetentionEvent.id == event_id).first()
-    if not event:
+    Event = all_events()
+    receipts = _sync_receipts()
+    row = db.query(Event, models.Load, models.Driver, receipts.c.checkin, receipts.c.checkout).outerjoin(
+        models.Load, models.Load.id == Event.load_id
+    ).outerjoin(
+        models.Driver, models.Driver.id == Event.driver_id
+    ).outerjoin(
+        receipts, receipts.c.event_id == Event.id
+    ).filter(Event.id == event_id).first()
+    if not row:
         raise NotFoundError("Detention event")
+    event, load, driver, checkin_received, checkout_received = row
 
     # Drivers can only download their own reports
     if current_user.role == "driver" and event.driver_id != current_user.driver_id:
         raise HTTPException(status_code=403, detail="Access denied")
 
-    driver = db.query(models.Driver).filter(
-        models.Driver.id == event.driver_id).first()
-    load = db.query(models.Load).filter(
-        models.Load.id == event.load_id).first()
-
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter,
-                            rightMargin=0.75*inch, leftMargin=0.75*inch,
-                            topMargin=0.75*inch, bottomMargin=0.75*inch)
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle('T', parent=styles['Title'], fontSize=22,
-                                 textColor=colors.HexColor('#1a1a2e'))
-    body_style = ParagraphStyle('B', parent=styles['Normal'], fontSize=10, leading=16)
-    story = []
-
-    story.append(Paragraph("DETENTION TIME REPORT", title_style))
-    story.append(HRFlowable(width="100%", thickness=2, color=colors.HexColor('#4a4a8a')))
-    story.append(Spacer(1, 0.2*inch))
-
-    data = [
-        ["Field", "Details"],
-        ["Report ID", f"DET-{event.id:05d}"],
-        ["Load Number", load.load_number if load else "N/A"],
-        ["Shipper", load.shipper_name if load else "N/A"],
-        ["Shipper Address", load.shipper_address if load else "N/A"],
-        ["Driver", driver.name if driver else "N/A"],
-        ["Driver Phone", driver.phone if driver else "N/A"],
-        ["Check-In Time", event.checkin_time.strftime("%Y-%m-%d %H:%M:%S UTC")],
-        ["Check-Out Time", event.checkout_time.strftime("%Y-%m-%d %H:%M:%S UTC") if event.checkout_time else "Still Active"],
-        ["Free Time Allowed", f"{event.free_time_minutes} minutes"],
-        ["Total Detention Time", f"{event.detention_minutes} minutes ({round(event.detention_minutes/60, 2)} hours)"],
-        ["Detention Rate", f"${event.detention_rate}/hour"],
-        ["TOTAL AMOUNT OWED", f"${event.detention_amount}"],
-        ["Status", event.status.upper()],
-    ]
-
-    table = Table(data, colWidths=[2.5*inch, 4*inch])
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.HexColor('#1a1a2e')),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.white),
-        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0,0), (-1,-1), 9),
-        ('ROWBACKGROUNDS', (0,1), (-1,-2), [colors.white, colors.HexColor('#f4f4f4')]),
-        ('GRID', (0,0), (-1,-1), 0.5, colors.HexColor('#cccccc')),
-        ('TOPPADDING', (0,0), (-1,-1), 7),
-        ('BOTTOMPADDING', (0,0), (-1,-1), 7),
-        ('LEFTPADDING', (0,0), (-1,-1), 8),
-        ('BACKGROUND', (0,-1), (-1,-1), colors.HexColor('#27ae60')),
-        ('TEXTCOLOR', (0,-1), (-1,-1), colors.white),
-        ('FONTNAME', (0,-1), (-1,-1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0,-1), (-1,-1), 11),
-    ]))
-    story.append(table)
-    story.append(Spacer(1, 0.3*inch))
-
-    if event.notes:
-        story.append(Paragraph(f"Notes: {event.notes}", body_style))
-
-    story.append(Spacer(1, 0.5*inch))
-    story.append(Paragraph("This report was automatically generated by the Logistics Management System.", body_style))
-    story.append(Paragraph("Timestamps are recorded server-side and cannot be altered.", body_style))
-
-    doc.build(story)
-    buffer.seek(0)
-    return StreamingResponse(buffer, media_type="application/pdf",
-                             headers={"Content-Disposition": f"attachment; filename=detention-report-{event_id}.pdf"})
+    context = report_context(event, load, driver, checkin_received, checkout_received)
+    etag = report_etag(context)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    headers["Content-Disposition"] = f"attachment; filename=detention-report-{event_id}.pdf"
+    return Response(cached_report(context, etag), media_type="application/pdf", headers=headers)
+
+def _report_contexts(filters: dict):
+    with SessionLocal() as db:
+        Event = all_events()
+        receipts = _sync_receipts()
+        query = db.query(Event, models.Load, models.Driver, receipts.c.checkin, receipts.c.checkout).outerjoin(
+            models.Load, models.Load.id == Event.load_id
+        ).outerjoin(
+            models.Driver, models.Driver.id == Event.driver_id
+        ).outerjoin(
+            receipts, receipts.c.event_id == Event.id
+        )
+        query = _filter_events(query, **filters, Event=Event).order_by(Event.id)
+        for event, load, driver, checkin_received, checkout_received in query.yield_per(200):
+            yield event.id, report_context(event, load, driver, checkin_received, checkout_received)
+
+@router.get("/reports/export")
+def export_reports(
+    driver_id: Optional[int] = None,
+    shipper_name: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    payment_status: Optional[str] = None,
+    current_user=Depends(get_stream_user)
+):
+    # Drivers can only export their own reports
+    if current_user.role == "driver":
+        if driver_id is not None and driver_id != current_user.driver_id:
+            raise HTTPException(status_code=403, detail="Access denied")
+        driver_id = current_user.driver_id
+    filters = {
+        "driver_id": driver_id,
+        "shipper_name": shipper_name,
+        "start_date": start_date,
+        "end_date": end_date,
+        "payment_status": payment_status,
+    }
+    return StreamingResponse(
+        stream_report_zip(_report_contexts(filters)), media_type="application/zip",
+        headers={"Content-Disposition": "attachment; filename=detention-reports.zip"})
+
+def _export_batches(filters: dict):
+    # stream_results keeps a server-side cursor open on PostgreSQL, so only one
+    # yield_per partition is ever held in memory
+    with SessionLocal() as db:
+        Event = all_events()
+        stmt = _filter_events(export_statement(Event), **filters, Event=Event)
+        result = db.execute(stmt.execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE))
+        yield from result.partitions()
+
+@router.get("/export")
+def export_events(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    gzip: bool = False,
+    driver_id: Optional[int] = None,
+    shipper_name: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    payment_status: Optional[str] = None,
+    current_user=Depends(get_stream_user)
+):
+    # Drivers can only export their own events
+    if current_user.role == "driver":
+        if driver_id is not None and driver_id != current_user.driver_id:
+            raise HTTPException(status_code=403, detail="Access denied")
+        driver_id = current_user.driver_id
+    filters = {
+        "driver_id": driver_id,
+        "shipper_name": shipper_name,
+        "start_date": start_date,
+        "end_date": end_date,
+        "payment_status": payment_status,
+    }
+    filename = f"detention-events.{format}"
+    media_type = MEDIA_TYPES[format]
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        stream_export(_export_batches(filters), format, compress=gzip), media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"})
+
+@router.get("/reports/cache-stats")
+def report_cache_stats(current_user=Depends(require_dispatcher)):
+    return report_cache.stats()
+
+@router.get("/scorecards", response_model=list[schemas.ShipperScorecard])
+def get_scorecards(shipper_name: Optional[str] = None,
+                   start_date: Optional[date] = None,
+                   end_date: Optional[date] = None,
+                   percentiles: list[float] = Query(list(DEFAULT_PERCENTILES)),
+                   db: Session = Depends(get_db),
+                   current_user=Depends(require_dispatcher)):
+    # Merges the per-day dwell sketches of the window; dates are UTC check-in days
+    if any(not 0 <= p <= 100 for p in percentiles):
+        raise HTTPException(status_code=400, detail="percentiles must be between 0 and 100")
+    return scorecards(db, shipper_name, start_date, end_date, percentiles)
 
 @router.get("/stats/summary")
 def get_stats(db: Session = Depends(get_db),
               current_user=Depends(require_dispatcher)):
-    from sqlalchemy import func
-
-    total_events = db.query(models.DetentionEvent).count()
-    completed_events = db.query(models.DetentionEvent).filter(
-        models.DetentionEvent.status == "completed").count()
-    active_events = db.query(models.DetentionEvent).filter(
-        models.DetentionEvent.status == "active").count()
-
-    total_amount = db.query(func.sum(models.DetentionEvent.detention_amount)).scalar() or 0
-    total_minutes = db.query(func.sum(models.DetentionEvent.detention_minutes)).scalar() or 0
-    avg_detention = db.query(func.avg(models.DetentionEvent.detention_minutes)).scalar() or 0
-
-    total_loads = db.query(models.Load).count()
-    pending_loads = db.query(models.Load).filter(models.Load.status == "pending").count()
-    completed_loads = db.query(models.Load).filter(models.Load.status == "completed").count()
-
-    total_shipments = db.query(models.Shipment).count()
-    total_drivers = db.query(models.Driver).count()
-    total_customers = db.query(models.Customer).count()
-    total_warehouses = db.query(models.Warehouse).count()
-
-    recent_events = db.query(models.DetentionEvent).order_by(
-        models.DetentionEvent.id.desc()).limit(10).all()
-
-    loads = db.query(models.Load).all()
-    shipper_map = {}
-    for load in loads:
-        events = db.query(models.DetentionEvent).filter(
-            models.DetentionEvent.load_id == load.id).all()
-        for event in events:
-            if load.shipper_name not in shipper_map:
-                shipper_map[load.shipper_name] = {
-                    "shipper": load.shipper_name,
-                    "total_detention_minutes": 0,
-                    "total_amount": 0,
-                    "events": 0
-                }
-            shipper_map[load.shipper_name]["total_detention_minutes"] += event.detention_minutes
-            shipper_map[load.shipper_name]["total_amount"] += event.detention_amount
-            shipper_map[load.shipper_name]["events"] += 1
+    # Totals include archived events
+    Event = all_events()
+
+    # One grouped pass over detention events instead of a COUNT/SUM per metric
+    detention = db.query(
+        func.count(Event.id),
+        func.sum(case((Event.status == "completed", 1), else_=0)),
+        func.sum(case((Event.status == "active", 1), else_=0)),
+        func.sum(Event.detention_amount),
+        func.sum(Event.detention_minutes),
+        func.avg(Event.detention_minutes),
+    ).one()
+
+    loads = db.query(
+        func.count(models.Load.id),
+        func.sum(case((models.Load.status == "pending", 1), else_=0)),
+        func.sum(case((models.Load.status == "completed", 1), else_=0)),
+    ).one()
+
+    overview = db.query(
+        db.query(func.count(models.Shipment.id)).scalar_subquery(),
+        db.query(func.count(models.Driver.id)).scalar_subquery(),
+        db.query(func.count(models.Customer.id)).scalar_subquery(),
+        db.query(func.count(models.Warehouse.id)).scalar_subquery(),
+    ).one()
+
+    recent_events = db.query(Event).order_by(Event.id.desc()).limit(10).all()
+
+    shipper_rows = db.query(
+        models.Load.shipper_name,
+        func.sum(Event.detention_minutes),
+        func.sum(Event.detention_amount),
+        func.count(Event.id),
+    ).join(models.Load, models.Load.id == Event.load_id).group_by(
+        models.Load.shipper_name).order_by(models.Load.shipper_name).all()
 
     return {
         "detention": {
-            "total_events": total_events,
-            "completed_events": completed_events,
-            "active_events": active_events,
-            "total_amount": round(total_amount, 2),
-            "total_minutes": total_minutes,
-            "avg_detention_minutes": round(avg_detention, 1),
+            "total_events": detention[0],
+            "completed_events": detention[1] or 0,
+            "active_events": detention[2] or 0,
+            "total_amount": round(detention[3] or 0, 2),
+            "total_minutes": detention[4] or 0,
+            "avg_detention_minutes": round(detention[5] or 0, 1),
         },
         "loads": {
-            "total": total_loads,
-            "pending": pending_loads,
-            "completed": completed_loads,
+            "total": loads[0],
+            "pending": loads[1] or 0,
+            "completed": loads[2] or 0,
         },
         "overview": {
-            "total_shipments": total_shipments,
-            "total_drivers": total_drivers,
-            "total_customers": total_customers,
-            "total_warehouses": total_warehouses,
+            "total_shipments": overview[0],
+            "total_drivers": overview[1],
+            "total_customers": overview[2],
+            "total_warehouses": overview[3],
         },
         "recent_events": [
             {
@@ -344,5 +649,12 @@ def get_stats(db: Session = Depends(get_db),
                 "checkin_time": e.checkin_time,
             } for e in recent_events
         ],
-        "shipper_stats": list(shipper_map.values()),
-    }
\ No newline at end of file
+        "shipper_stats": [
+            {
+                "shipper": shipper,
+                "total_detention_minutes": minutes or 0,
+                "total_amount": amount or 0.0,
+                "events": count,
+            } for shipper, minutes, amount, count in shipper_rows
+        ],
+    }
@@ -1,37 +1,55 @@
-from fastapi import APIRouter, Depends
+from typing import Optional
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.orm import Session
 from backend.app.database import get_db
 from backend.app import models, schemas
+from backend.app.core.conditional import bump_version, conditional_get
+from backend.app.core.pagination import PageParams, paginate
 from backend.app.core.exceptions import NotFoundError
+from backend.app.core.timing import TimedRoute
 
-router = APIRouter(prefix="/drivers", tags=["Drivers"])
+router = APIRouter(prefix="/drivers", tags=["Drivers"], route_class=TimedRoute)
 
-@router.post("/")
+@router.post("/", response_model=schemas.DriverSummary)
 def create_driver(driver: schemas.DriverCreate, db: Session = Depends(get_db)):
     db_driver = models.Driver(**driver.dict())
     db.add(db_driver)
+    bump_version(db, "drivers")
     db.commit()
     db.refresh(db_driver)
     return db_driver
 
-@router.get("/")
-def get_drivers(db: Session = Depends(get_db)):
-    return db.query(models.Driver).all()
+@router.get("/", dependencies=[Depends(conditional_get("drivers"))],
+            response_model=list[schemas.DriverSummary])
+def get_drivers(response: Response,
+                name: Optional[str] = None,
+                name_prefix: Optional[str] = None,
+                page: PageParams = Depends(),
+                db: Session = Depends(get_db)):
+    query = db.query(models.Driver)
+    if name:
+        query = query.filter(models.Driver.name == name)
+    if name_prefix:
+        # Type-ahead for the driver pickers
+        query = query.filter(models.Driver.name.startswith(name_prefix, autoescape=True))
+    return paginate(query, models.Driver.id, page, response)
 
-@router.get("/{driver_id}")
+@router.get("/{driver_id}", dependencies=[Depends(conditional_get("drivers"))],
+            response_model=schemas.DriverSummary)
 def get_driver(driver_id: int, db: Session = Depends(get_db)):
     driver = db.query(models.Driver).filter(models.Driver.id == driver_id).first()
     if not driver:
         raise NotFoundError("Driver")
     return driver
 
-@router.put("/{driver_id}")
+@router.put("/{driver_id}", response_model=schemas.DriverSummary)
 def update_driver(driver_id: int, updated: schemas.DriverUpdate, db: Session = Depends(get_db)):
     driver = db.query(models.Driver).filter(models.Driver.id == driver_id).first()
     if not driver:
         raise NotFoundError("Driver")
     for key, value in updated.dict(exclude_unset=True).items():
         setattr(driver, key, value)
+    bump_version(db, "drivers")
     db.commit()
     db.refresh(driver)
     return driver
@@ -42,6 +60,7 @@ def delete_driver(driver_id: int, db: Session = Depends(get_db)):
     if not driver:
         raise NotFoundError("Driver")
     db.delete(driver)
+    bump_version(db, "drivers")
     db.commit()
     return {"message": "Driver deleted successfully"}
 
@@ -1,13 +1,17 @@
-from fastapi import APIRouter, Depends
+from typing import Optional
+from fastapi import APIRouter, Depends, File, Query, Response, UploadFile
 from sqlalchemy.orm import Session
-from backend.app.database import get_db
+from backend.app.database import engine, get_db
 from backend.app import models, schemas
 from backend.app.core.dependencies import get_current_user, require_dispatcher
 from backend.app.core.exceptions import NotFoundError
+from backend.app.core.pagination import PageParams, paginate
+from backend.app.core.timing import TimedRoute
+from backend.app.services.load_import import DEFAULT_BATCH_SIZE, detect_format, import_file
 
-router = APIRouter(prefix="/loads", tags=["Loads"])
+router = APIRouter(prefix="/loads", tags=["Loads"], route_class=TimedRoute)
 
-@router.post("/")
+@router.post("/", response_model=schemas.Load)
 def create_load(load: schemas.LoadCreate, db: Session = Depends(get_db),
                 current_user=Depends(require_dispatcher)):
     db_load = models.Load(**load.dict())
@@ -16,16 +20,43 @@ def create_load(load: schemas.LoadCreate, db: Session = Depends(get_db),
     db.refresh(db_load)
     return db_load
 
-@router.get("/")
-def get_loads(db: Session = Depends(get_db),
-              current_user=Depends(get_current_user)):
+def load_filters(current_user, status: Optional[str] = None,
+                 driver_id: Optional[int] = None, shipper_name: Optional[str] = None) -> list:
+    criteria = []
     # Drivers only see their own loads
     if current_user.role == "driver":
-        return db.query(models.Load).filter(
-            models.Load.driver_id == current_user.driver_id).all()
-    return db.query(models.Load).all()
+        criteria.append(models.Load.driver_id == current_user.driver_id)
+    elif driver_id is not None:
+        criteria.append(models.Load.driver_id == driver_id)
+    if status:
+        criteria.append(models.Load.status == status)
+    if shipper_name:
+        criteria.append(models.Load.shipper_name == shipper_name)
+    return criteria
+
+@router.post("/import")
+def import_loads(file: UploadFile = File(...),
+                 format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
+                 batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=50000),
+                 current_user=Depends(require_dispatcher)):
+    # Bulk counterpart of create_load for TMS exports (CSV with a header row,
+    # or one JSON object per line); rows are validated with LoadCreate
+    fmt = format or detect_format(file.filename, file.content_type)
+    return import_file(engine, file.file, fmt, batch_size)
+
+@router.get("/", response_model=list[schemas.Load])
+def get_loads(response: Response,
+              status: Optional[str] = None,
+              driver_id: Optional[int] = None,
+              shipper_name: Optional[str] = None,
+              page: PageParams = Depends(),
+              db: Session = Depends(get_db),
+              current_user=Depends(get_current_user)):
+    query = db.query(models.Load).filter(
+        *load_filters(current_user, status, driver_id, shipper_name))
+    return paginate(query, models.Load.id, page, response)
 
-@router.get("/{load_id}")
+@router.get("/{load_id}", response_model=schemas.Load)
 def get_load(load_id: int, db: Session = Depends(get_db),
              current_user=Depends(get_current_user)):
     load = db.query(models.Load).filter(models.Load.id == load_id).first()
@@ -36,7 +67,7 @@ def get_load(load_id: int, db: Session = Depends(get_db),
         raise HTTPException(status_code=403, detail="Access denied")
     return load
 
-@router.put("/{load_id}")
+@router.put("/{load_id}", response_model=schemas.Load)
 def update_load(load_id: int, updated: schemas.LoadUpdate,
                 db: Session = Depends(get_db),
                 current_user=Depends(require_dispatcher)):
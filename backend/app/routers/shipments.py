@@ -1,13 +1,16 @@
-from fastapi import APIRouter, Depends
+from typing import Optional
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.orm import Session
 from backend.app.database import get_db
 from backend.app import models, schemas
 from backend.app.core.dependencies import get_current_user
 from backend.app.core.exceptions import NotFoundError
+from backend.app.core.pagination import PageParams, paginate
+from backend.app.core.timing import TimedRoute
 
-router = APIRouter(prefix="/shipments", tags=["Shipments"])
+router = APIRouter(prefix="/shipments", tags=["Shipments"], route_class=TimedRoute)
 
-@router.post("/")
+@router.post("/", response_model=schemas.Shipment)
 def create_shipment(shipment: schemas.ShipmentCreate, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
     db_shipment = models.Shipment(**shipment.dict())
     db.add(db_shipment)
@@ -15,18 +18,33 @@ def create_shipment(shipment: schemas.ShipmentCreate, db: Session = Depends(get_
     db.refresh(db_shipment)
     return db_shipment
 
-@router.get("/")
-def get_shipments(db: Session = Depends(get_db)):
-    return db.query(models.Shipment).all()
+@router.get("/", response_model=list[schemas.Shipment])
+def get_shipments(response: Response,
+                  status: Optional[str] = None,
+                  driver_id: Optional[int] = None,
+                  customer_id: Optional[int] = None,
+                  warehouse_id: Optional[int] = None,
+                  page: PageParams = Depends(),
+                  db: Session = Depends(get_db)):
+    query = db.query(models.Shipment)
+    if status:
+        query = query.filter(models.Shipment.status == status)
+    if driver_id is not None:
+        query = query.filter(models.Shipment.driver_id == driver_id)
+    if customer_id is not None:
+        query = query.filter(models.Shipment.customer_id == customer_id)
+    if warehouse_id is not None:
+        query = query.filter(models.Shipment.warehouse_id == warehouse_id)
+    return paginate(query, models.Shipment.id, page, response)
 
-@router.get("/{shipment_id}")
+@router.get("/{shipment_id}", response_model=schemas.Shipment)
 def get_shipment(shipment_id: int, db: Session = Depends(get_db)):
     shipment = db.query(models.Shipment).filter(models.Shipment.id == shipment_id).first()
     if not shipment:
         raise NotFoundError("Shipment")
     return shipment
 
-@router.put("/{shipment_id}")
+@router.put("/{shipment_id}", response_model=schemas.Shipment)
 def update_shipment(shipment_id: int, updated: schemas.ShipmentUpdate, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
     shipment = db.query(models.Shipment).filter(models.Shipment.id == shipment_id).first()
     if not shipment:
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, Response
+from fastapi.concurrency import run_in_threadpool
+from backend.app.database import pool_stats
+from backend.app.core import metrics
+from backend.app.core.dependencies import require_dispatcher
+from backend.app.core.timing import TimedRoute
+from backend.app.services.detention_metrics import detention_gauges
+
+router = APIRouter(route_class=TimedRoute)
+
+@router.get("/")
+def root():
+    return {"message": "Logistics API running 🚀"}
+
+@router.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    # Async so the threadpool gauges can be read from the event loop; the
+    # business gauges only touch the database when due for a resync
+    if detention_gauges.stale():
+        await run_in_threadpool(detention_gauges.refresh)
+    return Response(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
+@router.get("/debug/db-pool", tags=["Debug"])
+def db_pool(current_user=Depends(require_dispatcher)):
+    return pool_stats()
@@ -1,36 +1,50 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, Response, HTTPException
 from sqlalchemy.orm import Session
 from backend.app.database import get_db
 from backend.app import models, schemas
+from backend.app.core.conditional import bump_version, conditional_get
+from backend.app.core.pagination import PageParams, paginate
+from backend.app.core.timing import TimedRoute
 
-router = APIRouter(prefix="/warehouses", tags=["Warehouses"])
+router = APIRouter(prefix="/warehouses", tags=["Warehouses"], route_class=TimedRoute)
 
-@router.post("/")
+@router.post("/", response_model=schemas.WarehouseSummary)
 def create_warehouse(warehouse: schemas.WarehouseCreate, db: Session = Depends(get_db)):
     db_warehouse = models.Warehouse(**warehouse.dict())
     db.add(db_warehouse)
+    bump_version(db, "warehouses")
     db.commit()
     db.refresh(db_warehouse)
     return db_warehouse
 
-@router.get("/")
-def get_warehouses(db: Session = Depends(get_db)):
-    return db.query(models.Warehouse).all()
+@router.get("/", dependencies=[Depends(conditional_get("warehouses"))],
+            response_model=list[schemas.WarehouseSummary])
+def get_warehouses(response: Response,
+                   name: Optional[str] = None,
+                   page: PageParams = Depends(),
+                   db: Session = Depends(get_db)):
+    query = db.query(models.Warehouse)
+    if name:
+        query = query.filter(models.Warehouse.name == name)
+    return paginate(query, models.Warehouse.id, page, response)
 
-@router.get("/{warehouse_id}")
+@router.get("/{warehouse_id}", dependencies=[Depends(conditional_get("warehouses"))],
+            response_model=schemas.WarehouseSummary)
 def get_warehouse(warehouse_id: int, db: Session = Depends(get_db)):
     warehouse = db.query(models.Warehouse).filter(models.Warehouse.id == warehouse_id).first()
     if not warehouse:
         raise HTTPException(status_code=404, detail="Warehouse not found")
     return warehouse
 
-@router.put("/{warehouse_id}")
+@router.put("/{warehouse_id}", response_model=schemas.WarehouseSummary)
 def update_warehouse(warehouse_id: int, updated: schemas.WarehouseUpdate, db: Session = Depends(get_db)):
     warehouse = db.query(models.Warehouse).filter(models.Warehouse.id == warehouse_id).first()
     if not warehouse:
         raise HTTPException(status_code=404, detail="Warehouse not found")
     for key, value in updated.dict(exclude_unset=True).items():
         setattr(warehouse, key, value)
+    bump_version(db, "warehouses")
     db.commit()
     db.refresh(warehouse)
     return warehouse
@@ -41,5 +55,6 @@ def delete_warehouse(warehouse_id: int, db: Session = Depends(get_db)):
     if not warehouse:
         raise HTTPException(status_code=404, detail="Warehouse not found")
     db.delete(warehouse)
+    bump_version(db, "warehouses")
     db.commit()
     return {"message": "Warehouse deleted successfully"}
\ No newline at end of file
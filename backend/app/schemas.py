@@ -1,6 +1,6 @@
 from datetime import datetime
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Literal, Optional
 
 # --- Shipment Schemas ---
 class ShipmentBase(BaseModel):
@@ -49,6 +49,14 @@ class Driver(DriverBase):
     class Config:
         from_attributes = True
 
+# Column-only views returned by the CRUD endpoints, so responses never
+# trigger a lazy load of shipments
+class DriverSummary(DriverBase):
+    id: int
+
+    class Config:
+        from_attributes = True
+
 # --- Warehouse Schemas ---
 class WarehouseBase(BaseModel):
     name: str
@@ -70,6 +78,12 @@ class Warehouse(WarehouseBase):
     class Config:
         from_attributes = True
 
+class WarehouseSummary(WarehouseBase):
+    id: int
+
+    class Config:
+        from_attributes = True
+
 # --- Customer Schemas ---
 class CustomerBase(BaseModel):
     name: str
@@ -88,6 +102,12 @@ class Customer(CustomerBase):
     id: int
     shipments: list[Shipment] = []
 
+    class Config:
+        from_attributes = True
+
+class CustomerSummary(CustomerBase):
+    id: int
+
     class Config:
         from_attributes = True
 
@@ -158,22 +178,6 @@ class DetentionCheckin(BaseModel):
 class DetentionCheckout(BaseModel):
     notes: Optional[str] = None
 
-class DetentionEvent(BaseModel):
-    id: int
-    load_id: int
-    driver_id: int
-    checkin_time: datetime
-    checkout_time: Optional[datetime] = None
-    free_time_minutes: int
-    detention_rate: float
-    detention_minutes: int
-    detention_amount: float
-    status: str
-    notes: Optional[str] = None
-
-    class Config:
-        from_attributes = True
-
 class CreateDriverAccount(BaseModel):
     email: str
     username: str
@@ -195,4 +199,52 @@ class DetentionEvent(BaseModel):
     notes: Optional[str] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class EarningsTotals(BaseModel):
+    events: int = 0
+    detention_minutes: int = 0
+    amount_owed: float = 0.0
+    amount_requested: float = 0.0
+    amount_paid: float = 0.0
+    amount_outstanding: float = 0.0
+
+class EarningsPeriod(EarningsTotals):
+    period: str
+
+class DriverEarningsSummary(BaseModel):
+    driver_id: int
+    totals: EarningsTotals
+    periods: list[EarningsPeriod]
+
+class ShipperScorecard(BaseModel):
+    shipper_name: str
+    events: int
+    over_free_time: int
+    over_free_time_ratio: float
+    # "p50", "p90", ... -> minutes from check-in to check-out, within 1% before rounding to 0.1
+    dwell_minutes: dict[str, float]
+
+class DetentionSyncOperation(BaseModel):
+    op: Literal["checkin", "checkout"]
+    idempotency_key: str = Field(min_length=1, max_length=64)
+    client_seq: int
+    client_time: datetime
+    # checkin
+    load_id: Optional[int] = None
+    free_time_minutes: Optional[int] = 120
+    detention_rate: Optional[float] = 50.0
+    # checkout: either the event id, or the idempotency key of a queued checkin
+    event_id: Optional[int] = None
+    checkin_key: Optional[str] = None
+    notes: Optional[str] = None
+
+class DetentionSyncRequest(BaseModel):
+    operations: list[DetentionSyncOperation]
+
+class DetentionSyncResult(BaseModel):
+    idempotency_key: str
+    client_seq: int
+    status: Literal["applied", "duplicate", "rejected"]
+    event_id: Optional[int] = None
+    error: Optional[str] = None
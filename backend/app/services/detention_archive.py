@@ -0,0 +1,120 @@
+"""
+Hot/cold split of detention events.
+
+detention_events holds the live working set: active events, open payment
+requests and recent history. Once an event is paid and was checked in more
+than ARCHIVE_RETENTION_DAYS ago, archive_paid_events() moves it, id and all,
+into detention_events_archive. On PostgreSQL that table is partitioned by
+month of checkin_time, so old months can later be detached or dropped whole.
+
+History reads use all_events(), which sees both tables.
+
+    python -m backend.app.services.detention_archive
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, insert, literal, select, text, union_all
+from sqlalchemy.orm import Session, aliased
+from backend.app import models
+from backend.app.core.config import settings
+from backend.app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+HOT = models.DetentionEvent.__table__
+COLD = models.ArchivedDetentionEvent.__table__
+EVENT_COLUMNS = [column.name for column in HOT.columns]
+
+def all_events():
+    """
+    DetentionEvent entity over detention_events UNION ALL the archive.
+
+    Use it in place of models.DetentionEvent for reads that must also find
+    archived events. Filters and ORDER BY ... LIMIT on it are pushed down
+    into both branches, so each side still uses its own indexes. Objects
+    loaded through it are for reading only.
+    """
+    both = union_all(
+        select(*[HOT.c[name] for name in EVENT_COLUMNS]),
+        select(*[COLD.c[name] for name in EVENT_COLUMNS]),
+    ).subquery("detention_events_all")
+    return aliased(models.DetentionEvent, both, adapt_on_names=True)
+
+def _month_start(moment: datetime) -> datetime:
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+def _ensure_month_partition(db: Session, month: datetime):
+    following = _month_start(month + timedelta(days=32))
+    name = f"{COLD.name}_y{month:%Y}m{month:%m}"
+    if db.scalar(text("SELECT to_regclass(:name)"), {"name": name}) is None:
+        db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {COLD.name} "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{following:%Y-%m-%d}')"))
+
+def archive_batch(db: Session, cutoff: datetime, batch_size: int) -> int:
+    """Move up to batch_size paid events checked in before cutoff; returns how many moved."""
+    # SKIP LOCKED keeps archivers in several workers off each other's rows
+    rows = db.execute(
+        select(HOT.c.id, HOT.c.checkin_time)
+        .where(HOT.c.payment_status == "paid", HOT.c.checkin_time < cutoff)
+        .order_by(HOT.c.checkin_time)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if not rows:
+        return 0
+    if db.get_bind().dialect.name == "postgresql":
+        for month in {_month_start(row.checkin_time) for row in rows}:
+            _ensure_month_partition(db, month)
+    ids = [row.id for row in rows]
+    archived_at = datetime.now(timezone.utc)
+    db.execute(insert(COLD).from_select(
+        EVENT_COLUMNS + ["archived_at"],
+        select(*[HOT.c[name] for name in EVENT_COLUMNS], literal(archived_at, COLD.c.archived_at.type))
+        .where(HOT.c.id.in_(ids)),
+    ))
+    db.execute(delete(HOT).where(HOT.c.id.in_(ids)))
+    db.commit()
+    return len(ids)
+
+def archive_paid_events(now: datetime = None) -> int:
+    """Archive every eligible event, one transaction per batch; returns the total moved."""
+    now = now or datetime.now(timezone.utc)
+    cutoff = (now - timedelta(days=settings.ARCHIVE_RETENTION_DAYS)).replace(tzinfo=None)
+    moved = 0
+    with SessionLocal() as db:
+        while True:
+            count = archive_batch(db, cutoff, settings.ARCHIVE_BATCH_SIZE)
+            moved += count
+            if count < settings.ARCHIVE_BATCH_SIZE:
+                return moved
+
+async def _archive_periodically():
+    while True:
+        await asyncio.sleep(settings.ARCHIVE_INTERVAL_SECONDS)
+        try:
+            moved = await run_in_threadpool(archive_paid_events)
+        except Exception:
+            logger.exception("Archiving paid detention events failed")
+            continue
+        if moved:
+            logger.info("Archived %d paid detention events", moved)
+
+_archiver = None
+
+def start_archiver():
+    """Run archive_paid_events() every ARCHIVE_INTERVAL_SECONDS (0 disables)."""
+    global _archiver
+    if settings.ARCHIVE_INTERVAL_SECONDS > 0 and _archiver is None:
+        _archiver = asyncio.get_running_loop().create_task(_archive_periodically())
+
+def stop_archiver():
+    global _archiver
+    if _archiver is not None:
+        _archiver.cancel()
+        _archiver = None
+
+if __name__ == "__main__":
+    print(f"Archived {archive_paid_events()} paid detention events")
@@ -0,0 +1,85 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from sqlalchemy import select
+from backend.app import models
+
+EXPORT_BATCH_SIZE = 2000
+
+MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+def export_columns(Event=models.DetentionEvent) -> list:
+    # Flat accounting view of an event: the event itself plus the load and
+    # driver fields accounting would otherwise look up one by one
+    return [
+        Event.id.label("event_id"),
+        Event.load_id,
+        models.Load.load_number,
+        models.Load.shipper_name,
+        models.Load.shipper_address,
+        Event.driver_id,
+        models.Driver.name.label("driver_name"),
+        Event.checkin_time,
+        Event.checkout_time,
+        Event.free_time_minutes,
+        Event.detention_rate,
+        Event.detention_minutes,
+        Event.detention_amount,
+        Event.status,
+        Event.payment_status,
+        Event.notes,
+    ]
+
+FIELDS = [column.key for column in export_columns()]
+
+def export_statement(Event=models.DetentionEvent):
+    """Column-only select, so rows never become ORM objects in the session."""
+    return select(*export_columns(Event)).outerjoin(
+        models.Load, models.Load.id == Event.load_id
+    ).outerjoin(
+        models.Driver, models.Driver.id == Event.driver_id
+    ).order_by(Event.id)
+
+def _plain(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+def _csv_chunks(batches):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(FIELDS)
+    for rows in batches:
+        writer.writerows([_plain(value) for value in row] for row in rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    # The header alone when nothing matched
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+def _ndjson_chunks(batches):
+    for rows in batches:
+        yield "".join(
+            json.dumps(dict(zip(FIELDS, map(_plain, row)))) + "\n" for row in rows
+        ).encode()
+
+def gzip_chunks(chunks):
+    """Compress a byte stream on the fly into a single gzip member."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+def stream_export(batches, fmt: str, compress: bool = False):
+    """
+    Encode batches of export rows as CSV or NDJSON, one chunk per batch.
+
+    batches is an iterable of row lists in FIELDS order, such as the
+    partitions of a yield_per result, so memory stays at one batch no
+    matter how many rows the export covers.
+    """
+    chunks = _ndjson_chunks(batches) if fmt == "ndjson" else _csv_chunks(batches)
+    return gzip_chunks(chunks) if compress else chunks
@@ -0,0 +1,77 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+from fastapi.encoders import jsonable_encoder
+from backend.app.services.detention_recalc import as_utc, calculate_detention
+
+SUBSCRIBER_QUEUE_SIZE = 256
+
+def active_event_view(event, now: datetime = None) -> dict:
+    """Live view of an active detention event, as served by /detention/active."""
+    now = now or datetime.now(timezone.utc)
+    elapsed_minutes = int((now - as_utc(event.checkin_time)).total_seconds() / 60)
+    detention_minutes, detention_amount = calculate_detention(
+        event.checkin_time, now, event.free_time_minutes, event.detention_rate)
+    return {
+        "id": event.id,
+        "load_id": event.load_id,
+        "driver_id": event.driver_id,
+        "checkin_time": event.checkin_time,
+        "elapsed_minutes": elapsed_minutes,
+        "free_time_remaining": max(0, event.free_time_minutes - elapsed_minutes),
+        "detention_minutes": detention_minutes,
+        "detention_amount": detention_amount,
+        "status": event.status,
+    }
+
+def format_sse(event_type: str, payload) -> str:
+    data = json.dumps(jsonable_encoder(payload), separators=(",", ":"))
+    return f"event: {event_type}\ndata: {data}\n\n"
+
+class DetentionFeed:
+    """
+    In-process fan-out of detention check-in/check-out deltas.
+
+    Handlers run in Starlette's threadpool, so publish() hands each message to
+    the event loop with call_soon_threadsafe; delivery to subscribers is then a
+    put_nowait per queue. Free-time expiry and accrual messages come from
+    services/detention_timers.py. A subscriber that falls a full queue behind
+    is dropped so a stalled client cannot hold memory; it reconnects and gets
+    a fresh snapshot.
+    """
+
+    def __init__(self):
+        self._loop = None
+        self._subscribers = set()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> asyncio.Queue:
+        """Register a subscriber; a None message means it was dropped."""
+        self._loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    def publish(self, event_type: str, payload: dict):
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(self._dispatch, format_sse(event_type, payload))
+
+    def _dispatch(self, message: str):
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Make room for the close sentinel the stream is waiting on
+                self._subscribers.discard(queue)
+                queue.get_nowait()
+                queue.put_nowait(None)
+
+detention_feed = DetentionFeed()
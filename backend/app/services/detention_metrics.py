@@ -0,0 +1,55 @@
+import threading
+import time
+from sqlalchemy import func, select
+from backend.app import models
+from backend.app.core.config import settings
+from backend.app.core.metrics import Collected, registry
+from backend.app.database import SessionLocal
+
+class DetentionGauges:
+    """
+    Active detention and pending payment request counts for /metrics.
+
+    The handlers that change either number adjust it in place, so a scrape
+    costs nothing. The counts are re-read from the database only every
+    METRICS_GAUGE_RESYNC_SECONDS; that is also what picks up changes made
+    by other worker processes or outside the API.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.active = None
+        self.pending_payments = None
+        self._refreshed_at = None
+
+    def stale(self) -> bool:
+        return (self._refreshed_at is None
+                or time.monotonic() - self._refreshed_at >= settings.METRICS_GAUGE_RESYNC_SECONDS)
+
+    def refresh(self):
+        # Both counts are served by the partial indexes from migration 0002
+        with SessionLocal() as db:
+            active = db.scalar(select(func.count()).where(models.DetentionEvent.status == "active"))
+            pending = db.scalar(select(func.count()).where(
+                models.DetentionEvent.payment_status == "requested"))
+        with self._lock:
+            self.active = active
+            self.pending_payments = pending
+            self._refreshed_at = time.monotonic()
+
+    def adjust(self, active: int = 0, pending_payments: int = 0):
+        with self._lock:
+            # Before the first refresh there is nothing to adjust; the count will include it
+            if self._refreshed_at is None:
+                return
+            self.active += active
+            self.pending_payments += pending_payments
+
+detention_gauges = DetentionGauges()
+
+registry.register(Collected(
+    "detention_active_events", "Detention events currently checked in.",
+    lambda: detention_gauges.active))
+registry.register(Collected(
+    "detention_payment_requests_pending", "Completed detention events awaiting payment.",
+    lambda: detention_gauges.pending_payments))
@@ -0,0 +1,214 @@
+"""
+Batch recalculation of detention minutes and amounts.
+
+calculate_detention() is the reference scalar formula used at checkout.
+recalculate() applies the same formula to completed events in bulk, for
+example after a shipper contract changes free_time_minutes or detention_rate
+retroactively: events are read in keyset-ordered column chunks, computed with
+NumPy array arithmetic and written back with executemany UPDATEs of only the
+rows whose values change, together with the matching driver_earnings and
+shipper scorecard deltas.
+Results are bit-for-bit identical to calculate_detention, including float
+rounding.
+"""
+from datetime import datetime, timezone
+from sqlalchemy import bindparam, func, or_, select, update
+from backend.app import models
+
+DEFAULT_CHUNK_SIZE = 50_000
+DIFF_SAMPLE_SIZE = 20
+
+def as_utc(value: datetime) -> datetime:
+    # SQLite and timestamp-without-time-zone columns hand back naive datetimes
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+def calculate_detention(checkin: datetime, checkout: datetime,
+                        free_time_minutes: int, rate: float):
+    total_minutes = int((as_utc(checkout) - as_utc(checkin)).total_seconds() / 60)
+    detention_minutes = max(0, total_minutes - free_time_minutes)
+    detention_amount = round((detention_minutes / 60) * rate, 2)
+    return detention_minutes, detention_amount
+
+def _utc_naive(value: datetime) -> datetime:
+    return as_utc(value).astimezone(timezone.utc).replace(tzinfo=None)
+
+def calculate_detention_vectorized(checkin_us, checkout_us, free_time_minutes, rates):
+    """
+    Array form of calculate_detention.
+
+    checkin_us/checkout_us are int64 microseconds since the epoch. Every step
+    mirrors the scalar code: timedelta.total_seconds() is exact integer
+    microseconds divided by 1e6, int() truncates toward zero, and round(x, 2)
+    is reproduced with np.round except where x*100 lands within a hair of a
+    .5 tie; those few values are re-rounded with Python's correctly rounded
+    round() so results always match.
+    """
+    import numpy as np
+
+    total_minutes = np.trunc((checkout_us - checkin_us) / 1e6 / 60).astype(np.int64)
+    detention_minutes = np.maximum(0, total_minutes - free_time_minutes)
+    raw_amounts = (detention_minutes / 60) * rates
+    amounts = np.round(raw_amounts, 2)
+    scaled = raw_amounts * 100
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for index in np.flatnonzero(near_tie):
+        amounts[index] = round(float(raw_amounts[index]), 2)
+    return detention_minutes, amounts
+
+def _or_default(column):
+    # Rows written outside the ORM may hold NULL; read them as the model default
+    return func.coalesce(column, column.default.arg)
+
+def _chunk_statement(filters: dict, after_id: int, chunk_size: int):
+    Event = models.DetentionEvent
+    nullable = (Event.free_time_minutes, Event.detention_rate, Event.detention_minutes, Event.detention_amount)
+    stmt = select(
+        Event.id, Event.checkin_time, Event.checkout_time, *map(_or_default, nullable),
+        Event.driver_id, Event.payment_status, models.Load.shipper_name,
+        or_(*(column.is_(None) for column in nullable)),
+    ).outerjoin(models.Load, models.Load.id == Event.load_id).where(
+        Event.status == "completed", Event.checkout_time.is_not(None), Event.id > after_id)
+    if filters.get("shipper_name"):
+        stmt = stmt.where(models.Load.shipper_name == filters["shipper_name"])
+    if filters.get("start_date"):
+        stmt = stmt.where(Event.checkin_time >= filters["start_date"])
+    if filters.get("end_date"):
+        stmt = stmt.where(Event.checkin_time <= filters["end_date"])
+    if filters.get("event_ids"):
+        stmt = stmt.where(Event.id.in_(filters["event_ids"]))
+    return stmt.order_by(Event.id).limit(chunk_size)
+
+def _apply_earnings_deltas(connection, changes):
+    # Completed events are already in the ledger; move their rows by the change
+    from backend.app.services.driver_earnings import earnings_period, earnings_upsert
+
+    deltas = {}
+    for driver_id, checkin, payment_status, minutes, amount in changes:
+        if driver_id is None or (minutes == 0 and amount == 0):
+            continue
+        delta = deltas.setdefault((driver_id, earnings_period(checkin)), {
+            "detention_minutes": 0, "amount_owed": 0.0,
+            "amount_requested": 0.0, "amount_paid": 0.0})
+        delta["detention_minutes"] += minutes
+        delta["amount_owed"] += amount
+        if payment_status == "requested":
+            delta["amount_requested"] += amount
+        elif payment_status == "paid":
+            delta["amount_paid"] += amount
+    for (driver_id, period), delta in deltas.items():
+        connection.execute(earnings_upsert(connection.dialect.name, driver_id, period, delta))
+
+def _apply_scorecard_deltas(connection, changes):
+    # Dwell time is fixed by the timestamps; only the over-free-time count can move
+    from backend.app.services.shipper_scorecards import (
+        checkin_day, dwell_bucket, dwell_minutes, sketch_upsert
+    )
+
+    deltas = {}
+    for shipper_name, checkin, checkout, was_over, is_over in changes:
+        if not shipper_name or was_over == is_over:
+            continue
+        key = (shipper_name, checkin_day(checkin), dwell_bucket(dwell_minutes(checkin, checkout)))
+        deltas[key] = deltas.get(key, 0) + (1 if is_over else -1)
+    for (shipper_name, day, bucket), delta in deltas.items():
+        if delta:
+            connection.execute(sketch_upsert(connection.dialect.name, shipper_name, day, bucket, 0, delta))
+
+def recalculate(engine, shipper_name: str = None, start_date: datetime = None,
+                end_date: datetime = None, event_ids: list = None,
+                free_time_minutes: int = None, detention_rate: float = None,
+                dry_run: bool = True, verify: bool = False,
+                chunk_size: int = DEFAULT_CHUNK_SIZE) -> dict:
+    """
+    Recompute completed events, optionally with new contract terms.
+
+    free_time_minutes / detention_rate, when given, replace the stored terms
+    of every matching event. With dry_run (the default) nothing is written and
+    the report describes what would change. verify re-checks every row
+    against calculate_detention and raises on the first mismatch.
+    """
+    import numpy as np
+
+    filters = {"shipper_name": shipper_name, "start_date": start_date,
+               "end_date": end_date, "event_ids": event_ids}
+    report = {"dry_run": dry_run, "scanned": 0, "changed": 0,
+              "amount_before": 0.0, "amount_after": 0.0, "sample": []}
+    table = models.DetentionEvent.__table__
+    write = update(table).where(table.c.id == bindparam("_id")).values(
+        free_time_minutes=bindparam("_free_time"),
+        detention_rate=bindparam("_rate"),
+        detention_minutes=bindparam("_minutes"),
+        detention_amount=bindparam("_amount"),
+    )
+    epoch = np.datetime64(0, "us")
+
+    after_id = 0
+    with engine.connect() as connection:
+        while True:
+            rows = connection.execute(_chunk_statement(filters, after_id, chunk_size)).all()
+            if not rows:
+                break
+            after_id = rows[-1][0]
+            (ids, checkins, checkouts, free_times, rates, old_minutes, old_amounts,
+             driver_ids, payment_statuses, shipper_names, has_nulls) = zip(*rows)
+
+            checkin_us = (np.array([_utc_naive(v) for v in checkins], dtype="datetime64[us]") - epoch).astype(np.int64)
+            checkout_us = (np.array([_utc_naive(v) for v in checkouts], dtype="datetime64[us]") - epoch).astype(np.int64)
+            old_free = np.array(free_times, dtype=np.int64)
+            old_rate = np.array(rates, dtype=np.float64)
+            new_free = np.full_like(old_free, free_time_minutes) if free_time_minutes is not None else old_free
+            new_rate = np.full_like(old_rate, detention_rate) if detention_rate is not None else old_rate
+
+            minutes, amounts = calculate_detention_vectorized(checkin_us, checkout_us, new_free, new_rate)
+            if verify:
+                for i in range(len(ids)):
+                    expected = calculate_detention(checkins[i], checkouts[i], int(new_free[i]), float(new_rate[i]))
+                    if expected != (int(minutes[i]), float(amounts[i])):
+                        raise AssertionError(f"event {ids[i]}: vectorized {(int(minutes[i]), float(amounts[i]))} != {expected}")
+
+            before_minutes = np.array(old_minutes, dtype=np.int64)
+            before_amounts = np.array(old_amounts, dtype=np.float64)
+            changed = np.flatnonzero(
+                (minutes != before_minutes) | (amounts != before_amounts)
+                | (new_free != old_free) | (new_rate != old_rate)
+                | np.array(has_nulls, dtype=bool))
+
+            report["scanned"] += len(ids)
+            report["changed"] += len(changed)
+            report["amount_before"] += float(before_amounts.sum())
+            report["amount_after"] += float(amounts.sum())
+            for i in changed[:DIFF_SAMPLE_SIZE - len(report["sample"])]:
+                report["sample"].append({
+                    "id": ids[i],
+                    "detention_minutes": [int(before_minutes[i]), int(minutes[i])],
+                    "detention_amount": [float(before_amounts[i]), float(amounts[i])],
+                })
+
+            if not dry_run and len(changed):
+                connection.execute(write, [
+                    {"_id": ids[i], "_free_time": int(new_free[i]), "_rate": float(new_rate[i]),
+                     "_minutes": int(minutes[i]), "_amount": float(amounts[i])}
+                    for i in changed
+                ])
+                _apply_earnings_deltas(connection, [
+                    (driver_ids[i], checkins[i], payment_statuses[i],
+                     int(minutes[i]) - int(before_minutes[i]),
+                     float(amounts[i]) - float(before_amounts[i]))
+                    for i in changed
+                ])
+                _apply_scorecard_deltas(connection, [
+                    (shipper_names[i], checkins[i], checkouts[i],
+                     bool(before_minutes[i] > 0), bool(minutes[i] > 0))
+                    for i in changed
+                ])
+            # One transaction per chunk keeps locks and undo short on big tables
+            connection.commit()
+            if len(rows) < chunk_size:
+                break
+
+    report["amount_before"] = round(report["amount_before"], 2)
+    report["amount_after"] = round(report["amount_after"], 2)
+    report["amount_delta"] = round(report["amount_after"] - report["amount_before"], 2)
+    return report
@@ -0,0 +1,215 @@
+import hashlib
+import io
+import json
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import lru_cache
+from backend.app.core.cache import SizedLRUCache
+from backend.app.core.config import settings
+from backend.app.core.metrics import report_render_duration
+from backend.app.core.timing import track
+
+# Bump when the PDF layout changes so cached reports and client ETags roll over
+REPORT_LAYOUT_VERSION = 1
+
+report_cache = SizedLRUCache(max_bytes=settings.REPORT_CACHE_MAX_BYTES)
+
+def _utc(value) -> str:
+    return value.strftime("%Y-%m-%d %H:%M:%S UTC")
+
+def report_context(event, load, driver, checkin_received=None, checkout_received=None) -> dict:
+    """
+    Every value printed on a detention report, as plain picklable data.
+
+    checkin_received / checkout_received are the server receipt times of a
+    check-in or check-out synced from a driver's device, whose own timestamp
+    is then the device clock.
+    """
+    rows = [
+        ["Report ID", f"DET-{event.id:05d}"],
+        ["Load Number", load.load_number if load else "N/A"],
+        ["Shipper", load.shipper_name if load else "N/A"],
+        ["Shipper Address", load.shipper_address if load else "N/A"],
+        ["Driver", driver.name if driver else "N/A"],
+        ["Driver Phone", driver.phone if driver else "N/A"],
+        ["Check-In Time", _utc(event.checkin_time)],
+        ["Check-Out Time", _utc(event.checkout_time) if event.checkout_time else "Still Active"],
+        ["Free Time Allowed", f"{event.free_time_minutes} minutes"],
+        ["Total Detention Time", f"{event.detention_minutes} minutes ({round(event.detention_minutes/60, 2)} hours)"],
+        ["Detention Rate", f"${event.detention_rate}/hour"],
+        ["TOTAL AMOUNT OWED", f"${event.detention_amount}"],
+        ["Status", event.status.upper()],
+    ]
+    context = {"rows": rows, "notes": event.notes}
+    received = []
+    if checkin_received:
+        rows[6][1] += " (device clock)"
+        received.append(["Check-In Received", _utc(checkin_received)])
+    if checkout_received:
+        rows[7][1] += " (device clock)"
+        received.append(["Check-Out Received", _utc(checkout_received)])
+    if received:
+        rows[8:8] = received
+        context["synced"] = True
+    return context
+
+def report_etag(context: dict) -> str:
+    # Content address: any change to a printed field yields a new key, so
+    # stale cache entries are never served and simply age out of the LRU.
+    digest = hashlib.sha256(json.dumps(
+        [REPORT_LAYOUT_VERSION, context], separators=(",", ":")).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+@lru_cache(maxsize=1)
+def _report_styles():
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle  # type: ignore
+    from reportlab.lib import colors  # type: ignore
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle('T', parent=styles['Title'], fontSize=22,
+                                 textColor=colors.HexColor('#1a1a2e'))
+    body_style = ParagraphStyle('B', parent=styles['Normal'], fontSize=10, leading=16)
+    return title_style, body_style
+
+def render_report(context: dict) -> bytes:
+    from reportlab.lib.pagesizes import letter  # type: ignore
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, HRFlowable, Table, TableStyle  # type: ignore
+    from reportlab.lib import colors  # type: ignore
+    from reportlab.lib.units import inch  # type: ignore
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter,
+                            rightMargin=0.75*inch, leftMargin=0.75*inch,
+                            topMargin=0.75*inch, bottomMargin=0.75*inch)
+    title_style, body_style = _report_styles()
+    story = []
+
+    story.append(Paragraph("DETENTION TIME REPORT", title_style))
+    story.append(HRFlowable(width="100%", thickness=2, color=colors.HexColor('#4a4a8a')))
+    story.append(Spacer(1, 0.2*inch))
+
+    table = Table([["Field", "Details"]] + context["rows"], colWidths=[2.5*inch, 4*inch])
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0,0), (-1,0), colors.HexColor('#1a1a2e')),
+        ('TEXTCOLOR', (0,0), (-1,0), colors.white),
+        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0,0), (-1,-1), 9),
+        ('ROWBACKGROUNDS', (0,1), (-1,-2), [colors.white, colors.HexColor('#f4f4f4')]),
+        ('GRID', (0,0), (-1,-1), 0.5, colors.HexColor('#cccccc')),
+        ('TOPPADDING', (0,0), (-1,-1), 7),
+        ('BOTTOMPADDING', (0,0), (-1,-1), 7),
+        ('LEFTPADDING', (0,0), (-1,-1), 8),
+        ('BACKGROUND', (0,-1), (-1,-1), colors.HexColor('#27ae60')),
+        ('TEXTCOLOR', (0,-1), (-1,-1), colors.white),
+        ('FONTNAME', (0,-1), (-1,-1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0,-1), (-1,-1), 11),
+    ]))
+    story.append(table)
+    story.append(Spacer(1, 0.3*inch))
+
+    if context["notes"]:
+        story.append(Paragraph(f"Notes: {context['notes']}", body_style))
+
+    story.append(Spacer(1, 0.5*inch))
+    story.append(Paragraph("This report was automatically generated by the Logistics Management System.", body_style))
+    if context.get("synced"):
+        story.append(Paragraph("Times marked (device clock) were recorded on the driver's device while "
+                               "offline; the Received rows show when the server got each one.", body_style))
+    else:
+        story.append(Paragraph("Timestamps are recorded server-side and cannot be altered.", body_style))
+
+    doc.build(story)
+    return buffer.getvalue()
+
+def timed_render(context: dict):
+    """render_report plus its duration, measured where the rendering runs."""
+    started = time.perf_counter()
+    pdf = render_report(context)
+    return pdf, time.perf_counter() - started
+
+def cached_report(context: dict, etag: str = None) -> bytes:
+    etag = etag or report_etag(context)
+    pdf = report_cache.get(etag)
+    if pdf is None:
+        with track("render"):
+            pdf, seconds = timed_render(context)
+        report_render_duration.observe(seconds)
+        report_cache.set(etag, pdf)
+    return pdf
+
+
+# --- Bulk export ---
+
+_render_pool = None
+
+def _get_render_pool() -> ProcessPoolExecutor:
+    global _render_pool
+    if _render_pool is None:
+        _render_pool = ProcessPoolExecutor(max_workers=settings.REPORT_RENDER_WORKERS)
+    return _render_pool
+
+def shutdown_render_pool():
+    global _render_pool
+    if _render_pool is not None:
+        _render_pool.shutdown(wait=False, cancel_futures=True)
+        _render_pool = None
+
+class _ZipSink:
+    """Write-only, unseekable file object that zipfile streams into."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def stream_report_zip(reports):
+    """
+    Yield a ZIP archive of detention reports chunk by chunk.
+
+    reports is an iterable of (event_id, context) pairs. PDFs are rendered on
+    the render process pool with at most two per worker in flight, and each
+    one is written to the archive as soon as it finishes, so memory is bounded
+    by that window rather than by the number of reports.
+    """
+    pool = _get_render_pool()
+    window = settings.REPORT_RENDER_WORKERS * 2
+    sink = _ZipSink()
+    pending = {}
+
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED) as archive:
+        def write_done(futures):
+            for future in futures:
+                event_id = pending.pop(future)
+                pdf, seconds = future.result()
+                report_render_duration.observe(seconds)
+                archive.writestr(f"detention-report-{event_id}.pdf", pdf)
+
+        for event_id, context in reports:
+            pdf = report_cache.get(report_etag(context))
+            if pdf is not None:
+                archive.writestr(f"detention-report-{event_id}.pdf", pdf)
+            else:
+                pending[pool.submit(timed_render, context)] = event_id
+                if len(pending) >= window:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    write_done(done)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            write_done(done)
+            yield sink.drain()
+
+    yield sink.drain()
@@ -0,0 +1,234 @@
+"""
+Server-side free-time expiry and hourly accrual for active detentions.
+
+One min-heap of (deadline, event_id, boundary) entries drives every active
+event. Boundary 0 is the end of free time and boundary k is the k-th
+billable hour. Check-in, check-out and each firing cost one O(log n) heap
+operation. Check-out only forgets the event; its heap entry is skipped when
+it surfaces. A single task sleeps until the earliest deadline. It then
+confirms in one query that the due events are still active, since another
+worker may have checked them out, and publishes free_time_expired or
+detention_accrued to SSE subscribers and webhooks.
+
+The heap lives in process memory. It is built from the active rows at
+startup, and every DETENTION_TIMER_RESYNC_SECONDS it picks up check-ins that
+other workers handled. A boundary crossed less than
+DETENTION_TIMER_CATCHUP_SECONDS before an event is first seen still fires,
+so a restart does not swallow it. Receivers dedupe on the
+"<event_id>:<boundary>" idempotency key.
+"""
+import asyncio
+import heapq
+import logging
+import time
+from datetime import datetime, timezone
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from backend.app import models
+from backend.app.core.config import settings
+from backend.app.core.metrics import Collected, Counter, registry
+from backend.app.database import SessionLocal
+from backend.app.services.detention_feed import detention_feed
+from backend.app.services.detention_recalc import as_utc
+from backend.app.services.webhooks import webhooks
+
+logger = logging.getLogger(__name__)
+
+ACCRUAL_SECONDS = 3600
+VERIFY_CHUNK_SIZE = 1000
+
+Event = models.DetentionEvent
+TIMER_COLUMNS = (Event.id, Event.load_id, Event.driver_id, Event.checkin_time,
+                 Event.free_time_minutes, Event.detention_rate)
+
+def _active_rows() -> list:
+    with SessionLocal() as db:
+        return db.execute(select(*TIMER_COLUMNS).where(Event.status == "active")).all()
+
+def _still_active(event_ids: list) -> set:
+    active = set()
+    with SessionLocal() as db:
+        for start in range(0, len(event_ids), VERIFY_CHUNK_SIZE):
+            chunk = event_ids[start:start + VERIFY_CHUNK_SIZE]
+            active.update(db.scalars(select(Event.id).where(Event.id.in_(chunk), Event.status == "active")))
+    return active
+
+class _Timer:
+    __slots__ = ("load_id", "driver_id", "expires_at", "rate", "boundary")
+
+    def deadline(self, boundary: int) -> float:
+        return self.expires_at + boundary * ACCRUAL_SECONDS
+
+class DetentionTimers:
+    def __init__(self):
+        self._loop = None
+        self._tasks = []
+        self._wake = None
+        self._heap = []
+        self._timers = {}
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    async def start(self):
+        """Build the heap from the active rows and start firing; call on the event loop."""
+        if self._tasks:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self.load(await run_in_threadpool(_active_rows), time.time())
+        self._tasks = [self._loop.create_task(self._run())]
+        if settings.DETENTION_TIMER_RESYNC_SECONDS > 0:
+            self._tasks.append(self._loop.create_task(self._resync_periodically()))
+
+    def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        self._loop = None
+
+    # Thread-safe entry points for request handlers
+
+    def add(self, event):
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        row = tuple(getattr(event, column.key) for column in TIMER_COLUMNS)
+        loop.call_soon_threadsafe(self._add, row)
+
+    def remove(self, event_id: int):
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(self._timers.pop, event_id, None)
+
+    # Everything below runs on the event loop
+
+    def _schedule(self, row, now: float):
+        """Track an event if new; returns its first heap entry or None."""
+        event_id, load_id, driver_id, checkin_time, free_time_minutes, rate = row
+        if event_id in self._timers:
+            return None
+        timer = _Timer()
+        timer.load_id, timer.driver_id, timer.rate = load_id, driver_id, rate or 0.0
+        timer.expires_at = as_utc(checkin_time).timestamp() + (free_time_minutes or 0) * 60
+        boundary = 0
+        if now >= timer.expires_at:
+            boundary = int((now - timer.expires_at) // ACCRUAL_SECONDS) + 1
+            # Still announce the boundary just crossed if it is recent
+            if timer.deadline(boundary - 1) > now - settings.DETENTION_TIMER_CATCHUP_SECONDS:
+                boundary -= 1
+        timer.boundary = boundary
+        self._timers[event_id] = timer
+        return (timer.deadline(boundary), event_id, boundary)
+
+    def _push(self, entry):
+        heapq.heappush(self._heap, entry)
+        if self._heap[0] is entry and self._wake is not None:
+            self._wake.set()
+
+    def _add(self, row):
+        entry = self._schedule(row, time.time())
+        if entry is not None:
+            self._push(entry)
+
+    def load(self, rows, now: float):
+        """Track every row not yet tracked; O(n) heapify instead of n pushes."""
+        entries = [entry for entry in (self._schedule(row, now) for row in rows) if entry]
+        self._heap.extend(entries)
+        heapq.heapify(self._heap)
+        if self._wake is not None:
+            self._wake.set()
+
+    def _compact(self):
+        # Entries of checked-out events linger until they surface; drop them
+        # once they outnumber the live ones
+        if len(self._heap) > 2 * len(self._timers) + 1024:
+            self._heap = [entry for entry in self._heap
+                          if (timer := self._timers.get(entry[1])) and timer.boundary == entry[2]]
+            heapq.heapify(self._heap)
+
+    def pop_due(self, now: float) -> list:
+        """Remove and return (event_id, boundary) for every live entry due by now."""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, event_id, boundary = heapq.heappop(self._heap)
+            timer = self._timers.get(event_id)
+            if timer is not None and timer.boundary == boundary:
+                due.append((event_id, boundary))
+        return due
+
+    def advance(self, event_id: int, boundary: int):
+        """Schedule the boundary after one that has just fired."""
+        timer = self._timers.get(event_id)
+        if timer is None or timer.boundary != boundary:
+            return
+        timer.boundary = boundary + 1
+        heapq.heappush(self._heap, (timer.deadline(timer.boundary), event_id, timer.boundary))
+
+    async def _run(self):
+        while True:
+            due = self.pop_due(time.time())
+            if due:
+                try:
+                    active = await run_in_threadpool(_still_active, [event_id for event_id, _ in due])
+                except Exception:
+                    logger.exception("Checking due detention timers failed; retrying")
+                    for event_id, boundary in due:
+                        timer = self._timers.get(event_id)
+                        if timer is not None and timer.boundary == boundary:
+                            heapq.heappush(self._heap, (time.time() + 5, event_id, boundary))
+                    continue
+                for event_id, boundary in due:
+                    if event_id not in active:
+                        self._timers.pop(event_id, None)
+                    elif event_id in self._timers:
+                        self._notify(event_id, boundary)
+                        self.advance(event_id, boundary)
+                self._compact()
+                continue
+            self._wake.clear()
+            timeout = self._heap[0][0] - time.time() if self._heap else None
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _notify(self, event_id: int, boundary: int):
+        timer = self._timers[event_id]
+        at = datetime.fromtimestamp(timer.deadline(boundary), timezone.utc)
+        payload = {"id": event_id, "load_id": timer.load_id, "driver_id": timer.driver_id}
+        if boundary == 0:
+            event_type = "free_time_expired"
+            payload["expired_at"] = at
+        else:
+            # At a boundary the billable time is exactly boundary hours
+            event_type = "detention_accrued"
+            payload.update(billable_hours=boundary, detention_amount=round(boundary * timer.rate, 2),
+                           accrued_at=at)
+        timer_notifications.inc(type=event_type)
+        detention_feed.publish(event_type, payload)
+        webhooks.deliver(event_type, payload, f"{event_id}:{boundary}")
+
+    async def _resync_periodically(self):
+        while True:
+            await asyncio.sleep(settings.DETENTION_TIMER_RESYNC_SECONDS)
+            known = set(self._timers)
+            try:
+                rows = await run_in_threadpool(_active_rows)
+            except Exception:
+                logger.exception("Resyncing detention timers failed")
+                continue
+            # Only forget events tracked before the read; newer check-ins may not be in it
+            for event_id in known.difference(row[0] for row in rows):
+                self._timers.pop(event_id, None)
+            self.load(rows, time.time())
+
+detention_timers = DetentionTimers()
+
+timer_notifications = registry.register(Counter(
+    "detention_timer_notifications_total", "Free-time expiry and accrual notifications fired.",
+    ("type",)))
+registry.register(Collected(
+    "detention_timers_scheduled", "Active detention events tracked by the expiry scheduler.",
+    lambda: len(detention_timers)))
@@ -0,0 +1,150 @@
+"""
+Per-driver earnings ledger.
+
+driver_earnings keeps one row per driver and month of check-in with the
+totals a driver's history screen needs, so a balance costs a read of at most
+one row per month instead of the driver's whole event history.
+
+Every handler that changes an event's status, amount or payment status
+takes earnings_contribution(event) before the change and calls
+record_earnings() after it, in the same transaction; the ledger is moved by
+the difference. check_earnings() recomputes the ledger from the raw events,
+archive included, and reports any drift.
+"""
+from datetime import datetime, timezone
+from sqlalchemy import case, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from backend.app import models
+from backend.app.services.detention_archive import all_events
+from backend.app.services.detention_recalc import as_utc
+
+FIELDS = ("events", "detention_minutes", "amount_owed", "amount_requested", "amount_paid")
+AMOUNT_TOLERANCE = 0.005
+
+_INSERT = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+def earnings_period(checkin_time: datetime) -> str:
+    return as_utc(checkin_time).astimezone(timezone.utc).strftime("%Y-%m")
+
+def earnings_contribution(event) -> dict:
+    """What event adds to its driver's ledger row; nothing until it is completed."""
+    if event is None or event.status != "completed":
+        return dict.fromkeys(FIELDS, 0)
+    amount = event.detention_amount or 0.0
+    return {
+        "events": 1,
+        "detention_minutes": event.detention_minutes or 0,
+        "amount_owed": amount,
+        "amount_requested": amount if event.payment_status == "requested" else 0.0,
+        "amount_paid": amount if event.payment_status == "paid" else 0.0,
+    }
+
+def earnings_upsert(dialect: str, driver_id: int, period: str, delta: dict):
+    """INSERT ... ON CONFLICT statement adding delta to one ledger row."""
+    table = models.DriverEarnings.__table__
+    stmt = _INSERT[dialect](table).values(
+        driver_id=driver_id, period=period, **{**dict.fromkeys(FIELDS, 0), **delta})
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.driver_id, table.c.period],
+        set_={name: table.c[name] + stmt.excluded[name] for name in delta},
+    )
+
+def earnings_update(dialect: str, event, before: dict):
+    """Statement moving the ledger by event's change since before, or None."""
+    after = earnings_contribution(event)
+    delta = {name: after[name] - before[name] for name in FIELDS if after[name] != before[name]}
+    if not delta or event.driver_id is None:
+        return None
+    return earnings_upsert(dialect, event.driver_id, earnings_period(event.checkin_time), delta)
+
+def record_earnings(db: Session, event, before: dict):
+    stmt = earnings_update(db.get_bind().dialect.name, event, before)
+    if stmt is not None:
+        db.execute(stmt)
+
+async def record_earnings_async(db, event, before: dict):
+    stmt = earnings_update(db.bind.dialect.name, event, before)
+    if stmt is not None:
+        await db.execute(stmt)
+
+def _round(row: dict) -> dict:
+    row["amount_outstanding"] = row["amount_owed"] - row["amount_paid"]
+    for name in ("amount_owed", "amount_requested", "amount_paid", "amount_outstanding"):
+        row[name] = round(row[name], 2)
+    return row
+
+def earnings_summary(db: Session, driver_id: int) -> dict:
+    rows = db.execute(
+        select(models.DriverEarnings)
+        .where(models.DriverEarnings.driver_id == driver_id)
+        .order_by(models.DriverEarnings.period)
+    ).scalars().all()
+    totals = dict.fromkeys(FIELDS, 0)
+    periods = []
+    for row in rows:
+        values = {name: getattr(row, name) for name in FIELDS}
+        for name in FIELDS:
+            totals[name] += values[name]
+        periods.append(_round({"period": row.period, **values}))
+    return {"driver_id": driver_id, "totals": _round(totals), "periods": periods}
+
+def _period_expression(dialect: str, column):
+    if dialect == "postgresql":
+        return func.to_char(column, "YYYY-MM")
+    return func.strftime("%Y-%m", column)
+
+def expected_earnings(connection) -> dict:
+    """The ledger recomputed from detention events, keyed by (driver_id, period)."""
+    Event = all_events()
+    period = _period_expression(connection.dialect.name, Event.checkin_time)
+    rows = connection.execute(
+        select(
+            Event.driver_id, period,
+            func.count(),
+            func.coalesce(func.sum(Event.detention_minutes), 0),
+            func.coalesce(func.sum(Event.detention_amount), 0.0),
+            func.coalesce(func.sum(case((Event.payment_status == "requested", Event.detention_amount), else_=0.0)), 0.0),
+            func.coalesce(func.sum(case((Event.payment_status == "paid", Event.detention_amount), else_=0.0)), 0.0),
+        )
+        .where(Event.status == "completed", Event.driver_id.is_not(None))
+        .group_by(Event.driver_id, period)
+    )
+    return {(row[0], row[1]): dict(zip(FIELDS, row[2:])) for row in rows}
+
+def _differs(a: dict, b: dict) -> bool:
+    return (a["events"] != b["events"] or a["detention_minutes"] != b["detention_minutes"]
+            or any(abs(a[name] - b[name]) > AMOUNT_TOLERANCE
+                   for name in ("amount_owed", "amount_requested", "amount_paid")))
+
+def check_earnings(engine, repair: bool = False) -> list:
+    """
+    Compare the ledger with the raw events; returns one entry per drifted row.
+
+    With repair, drifted rows are overwritten with the recomputed values.
+    Writes that land while it runs can show up as transient drift, so
+    re-check before repairing a busy database.
+    """
+    table = models.DriverEarnings.__table__
+    with engine.begin() as connection:
+        expected = expected_earnings(connection)
+        stored = {
+            (row.driver_id, row.period): {name: row._mapping[name] for name in FIELDS}
+            for row in connection.execute(select(table))
+        }
+        empty = dict.fromkeys(FIELDS, 0)
+        mismatches = []
+        for key in sorted(expected.keys() | stored.keys()):
+            want, have = expected.get(key, empty), stored.get(key, empty)
+            if _differs(want, have):
+                mismatches.append({"driver_id": key[0], "period": key[1],
+                                   "expected": want, "ledger": have})
+        if repair:
+            for mismatch in mismatches:
+                connection.execute(table.delete().where(
+                    table.c.driver_id == mismatch["driver_id"], table.c.period == mismatch["period"]))
+                if (mismatch["driver_id"], mismatch["period"]) in expected:
+                    connection.execute(table.insert().values(
+                        driver_id=mismatch["driver_id"], period=mismatch["period"],
+                        **mismatch["expected"]))
+    return mismatches
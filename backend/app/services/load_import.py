@@ -0,0 +1,123 @@
+import csv
+import io
+import json
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from backend.app import models, schemas
+
+DEFAULT_BATCH_SIZE = 5000
+MAX_REPORTED_ERRORS = 1000
+
+def detect_format(filename: str = None, content_type: str = None) -> str:
+    name = (filename or "").lower()
+    if name.endswith((".ndjson", ".jsonl")) or "ndjson" in (content_type or ""):
+        return "ndjson"
+    return "csv"
+
+def parse_rows(text_stream, fmt: str):
+    """Yield (row_number, raw_row) pairs without reading the whole input."""
+    if fmt == "ndjson":
+        for number, line in enumerate(text_stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield number, json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield number, exc
+    else:
+        # Row numbers count the header as row 1, as spreadsheets do
+        for number, row in enumerate(csv.DictReader(text_stream), start=2):
+            yield number, {key: value for key, value in row.items() if value not in ("", None)}
+
+class ImportReport:
+    def __init__(self):
+        self.rows = 0
+        self.inserted = 0
+        self.error_count = 0
+        self.errors = []
+
+    def fail(self, row: int, error: str, load_number: str = None):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "load_number": load_number, "error": error})
+
+    def as_dict(self) -> dict:
+        return {
+            "rows": self.rows,
+            "inserted": self.inserted,
+            "failed": self.error_count,
+            "errors": self.errors,
+            "errors_truncated": self.error_count > len(self.errors),
+        }
+
+def _validate(number: int, raw, report: ImportReport):
+    if isinstance(raw, Exception):
+        report.fail(number, f"Invalid JSON: {raw}")
+        return None
+    try:
+        return schemas.LoadCreate.model_validate(raw).model_dump()
+    except ValidationError as exc:
+        problems = "; ".join(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in exc.errors())
+        report.fail(number, problems, raw.get("load_number") if isinstance(raw, dict) else None)
+        return None
+
+def _insert_batch(connection, batch: list, report: ImportReport):
+    numbers = [load["load_number"] for _, load in batch]
+    existing = set(connection.execute(
+        select(models.Load.load_number).where(models.Load.load_number.in_(numbers))).scalars())
+    fresh = []
+    for number, load in batch:
+        if load["load_number"] in existing:
+            report.fail(number, "Duplicate load_number", load["load_number"])
+        else:
+            existing.add(load["load_number"])
+            fresh.append((number, load))
+    if not fresh:
+        return
+    try:
+        with connection.begin_nested():
+            connection.execute(insert(models.Load), [load for _, load in fresh])
+        report.inserted += len(fresh)
+    except IntegrityError:
+        # Lost a race with a concurrent writer: fall back to row-by-row so
+        # only the offending rows are rejected
+        for number, load in fresh:
+            try:
+                with connection.begin_nested():
+                    connection.execute(insert(models.Load), [load])
+                report.inserted += 1
+            except IntegrityError as exc:
+                report.fail(number, f"Rejected by database: {exc.orig}", load["load_number"])
+
+def import_loads(engine, rows, batch_size: int = DEFAULT_BATCH_SIZE) -> dict:
+    """
+    Validate rows with schemas.LoadCreate and insert them in batches.
+
+    Each batch costs one SELECT to find existing load numbers and one
+    executemany INSERT. Bad or duplicate rows are reported individually and
+    never abort the rest of the import; every batch commits on its own.
+    """
+    report = ImportReport()
+    batch = []
+    with engine.connect() as connection:
+        for number, raw in rows:
+            report.rows += 1
+            load = _validate(number, raw, report)
+            if load is not None:
+                batch.append((number, load))
+            if len(batch) >= batch_size:
+                with connection.begin():
+                    _insert_batch(connection, batch, report)
+                batch = []
+        if batch:
+            with connection.begin():
+                _insert_batch(connection, batch, report)
+    return report.as_dict()
+
+def import_file(engine, binary_stream, fmt: str, batch_size: int = DEFAULT_BATCH_SIZE) -> dict:
+    text_stream = io.TextIOWrapper(binary_stream, encoding="utf-8-sig", newline="")
+    try:
+        return import_loads(engine, parse_rows(text_stream, fmt), batch_size)
+    finally:
+        text_stream.detach()
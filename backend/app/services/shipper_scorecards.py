@@ -0,0 +1,158 @@
+"""
+Per-shipper dwell-time distributions as mergeable quantile sketches.
+
+Each checkout drops its dwell time (check-in to check-out, in minutes) into a
+DDSketch bucket: bucket i holds values in (gamma^(i-1), gamma^i], so any
+quantile read back from the buckets is within RELATIVE_ACCURACY of the true
+value. Buckets are stored as counter rows keyed by shipper, check-in day and
+bucket index and bumped with INSERT ... ON CONFLICT, which keeps concurrent
+checkouts safe and makes merging sketches a plain SUM ... GROUP BY bucket.
+A scorecard for any shipper and date window therefore reads at most one row
+per occupied bucket per day, never the events.
+
+The bucket layout is part of the stored data: changing RELATIVE_ACCURACY
+requires rebuild_scorecards().
+"""
+import math
+from datetime import date, datetime, timezone
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from backend.app import models
+from backend.app.services.detention_archive import all_events
+from backend.app.services.detention_recalc import as_utc
+
+RELATIVE_ACCURACY = 0.01
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(GAMMA)
+# Dwell under one second is indistinguishable from zero
+MIN_DWELL_MINUTES = 1 / 60
+ZERO_BUCKET = -(2 ** 31)
+DEFAULT_PERCENTILES = (50, 90, 95)
+REBUILD_BATCH_SIZE = 5000
+
+_INSERT = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+def dwell_bucket(minutes: float) -> int:
+    if minutes < MIN_DWELL_MINUTES:
+        return ZERO_BUCKET
+    return math.ceil(math.log(minutes) / _LOG_GAMMA)
+
+def bucket_value(bucket: int) -> float:
+    """Representative value of a bucket, within RELATIVE_ACCURACY of all its members."""
+    if bucket == ZERO_BUCKET:
+        return 0.0
+    return 2 * GAMMA ** bucket / (GAMMA + 1)
+
+def dwell_minutes(checkin_time: datetime, checkout_time: datetime) -> float:
+    return (as_utc(checkout_time) - as_utc(checkin_time)).total_seconds() / 60
+
+def checkin_day(checkin_time: datetime) -> date:
+    return as_utc(checkin_time).astimezone(timezone.utc).date()
+
+def sketch_upsert(dialect: str, shipper_name: str, day: date, bucket: int,
+                  events: int, over_free_time: int):
+    table = models.ShipperDwellSketch.__table__
+    stmt = _INSERT[dialect](table).values(
+        shipper_name=shipper_name, day=day, bucket=bucket,
+        events=events, over_free_time=over_free_time)
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.shipper_name, table.c.day, table.c.bucket],
+        set_={"events": table.c.events + stmt.excluded.events,
+              "over_free_time": table.c.over_free_time + stmt.excluded.over_free_time},
+    )
+
+def dwell_update(dialect: str, event, shipper_name: str):
+    """Statement adding a just-completed event to its shipper's sketch, or None."""
+    if not shipper_name or event.checkout_time is None:
+        return None
+    bucket = dwell_bucket(dwell_minutes(event.checkin_time, event.checkout_time))
+    over_free_time = int((event.detention_minutes or 0) > 0)
+    return sketch_upsert(dialect, shipper_name, checkin_day(event.checkin_time),
+                         bucket, 1, over_free_time)
+
+def record_dwell(db: Session, event):
+    load = db.get(models.Load, event.load_id) if event.load_id else None
+    stmt = dwell_update(db.get_bind().dialect.name, event, load.shipper_name if load else None)
+    if stmt is not None:
+        db.execute(stmt)
+
+async def record_dwell_async(db, event):
+    load = await db.get(models.Load, event.load_id) if event.load_id else None
+    stmt = dwell_update(db.bind.dialect.name, event, load.shipper_name if load else None)
+    if stmt is not None:
+        await db.execute(stmt)
+
+def percentiles(buckets: list, ps) -> dict:
+    """Percentiles of a merged sketch given as (bucket, count) pairs sorted by bucket."""
+    total = sum(count for _, count in buckets)
+    result = {}
+    for p in ps:
+        rank = p / 100 * (total - 1)
+        seen = 0
+        for bucket, count in buckets:
+            seen += count
+            if seen > rank:
+                result[f"p{p:g}"] = round(bucket_value(bucket), 1)
+                break
+    return result
+
+def scorecards(db: Session, shipper_name: str = None, start_date: date = None,
+               end_date: date = None, ps=DEFAULT_PERCENTILES) -> list:
+    """Merge each shipper's daily sketches over the window into a scorecard."""
+    Sketch = models.ShipperDwellSketch
+    stmt = select(
+        Sketch.shipper_name, Sketch.bucket,
+        func.sum(Sketch.events), func.sum(Sketch.over_free_time),
+    )
+    if shipper_name:
+        stmt = stmt.where(Sketch.shipper_name == shipper_name)
+    if start_date:
+        stmt = stmt.where(Sketch.day >= start_date)
+    if end_date:
+        stmt = stmt.where(Sketch.day <= end_date)
+    stmt = stmt.group_by(Sketch.shipper_name, Sketch.bucket).order_by(Sketch.shipper_name, Sketch.bucket)
+
+    merged = {}
+    for shipper, bucket, events, over in db.execute(stmt):
+        sketch = merged.setdefault(shipper, {"buckets": [], "over_free_time": 0})
+        sketch["buckets"].append((bucket, events))
+        sketch["over_free_time"] += over
+    cards = []
+    for shipper, sketch in merged.items():
+        events = sum(count for _, count in sketch["buckets"])
+        cards.append({
+            "shipper_name": shipper,
+            "events": events,
+            "over_free_time": sketch["over_free_time"],
+            "over_free_time_ratio": round(sketch["over_free_time"] / events, 4),
+            "dwell_minutes": percentiles(sketch["buckets"], ps),
+        })
+    return cards
+
+def rebuild_scorecards(connection) -> int:
+    """Recompute every sketch from the completed events, archive included; returns events seen."""
+    Event = all_events()
+    table = models.ShipperDwellSketch.__table__
+    counts = {}
+    rows = connection.execute(
+        select(models.Load.shipper_name, Event.checkin_time, Event.checkout_time, Event.detention_minutes)
+        .join(models.Load, models.Load.id == Event.load_id)
+        .where(Event.status == "completed", Event.checkout_time.is_not(None),
+               models.Load.shipper_name.is_not(None))
+        .execution_options(yield_per=REBUILD_BATCH_SIZE)
+    )
+    seen = 0
+    for shipper, checkin, checkout, detention_minutes in rows:
+        key = (shipper, checkin_day(checkin), dwell_bucket(dwell_minutes(checkin, checkout)))
+        entry = counts.setdefault(key, [0, 0])
+        entry[0] += 1
+        entry[1] += int((detention_minutes or 0) > 0)
+        seen += 1
+    connection.execute(table.delete())
+    values = [{"shipper_name": shipper, "day": day, "bucket": bucket,
+               "events": events, "over_free_time": over}
+              for (shipper, day, bucket), (events, over) in counts.items()]
+    for start in range(0, len(values), REBUILD_BATCH_SIZE):
+        connection.execute(table.insert(), values[start:start + REBUILD_BATCH_SIZE])
+    return seen
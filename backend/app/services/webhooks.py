@@ -0,0 +1,83 @@
+"""
+Outbound webhooks for detention notifications.
+
+deliver() only enqueues. WEBHOOK_WORKERS tasks POST each payload to every URL
+in DETENTION_WEBHOOK_URLS from the threadpool, retrying with exponential
+backoff. When the queue is full the notification is dropped and counted
+rather than buffered without bound. Every payload carries an idempotency key,
+so receivers can discard retries and the copies other workers send.
+"""
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import urllib.request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from backend.app.core.config import settings
+from backend.app.core.metrics import Counter, registry
+
+logger = logging.getLogger(__name__)
+
+webhook_deliveries = registry.register(Counter(
+    "detention_webhook_deliveries_total", "Detention webhook POSTs by outcome.", ("outcome",)))
+
+def _post(url: str, body: bytes, headers: dict):
+    request = urllib.request.Request(url, data=body, headers=headers, method="POST")
+    with urllib.request.urlopen(request, timeout=settings.WEBHOOK_TIMEOUT_SECONDS) as response:
+        response.read()
+
+class WebhookSender:
+    def __init__(self):
+        self._urls = []
+        self._queue = None
+        self._workers = []
+
+    def start(self):
+        self._urls = [url.strip() for url in settings.DETENTION_WEBHOOK_URLS.split(",") if url.strip()]
+        if not self._urls or self._workers:
+            return
+        self._queue = asyncio.Queue(maxsize=settings.WEBHOOK_QUEUE_SIZE)
+        loop = asyncio.get_running_loop()
+        self._workers = [loop.create_task(self._work()) for _ in range(settings.WEBHOOK_WORKERS)]
+
+    def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        self._workers = []
+        self._queue = None
+
+    def deliver(self, event_type: str, payload: dict, key: str):
+        """Queue payload for every configured URL; call from the event loop."""
+        if self._queue is None:
+            return
+        body = json.dumps({"type": event_type, "idempotency_key": key,
+                           "data": jsonable_encoder(payload)}, separators=(",", ":")).encode()
+        headers = {"Content-Type": "application/json", "Idempotency-Key": key}
+        if settings.DETENTION_WEBHOOK_SECRET:
+            headers["X-Signature-SHA256"] = hmac.new(
+                settings.DETENTION_WEBHOOK_SECRET.encode(), body, hashlib.sha256).hexdigest()
+        for url in self._urls:
+            try:
+                self._queue.put_nowait((url, body, headers))
+            except asyncio.QueueFull:
+                webhook_deliveries.inc(outcome="dropped")
+
+    async def _work(self):
+        while True:
+            url, body, headers = await self._queue.get()
+            for attempt in range(1, settings.WEBHOOK_MAX_ATTEMPTS + 1):
+                try:
+                    await run_in_threadpool(_post, url, body, headers)
+                except (OSError, ValueError) as exc:
+                    if attempt == settings.WEBHOOK_MAX_ATTEMPTS:
+                        logger.warning("Webhook to %s failed after %d attempts: %s", url, attempt, exc)
+                        webhook_deliveries.inc(outcome="failed")
+                    else:
+                        await asyncio.sleep(2 ** attempt)
+                else:
+                    webhook_deliveries.inc(outcome="delivered")
+                    break
+
+webhooks = WebhookSender()
@@ -0,0 +1,62 @@
+"""
+One-off startup costs, paid before the worker accepts traffic.
+
+Without this the first login forks the password-hash pool, the first PDF
+imports ReportLab and loads its fonts, and the first few requests each open
+a database connection. create_app() runs warm_up() on startup when
+WARMUP_ON_STARTUP is set.
+"""
+import time
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+from backend.app import models
+from backend.app.core.config import settings
+from backend.app.core.security import hash_password_async
+from backend.app.database import async_engine, engine
+from backend.app.services.detention_report import render_report, report_context
+
+@contextmanager
+def _step(timings: dict, name: str):
+    started = time.perf_counter()
+    yield
+    timings[name] = round(time.perf_counter() - started, 3)
+
+def _sample_context() -> dict:
+    now = datetime.utcnow()
+    event = models.DetentionEvent(
+        id=0, checkin_time=now, checkout_time=now, free_time_minutes=120, detention_rate=50.0,
+        detention_minutes=0, detention_amount=0.0, status="completed", notes="warm-up")
+    return report_context(event, None, None)
+
+def _open_connections(count: int):
+    # Hold them all at once so the pool ends up with count idle connections
+    with ExitStack() as stack:
+        for _ in range(count):
+            stack.enter_context(engine.connect()).execute(text("SELECT 1"))
+
+async def _open_async_connections(count: int):
+    connections = [await async_engine.connect() for _ in range(count)]
+    for connection in connections:
+        await connection.execute(text("SELECT 1"))
+        await connection.close()
+
+async def warm_up() -> dict:
+    """Run every warm-up step; returns seconds per step."""
+    timings = {}
+    # Fork the hash workers before any connection exists for them to inherit
+    with _step(timings, "password_hash_pool"):
+        await hash_password_async("warm-up")
+    try:
+        with _step(timings, "reportlab"):
+            await run_in_threadpool(render_report, _sample_context())
+    except ImportError:
+        # ReportLab is optional; report endpoints fail on their own without it
+        timings["reportlab"] = None
+    connections = min(settings.WARMUP_DB_CONNECTIONS, settings.DB_POOL_SIZE)
+    with _step(timings, "db_pool"):
+        await run_in_threadpool(_open_connections, connections)
+        if async_engine is not None:
+            await _open_async_connections(connections)
+    return timings
@@ -0,0 +1,117 @@
+"""
+Compare throughput of the sync and AsyncSession request paths.
+
+Boots the API under uvicorn twice against the same seeded SQLite database:
+once with the default sync handlers and once with ASYNC_DATABASE_URL pointing
+at aiosqlite. Each run drives --clients concurrent clients against GET /loads/
+and GET /detention/active for --seconds and reports requests/sec and p50/p99.
+Requires httpx and aiosqlite (asyncpg for PostgreSQL).
+
+    python -m backend.benchmarks.bench_async_db --clients 500 --seconds 15
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+PORT = 8798
+BASE_URL = f"http://127.0.0.1:{PORT}"
+ENDPOINTS = ["/loads/?limit=50", "/detention/active"]
+
+
+def start_server(env: dict) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.app.main:app", "--port", str(PORT),
+         "--log-level", "warning", "--limit-concurrency", "10000"],
+        env=dict(os.environ, **env),
+    )
+    for _ in range(100):
+        try:
+            httpx.get(BASE_URL + "/")
+            return server
+        except httpx.TransportError:
+            time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError("API did not start")
+
+
+async def seed(loads: int) -> str:
+    async with httpx.AsyncClient(base_url=BASE_URL, timeout=60) as client:
+        await client.post("/auth/register", json={
+            "email": "bench@example.com", "username": "bench", "password": "bench"})
+        token = (await client.post("/auth/login", data={
+            "username": "bench@example.com", "password": "bench"})).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        existing = len((await client.get("/loads/?limit=1", headers=headers)).json())
+        if not existing:
+            for i in range(loads):
+                await client.post("/loads/", headers=headers, json={
+                    "load_number": f"BENCH-{i}", "shipper_name": f"Shipper {i % 20}",
+                    "shipper_address": "1 Dock Rd"})
+        return token
+
+
+async def drive(token: str, clients: int, seconds: float) -> dict:
+    headers = {"Authorization": f"Bearer {token}"}
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    latencies = []
+    errors = []
+    async with httpx.AsyncClient(base_url=BASE_URL, headers=headers, limits=limits,
+                                 timeout=120) as client:
+        deadline = time.perf_counter() + seconds
+
+        async def worker(n: int):
+            path = ENDPOINTS[n % len(ENDPOINTS)]
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    response.raise_for_status()
+                    latencies.append((time.perf_counter() - started) * 1000)
+                except httpx.HTTPError:
+                    errors.append(1)
+
+        await asyncio.gather(*(worker(n) for n in range(clients)))
+
+    latencies.sort()
+    return {
+        "requests_per_sec": round(len(latencies) / seconds, 1),
+        "p50_ms": round(statistics.median(latencies), 1) if latencies else None,
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1], 1) if latencies else None,
+        "errors": len(errors),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--seconds", type=float, default=15)
+    parser.add_argument("--loads", type=int, default=200)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(prefix="bench-async-"), "bench.db")
+    base_env = {"DATABASE_URL": f"sqlite:///{db_path}", "SECRET_KEY": "benchmark",
+                "MIGRATE_ON_STARTUP": "true"}
+    modes = {
+        "sync": base_env,
+        "async": dict(base_env, ASYNC_DATABASE_URL=f"sqlite+aiosqlite:///{db_path}"),
+    }
+    for mode, env in modes.items():
+        server = start_server(env)
+        try:
+            token = asyncio.run(seed(args.loads))
+            result = asyncio.run(drive(token, args.clients, args.seconds))
+        finally:
+            server.terminate()
+            server.wait()
+        print(f"{mode:>6}: " + ", ".join(f"{k}={v}" for k, v in result.items()))
+
+
+if __name__ == "__main__":
+    main()
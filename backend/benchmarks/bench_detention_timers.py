@@ -0,0 +1,85 @@
+"""
+Cost of the free-time expiry scheduler at N concurrent active detentions.
+
+Builds the heap from N synthetic active rows, as on startup, then times
+check-in/check-out churn against the full heap and the firing of every
+event's expiry and first two accrual boundaries (pop_due plus advance, the
+scheduler's own work; the database check and fan-out are not included).
+Reports per-operation cost so the O(log n) growth can be compared across
+--active sizes.
+
+    python -m backend.benchmarks.bench_detention_timers --active 10000 100000
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+_db_dir = tempfile.mkdtemp(prefix="bench-timers-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/bench.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from backend.app.services.detention_timers import ACCRUAL_SECONDS, DetentionTimers  # noqa: E402
+
+CHURN = 20_000
+
+
+def rows(count: int, start_id: int, now: datetime) -> list:
+    # Check-ins spread over the last two hours, so expiries land across the next two
+    return [(start_id + i, i, i % 500, now - timedelta(seconds=i * 7200 / count), 120, 50.0)
+            for i in range(count)]
+
+
+def run(active: int) -> dict:
+    now = datetime.now(timezone.utc)
+    timers = DetentionTimers()
+    batch = rows(active, 1, now)
+
+    started = time.perf_counter()
+    timers.load(batch, now.timestamp())
+    load_s = time.perf_counter() - started
+
+    # Separate pass: tracing allocations slows the build several times over
+    tracemalloc.start()
+    traced = DetentionTimers()
+    traced.load(batch, now.timestamp())
+    memory_mb = tracemalloc.get_traced_memory()[0] / 1e6
+    tracemalloc.stop()
+    del traced
+
+    churn = rows(CHURN, active + 1, now)
+    started = time.perf_counter()
+    for row in churn:
+        timers._add(row)
+    for row in churn:
+        timers._timers.pop(row[0], None)
+    churn_us = (time.perf_counter() - started) / (2 * CHURN) * 1e6
+
+    fired = 0
+    horizon = now.timestamp() + 2 * 3600 + 2 * ACCRUAL_SECONDS
+    started = time.perf_counter()
+    for step in range(0, int(horizon - now.timestamp()) + 60, 60):
+        for event_id, boundary in timers.pop_due(now.timestamp() + step):
+            timers.advance(event_id, boundary)
+            fired += 1
+    fire_us = (time.perf_counter() - started) / max(fired, 1) * 1e6
+    return {"load_ms": load_s * 1000, "heap_mb": memory_mb, "churn_us": churn_us,
+            "fired": fired, "fire_us": fire_us}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--active", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'active':>9} {'load ms':>9} {'heap MB':>8} {'add/remove us':>14} {'fired':>8} {'per fire us':>12}")
+    for active in args.active:
+        result = run(active)
+        print(f"{active:>9} {result['load_ms']:>9.1f} {result['heap_mb']:>8.1f} "
+              f"{result['churn_us']:>14.2f} {result['fired']:>8} {result['fire_us']:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+Endpoint benchmark suite: latency, throughput and SQL per request for every router.
+
+Boots backend.app.main:app in-process against a seeded database and replays a
+fixed set of requests covering each router at every --sizes step (number of
+loads, one detention event per load; smaller tables scale with it). For each
+endpoint it reports p50/p95/p99 latency, requests/sec for a single client and
+the number of SQL statements per request, and writes everything to --output
+as JSON so runs from two commits can be diffed.
+
+Uses a throwaway SQLite database unless --database-url (or BENCH_DATABASE_URL)
+points at a reachable PostgreSQL; seeded rows are added to that database, so
+give it an empty one. Requires httpx.
+
+    python -m backend.benchmarks.bench_endpoints --sizes 1000 10000 100000 --output bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+SHIPPERS = 200
+BATCH = 50_000
+
+# (name, method, path template, request kwargs); templates are filled from
+# the ids picked after seeding
+ENDPOINTS = [
+    ("root", "GET", "/", {}),
+    ("auth.login", "POST", "/auth/login",
+     {"data": {"username": "bench@example.com", "password": "bench"}}),
+    ("auth.principal_cache", "GET", "/auth/principal-cache", {}),
+    ("drivers.list", "GET", "/drivers/?limit=100", {}),
+    ("drivers.get", "GET", "/drivers/{driver_id}", {}),
+    ("warehouses.list", "GET", "/warehouses/?limit=100", {}),
+    ("customers.list", "GET", "/customers/?limit=100", {}),
+    ("shipments.list", "GET", "/shipments/?limit=100&status=pending", {}),
+    ("loads.list", "GET", "/loads/?limit=100", {}),
+    ("loads.list_by_shipper", "GET", "/loads/?limit=100&shipper_name={shipper}", {}),
+    ("loads.get", "GET", "/loads/{load_id}", {}),
+    ("detention.active", "GET", "/detention/active", {}),
+    ("detention.payment_requests", "GET", "/detention/payment-requests?shipper_name={shipper}", {}),
+    ("detention.by_load", "GET", "/detention/load/{load_id}", {}),
+    ("detention.by_driver", "GET", "/detention/driver/{driver_id}?limit=100", {}),
+    ("detention.stats_summary", "GET", "/detention/stats/summary", {}),
+    ("detention.export", "GET", "/detention/export?shipper_name={shipper}", {}),
+    ("debug.db_pool", "GET", "/debug/db-pool", {}),
+]
+
+
+def pick_database(url: str) -> str:
+    """Return url if it can be reached, otherwise a throwaway SQLite file."""
+    if url:
+        from sqlalchemy import create_engine, text
+        probe = create_engine(url)
+        try:
+            with probe.connect() as connection:
+                connection.execute(text("SELECT 1"))
+            return url
+        except Exception as exc:
+            print(f"{url.split('@')[-1]} unavailable ({type(exc).__name__}), using SQLite",
+                  file=sys.stderr)
+        finally:
+            probe.dispose()
+    db_dir = tempfile.mkdtemp(prefix="bench-endpoints-")
+    return f"sqlite:///{db_dir}/bench.db"
+
+
+def seed(engine, models, total_loads: int):
+    """Top the tables up to total_loads loads, each with one detention event."""
+    from sqlalchemy import case, func, insert, literal, select
+
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        def top_up(model, target: int, row):
+            existing = conn.execute(select(func.count()).select_from(model)).scalar()
+            for start in range(existing, target, BATCH):
+                conn.execute(insert(model), [row(i) for i in range(start, min(start + BATCH, target))])
+
+        top_up(models.Driver, max(10, total_loads // 100), lambda i: {
+            "name": f"Bench Driver {i}", "phone": "0", "license_number": f"BENCH-{i}"})
+        top_up(models.Warehouse, 50, lambda i: {
+            "name": f"Warehouse {i}", "location": "Dock", "capacity": 100})
+        top_up(models.Customer, 50, lambda i: {
+            "name": f"Customer {i}", "email": f"customer{i}@example.com", "phone": "0"})
+        driver_ids = conn.execute(select(models.Driver.id).order_by(models.Driver.id)).scalars().all()
+        top_up(models.Shipment, total_loads // 10, lambda i: {
+            "origin": "A", "destination": "B", "status": "pending" if i % 2 else "delivered",
+            "driver_id": driver_ids[i % len(driver_ids)]})
+
+        last_load = conn.execute(select(func.coalesce(func.max(models.Load.id), 0))).scalar()
+        top_up(models.Load, total_loads, lambda i: {
+            "load_number": f"BENCH-{i}", "shipper_name": f"Shipper {i % SHIPPERS}",
+            "shipper_address": "1 Dock Rd", "driver_id": driver_ids[i % len(driver_ids)],
+            "status": "completed" if i % 3 else "pending"})
+
+        # One event per new load, built inside the database
+        load = models.Load
+        conn.execute(insert(models.DetentionEvent).from_select(
+            ["load_id", "driver_id", "checkin_time", "checkout_time", "free_time_minutes",
+             "detention_rate", "detention_minutes", "detention_amount", "status", "payment_status"],
+            select(
+                load.id, load.driver_id, literal(now - timedelta(minutes=300)),
+                case((load.id % 10 == 0, None), else_=literal(now)),
+                literal(120), literal(50.0),
+                case((load.id % 10 == 0, 0), else_=180),
+                case((load.id % 10 == 0, 0.0), else_=150.0),
+                case((load.id % 10 == 0, "active"), else_="completed"),
+                case((load.id % 7 == 1, "requested"), (load.id % 7 == 2, "paid"), else_="none"),
+            ).where(load.id > last_load)
+        ))
+
+
+def percentile(quantiles: list, p: int) -> float:
+    return round(quantiles[p - 1], 2)
+
+
+def measure(client, engine, method: str, path: str, kwargs: dict, requests: int, warmup: int) -> dict:
+    from sqlalchemy import event
+
+    for _ in range(warmup):
+        client.request(method, path, **kwargs)
+
+    statements = []
+
+    def count(*_):
+        statements.append(1)
+
+    timings = []
+    queries = []
+    errors = 0
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        for _ in range(requests):
+            statements.clear()
+            started = time.perf_counter()
+            response = client.request(method, path, **kwargs)
+            response.read()
+            timings.append((time.perf_counter() - started) * 1000)
+            queries.append(len(statements))
+            if response.status_code >= 400:
+                errors += 1
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    quantiles = statistics.quantiles(timings, n=100, method="inclusive")
+    return {
+        "requests": requests,
+        "errors": errors,
+        "p50_ms": percentile(quantiles, 50),
+        "p95_ms": percentile(quantiles, 95),
+        "p99_ms": percentile(quantiles, 99),
+        "mean_ms": round(statistics.fmean(timings), 2),
+        "requests_per_sec": round(requests / (sum(timings) / 1000), 1),
+        "queries_per_request": round(statistics.fmean(queries), 2),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--requests", type=int, default=50, help="measured requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--only", nargs="+", metavar="NAME",
+                        help="endpoint names or prefixes to run, e.g. detention loads.list")
+    parser.add_argument("--database-url", default=os.environ.get("BENCH_DATABASE_URL"))
+    parser.add_argument("--output", default="bench-endpoints.json")
+    args = parser.parse_args()
+    if args.requests < 2:
+        parser.error("--requests must be at least 2")
+
+    # Settings are read at import time, so the database is chosen first
+    database_url = pick_database(args.database_url)
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+
+    from fastapi.testclient import TestClient
+    from backend.app import migrations, models
+    from backend.app.database import engine
+    from backend.app.main import app
+
+    migrations.upgrade(engine)
+
+    endpoints = [e for e in ENDPOINTS
+                 if not args.only or any(e[0] == n or e[0].startswith(n + ".") for n in args.only)]
+    results = []
+    with TestClient(app) as client:
+        client.post("/auth/register", json={
+            "email": "bench@example.com", "username": "bench", "password": "bench"})
+        token = client.post("/auth/login", data={
+            "username": "bench@example.com", "password": "bench"}).json()["access_token"]
+        client.headers["Authorization"] = f"Bearer {token}"
+
+        print(f"{'loads':>9} {'endpoint':<28} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+              f"{'req/s':>8} {'queries':>7}")
+        for size in sorted(args.sizes):
+            seed(engine, models, size)
+            ids = {"load_id": size // 2 or 1, "driver_id": 1, "shipper": "Shipper 7"}
+            for name, method, template, kwargs in endpoints:
+                result = measure(client, engine, method, template.format(**ids), kwargs,
+                                 args.requests, args.warmup)
+                results.append({"loads": size, "endpoint": name, "method": method,
+                                "path": template, **result})
+                print(f"{size:>9} {name:<28} {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} "
+                      f"{result['p99_ms']:>8.1f} {result['requests_per_sec']:>8.1f} "
+                      f"{result['queries_per_request']:>7.1f}"
+                      + (f"  ({result['errors']} errors)" if result["errors"] else ""))
+
+    report = {
+        "revision": git_revision(),
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+        "database": engine.dialect.name,
+        "python": platform.python_version(),
+        "requests_per_endpoint": args.requests,
+        "results": results,
+    }
+    with open(args.output, "w") as output:
+        json.dump(report, output, indent=2)
+    print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
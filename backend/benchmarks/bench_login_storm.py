@@ -0,0 +1,102 @@
+"""
+Login storm benchmark: login throughput vs. latency of unrelated endpoints.
+
+Starts the API under uvicorn against a throwaway SQLite database, then runs
+--logins concurrent clients hammering POST /auth/login while a probe client
+repeatedly calls an unrelated sync endpoint (GET /drivers/ by default). Reports logins/sec and the
+probe's p50/p99 latency; with hashing on its own pool the probe should stay
+flat no matter how hard logins are pushed. Requires httpx.
+
+    python -m backend.benchmarks.bench_login_storm --logins 50 --seconds 10
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+PORT = 8799
+BASE_URL = f"http://127.0.0.1:{PORT}"
+
+
+def start_server(extra_env: dict) -> subprocess.Popen:
+    db_dir = tempfile.mkdtemp(prefix="bench-login-")
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{db_dir}/bench.db",
+               SECRET_KEY="benchmark", MIGRATE_ON_STARTUP="true", **extra_env)
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.app.main:app", "--port", str(PORT),
+         "--log-level", "warning"],
+        env=env,
+    )
+    for _ in range(100):
+        try:
+            httpx.get(BASE_URL + "/")
+            return server
+        except httpx.TransportError:
+            time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError("API did not start")
+
+
+async def storm(logins: int, seconds: float, probe_path: str):
+    async with httpx.AsyncClient(base_url=BASE_URL, timeout=60) as client:
+        await client.post("/auth/register", json={
+            "email": "storm@example.com", "username": "storm", "password": "hunter2"})
+        credentials = {"username": "storm@example.com", "password": "hunter2"}
+        deadline = time.perf_counter() + seconds
+        completed = []
+        rejected = []
+        probe = []
+
+        async def login_loop():
+            while time.perf_counter() < deadline:
+                response = await client.post("/auth/login", data=credentials)
+                (completed if response.status_code == 200 else rejected).append(1)
+
+        async def probe_loop():
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                await client.get(probe_path)
+                probe.append((time.perf_counter() - started) * 1000)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(probe_loop(), *(login_loop() for _ in range(logins)))
+
+    probe.sort()
+    return {
+        "logins_per_sec": round(len(completed) / seconds, 1),
+        "logins_rejected": len(rejected),
+        "probe_p50_ms": round(statistics.median(probe), 2),
+        "probe_p99_ms": round(probe[int(len(probe) * 0.99) - 1], 2),
+        "probe_requests": len(probe),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=50, help="concurrent login clients")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--probe", default="/drivers/", help="unrelated endpoint to time")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="override PASSWORD_HASH_CONCURRENCY")
+    args = parser.parse_args()
+
+    extra_env = {}
+    if args.concurrency is not None:
+        extra_env["PASSWORD_HASH_CONCURRENCY"] = str(args.concurrency)
+    server = start_server(extra_env)
+    try:
+        for key, value in asyncio.run(storm(args.logins, args.seconds, args.probe)).items():
+            print(f"{key:>18}: {value}")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
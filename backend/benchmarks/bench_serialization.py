@@ -0,0 +1,93 @@
+"""
+Serialization cost of a large list response, before and after response models.
+
+Builds N ORM rows (Load and DetentionEvent by default) and times the exact
+steps FastAPI runs after a handler returns them:
+
+* before: no response_model, so jsonable_encoder walks each object
+  reflectively and JSONResponse encodes with json.dumps
+* after: the route's precompiled response_model TypeAdapter validates from
+  attributes and dumps to JSON-ready data, then ORJSONResponse encodes it
+
+Both paths use the real route definitions from backend.app.main, so the
+numbers follow any change to the schemas.
+
+    python -m backend.benchmarks.bench_serialization --rows 10000
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+_db_dir = tempfile.mkdtemp(prefix="bench-serialization-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/bench.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+from fastapi.routing import APIRoute, serialize_response  # noqa: E402
+from backend.app import models  # noqa: E402
+from backend.app.main import app  # noqa: E402
+
+
+def build_rows(kind: str, count: int) -> list:
+    now = datetime.utcnow()
+    if kind == "loads":
+        return [models.Load(
+            id=i, load_number=f"BENCH-{i}", shipper_name=f"Shipper {i % 200}",
+            shipper_address="1 Dock Rd", driver_id=i % 50, shipment_id=None,
+            status="completed", created_at=now) for i in range(count)]
+    return [models.DetentionEvent(
+        id=i, load_id=i, driver_id=i % 50, checkin_time=now, checkout_time=now,
+        free_time_minutes=120, detention_rate=50.0, detention_minutes=180,
+        detention_amount=150.0, status="completed", payment_status="none",
+        notes=None) for i in range(count)]
+
+
+def route_field(path: str):
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.path == path and "GET" in route.methods:
+            return route.response_field
+    raise LookupError(path)
+
+
+async def before(rows) -> bytes:
+    content = await serialize_response(response_content=rows)
+    return JSONResponse(content).body
+
+
+async def after(rows, field) -> bytes:
+    content = await serialize_response(field=field, response_content=rows)
+    return ORJSONResponse(content).body
+
+
+def measure(fn, repeat: int) -> tuple:
+    body = asyncio.run(fn())
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        asyncio.run(fn())
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    cases = {"loads": "/loads/", "detention_events": "/detention/driver/{driver_id}"}
+    print(f"{'response':<18} {'before ms':>10} {'after ms':>9} {'speed-up':>9} {'bytes':>10}")
+    for kind, path in cases.items():
+        rows = build_rows(kind, args.rows)
+        field = route_field(path)
+        before_ms, _ = measure(lambda: before(rows), args.repeat)
+        after_ms, size = measure(lambda: after(rows, field), args.repeat)
+        print(f"{kind:<18} {before_ms:>10.1f} {after_ms:>9.1f} {before_ms / after_ms:>8.1f}x {size:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Shipper scorecards from merged dwell sketches versus an exact scan of events.
+
+Seeds a throwaway SQLite database with N completed events spread over
+SHIPPERS shippers and DAYS days with log-normal dwell times, builds the
+sketches, then answers the same 30-day, every-shipper percentile query both
+ways: scorecards() over shipper_dwell_sketches, and a scan that reads every
+event's timestamps and sorts them. Reports timings, the sketch row count and
+the worst relative error of the sketch percentiles.
+
+    python -m backend.benchmarks.bench_shipper_scorecards --sizes 10000 100000 1000000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+_db_dir = tempfile.mkdtemp(prefix="bench-scorecards-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/bench.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlalchemy import insert, select  # noqa: E402
+from backend.app.database import Base, SessionLocal, engine  # noqa: E402
+from backend.app import models  # noqa: E402
+from backend.app.services.shipper_scorecards import (  # noqa: E402
+    DEFAULT_PERCENTILES, dwell_minutes, rebuild_scorecards, scorecards
+)
+
+SHIPPERS = 50
+DAYS = 90
+WINDOW_DAYS = 30
+BATCH = 50_000
+START = datetime(2024, 1, 1)
+
+
+def seed(total_events: int):
+    """Top the tables up to total_events completed events."""
+    rng = random.Random(total_events)
+    with SessionLocal() as db:
+        existing = db.query(models.DetentionEvent).count()
+        if not db.query(models.Driver).count():
+            db.add(models.Driver(name="Bench Driver", phone="0", license_number="BENCH"))
+            db.add_all(models.Load(id=i + 1, load_number=f"BENCH-{i}", shipper_name=f"Shipper {i}",
+                                   shipper_address="1 Dock Rd", driver_id=1, status="completed")
+                       for i in range(SHIPPERS))
+            db.commit()
+    with engine.begin() as conn:
+        for start in range(existing, total_events, BATCH):
+            rows = []
+            for i in range(start, min(start + BATCH, total_events)):
+                checkin = START + timedelta(seconds=rng.uniform(0, DAYS * 86400))
+                dwell = rng.lognormvariate(4.8, 0.6)  # median ~2h
+                detention_minutes = max(0, int(dwell) - 120)
+                rows.append({
+                    "load_id": i % SHIPPERS + 1, "driver_id": 1,
+                    "checkin_time": checkin, "checkout_time": checkin + timedelta(minutes=dwell),
+                    "free_time_minutes": 120, "detention_rate": 50.0,
+                    "detention_minutes": detention_minutes,
+                    "detention_amount": round(detention_minutes / 60 * 50.0, 2),
+                    "status": "completed",
+                })
+            conn.execute(insert(models.DetentionEvent), rows)
+        rebuild_scorecards(conn)
+
+
+def exact(db, start_date: date, end_date: date) -> dict:
+    Event = models.DetentionEvent
+    dwell = {}
+    rows = db.execute(
+        select(models.Load.shipper_name, Event.checkin_time, Event.checkout_time)
+        .join(models.Load, models.Load.id == Event.load_id)
+        .where(Event.checkin_time >= start_date, Event.checkin_time < end_date + timedelta(days=1)))
+    for shipper, checkin, checkout in rows:
+        dwell.setdefault(shipper, []).append(dwell_minutes(checkin, checkout))
+    result = {}
+    for shipper, values in dwell.items():
+        values.sort()
+        result[shipper] = {f"p{p:g}": values[int(p / 100 * (len(values) - 1))] for p in DEFAULT_PERCENTILES}
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    start_date = START.date() + timedelta(days=30)
+    end_date = start_date + timedelta(days=WINDOW_DAYS - 1)
+    print(f"{'events':>10} {'sketch rows':>12} {'sketch ms':>10} {'scan ms':>10} {'max rel err':>12}")
+    for size in sorted(args.sizes):
+        seed(size)
+        with SessionLocal() as db:
+            rows = db.query(models.ShipperDwellSketch).count()
+            started = time.perf_counter()
+            cards = scorecards(db, start_date=start_date, end_date=end_date)
+            sketch_ms = (time.perf_counter() - started) * 1000
+            started = time.perf_counter()
+            truth = exact(db, start_date, end_date)
+            scan_ms = (time.perf_counter() - started) * 1000
+        error = max(abs(value - truth[card["shipper_name"]][name]) / truth[card["shipper_name"]][name]
+                    for card in cards for name, value in card["dwell_minutes"].items())
+        print(f"{size:>10} {rows:>12} {sketch_ms:>10.1f} {scan_ms:>10.1f} {error:>12.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Measure cold start: import time, time to first accepted request, first-request latencies.
+
+Prepares a throwaway SQLite database (migrations plus one user, load and two
+finished detention events), then for each mode boots the API under uvicorn and
+reports how long `import backend.app.main` takes in a fresh interpreter, how
+long the server takes to answer GET /, and the latency of the first and second
+login, detention report PDF and /loads/ page. Modes are WARMUP_ON_STARTUP off
+and on, so the cost the warm-up moves out of the request path is visible.
+Requires httpx.
+
+    python -m backend.benchmarks.bench_startup --runs 3
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import httpx
+
+PORT = 8797
+BASE_URL = f"http://127.0.0.1:{PORT}"
+EMAIL = "bench@example.com"
+PASSWORD = "bench"
+
+
+def prepare_database(env: dict):
+    subprocess.run([sys.executable, "-m", "backend.app.migrations", "upgrade"],
+                   env=env, check=True, stdout=subprocess.DEVNULL)
+    seed = f"""
+from datetime import datetime
+from backend.app import models
+from backend.app.core.security import hash_password
+from backend.app.database import SessionLocal
+with SessionLocal() as db:
+    driver = models.Driver(name="Bench Driver", phone="0", license_number="BENCH")
+    db.add(driver)
+    db.flush()
+    db.add(models.User(email="{EMAIL}", username="bench", hashed_password=hash_password("{PASSWORD}")))
+    load = models.Load(load_number="BENCH-1", shipper_name="Shipper", shipper_address="1 Dock Rd",
+                       driver_id=driver.id, status="completed")
+    db.add(load)
+    db.flush()
+    for minutes in (300, 200):
+        db.add(models.DetentionEvent(
+            load_id=load.id, driver_id=driver.id,
+            checkin_time=datetime.fromisoformat("{datetime.utcnow() - timedelta(hours=6):%Y-%m-%dT%H:%M:%S}"),
+            checkout_time=datetime.fromisoformat("{datetime.utcnow():%Y-%m-%dT%H:%M:%S}"),
+            detention_minutes=minutes, detention_amount=minutes * 50 / 60, status="completed"))
+    db.commit()
+"""
+    subprocess.run([sys.executable, "-c", seed], env=env, check=True)
+
+
+def import_seconds(env: dict) -> float:
+    code = "import time; s = time.perf_counter(); import backend.app.main; print(time.perf_counter() - s)"
+    result = subprocess.run([sys.executable, "-c", code], env=env, check=True,
+                            capture_output=True, text=True)
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def timed(client: httpx.Client, method: str, path: str, **kwargs) -> float:
+    started = time.perf_counter()
+    client.request(method, path, **kwargs).raise_for_status()
+    return (time.perf_counter() - started) * 1000
+
+
+def boot(env: dict) -> dict:
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.app.main:app", "--port", str(PORT),
+         "--log-level", "warning"],
+        env=env,
+    )
+    try:
+        while True:
+            try:
+                httpx.get(BASE_URL + "/")
+                break
+            except httpx.TransportError:
+                if server.poll() is not None or time.perf_counter() - started > 60:
+                    raise RuntimeError("API did not start")
+                time.sleep(0.01)
+        result = {"ready_s": time.perf_counter() - started}
+
+        with httpx.Client(base_url=BASE_URL, timeout=60) as client:
+            login = {"data": {"username": EMAIL, "password": PASSWORD}}
+            result["login_first_ms"] = timed(client, "POST", "/auth/login", **login)
+            result["login_second_ms"] = timed(client, "POST", "/auth/login", **login)
+            token = client.post("/auth/login", **login).json()["access_token"]
+            client.headers["Authorization"] = f"Bearer {token}"
+            # Two different events, so the second PDF is rendered, not cached
+            result["report_first_ms"] = timed(client, "GET", "/detention/1/report")
+            result["report_second_ms"] = timed(client, "GET", "/detention/2/report")
+            result["loads_first_ms"] = timed(client, "GET", "/loads/?limit=50")
+            result["loads_second_ms"] = timed(client, "GET", "/loads/?limit=50")
+        return result
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=3, help="boots per mode; medians are reported")
+    args = parser.parse_args()
+
+    db_dir = tempfile.mkdtemp(prefix="bench-startup-")
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{db_dir}/bench.db", SECRET_KEY="benchmark")
+    prepare_database(env)
+
+    print(f"import backend.app.main: {statistics.median(import_seconds(env) for _ in range(args.runs)):.2f}s")
+    for mode in ("false", "true"):
+        runs = [boot(dict(env, WARMUP_ON_STARTUP=mode)) for _ in range(args.runs)]
+        print(f"\nWARMUP_ON_STARTUP={mode}")
+        for key in runs[0]:
+            value = statistics.median(run[key] for run in runs)
+            print(f"  {key:<18} {value:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark /detention/stats/summary as the loads table grows.
+
+Seeds a throwaway SQLite database with N loads (one detention event per
+load) and times get_stats directly, along with the number of SQL statements
+it issues. The statement count must stay fixed regardless of N.
+
+    python -m backend.benchmarks.bench_stats_summary --sizes 1000 10000 100000 1000000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+_db_dir = tempfile.mkdtemp(prefix="bench-stats-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/bench.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlalchemy import event, insert  # noqa: E402
+from backend.app.database import Base, SessionLocal, engine  # noqa: E402
+from backend.app import models  # noqa: E402
+from backend.app.routers.detention import get_stats  # noqa: E402
+
+SHIPPERS = 200
+BATCH = 50_000
+
+
+def seed(total_loads: int):
+    """Top the tables up to total_loads loads, each with one event."""
+    with SessionLocal() as db:
+        existing = db.query(models.Load).count()
+        if not db.query(models.Driver).count():
+            db.add(models.Driver(name="Bench Driver", phone="0", license_number="BENCH"))
+            db.commit()
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        for start in range(existing, total_loads, BATCH):
+            stop = min(start + BATCH, total_loads)
+            conn.execute(insert(models.Load), [
+                {
+                    "id": i + 1,
+                    "load_number": f"BENCH-{i}",
+                    "shipper_name": f"Shipper {i % SHIPPERS}",
+                    "shipper_address": "1 Dock Rd",
+                    "driver_id": 1,
+                    "status": "completed" if i % 3 else "pending",
+                } for i in range(start, stop)
+            ])
+            conn.execute(insert(models.DetentionEvent), [
+                {
+                    "load_id": i + 1,
+                    "driver_id": 1,
+                    "checkin_time": now - timedelta(minutes=300),
+                    "checkout_time": now,
+                    "free_time_minutes": 120,
+                    "detention_rate": 50.0,
+                    "detention_minutes": 180,
+                    "detention_amount": 150.0,
+                    "status": "completed" if i % 10 else "active",
+                } for i in range(start, stop)
+            ])
+
+
+def measure(repeat: int):
+    statements = []
+
+    def count(*_):
+        statements.append(1)
+
+    timings = []
+    with SessionLocal() as db:
+        for _ in range(repeat):
+            statements.clear()
+            event.listen(engine, "before_cursor_execute", count)
+            started = time.perf_counter()
+            get_stats(db=db, current_user=None)
+            timings.append((time.perf_counter() - started) * 1000)
+            event.remove(engine, "before_cursor_execute", count)
+    return statistics.median(timings), len(statements)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    print(f"{'loads':>10} {'median ms':>10} {'queries':>8}")
+    for size in sorted(args.sizes):
+        seed(size)
+        median_ms, queries = measure(args.repeat)
+        print(f"{size:>10} {median_ms:>10.1f} {queries:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import os
+import tempfile
+
+# Settings are read at import time, so point the app at a throwaway database first
+_db_dir = tempfile.mkdtemp(prefix="tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/test.db")
+os.environ.setdefault("SECRET_KEY", "test")
+
+import pytest  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from backend.app import migrations  # noqa: E402
+from backend.app.database import SessionLocal, engine  # noqa: E402
+
+migrations.upgrade(engine)
+
+
+@pytest.fixture
+def db():
+    with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def count_statements():
+    """Returns a list that collects every SQL statement run while the test is active."""
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    yield statements
+    event.remove(engine, "before_cursor_execute", count)
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+    from backend.app.main import app
+    return TestClient(app)
+
+
+def auth_headers(db, email: str, role: str = "dispatcher", driver_id: int = None) -> dict:
+    from backend.app import models
+    from backend.app.core.security import create_access_token
+    if db.query(models.User).filter(models.User.email == email).first() is None:
+        db.add(models.User(email=email, username=email, hashed_password="-", role=role,
+                           driver_id=driver_id))
+        db.commit()
+    return {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
@@ -0,0 +1,38 @@
+import threading
+import time
+from backend.app.database import engine
+from backend.app.services.detention_feed import detention_feed
+from conftest import auth_headers
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return condition()
+
+
+def close_streams():
+    loop = detention_feed._loop
+    loop.call_soon_threadsafe(lambda: [queue.put_nowait(None) for queue in detention_feed._subscribers])
+
+
+def test_open_stream_holds_no_pooled_connection(client, db):
+    # A fresh token misses the principal cache, so authentication queries the database
+    headers = auth_headers(db, "stream-dispatcher@example.com")
+    db.close()
+    responses = []
+    request = threading.Thread(target=lambda: responses.append(
+        client.get("/detention/active/stream", headers=headers)))
+    request.start()
+    try:
+        assert wait_for(lambda: detention_feed.subscriber_count == 1)
+        assert wait_for(lambda: engine.pool.checkedout() == 0), \
+            f"{engine.pool.checkedout()} connection(s) held by an open stream"
+    finally:
+        close_streams()
+        request.join(10)
+    assert responses[0].status_code == 200
+    assert responses[0].text.startswith("event: snapshot")
@@ -0,0 +1,53 @@
+import importlib
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, text
+from backend.app import models
+from backend.app.services.detention_archive import all_events, archive_batch
+
+event_ids = importlib.import_module("backend.app.migrations.0008_sqlite_event_autoincrement")
+
+
+def test_archiving_the_newest_event_does_not_free_its_id(db):
+    old = datetime(2020, 1, 1)
+    newest = models.DetentionEvent(checkin_time=old, checkout_time=old + timedelta(hours=3),
+                                   status="completed", payment_status="paid")
+    db.add(newest)
+    db.commit()
+    archived_id = newest.id
+    assert archive_batch(db, datetime(2021, 1, 1), 1000) >= 1
+
+    db.add(models.DetentionEvent(checkin_time=datetime.utcnow(), status="active"))
+    db.commit()
+    Event = all_events()
+    assert db.query(Event).filter(Event.id == archived_id).count() == 1
+    assert db.query(models.DetentionEvent.id).order_by(models.DetentionEvent.id.desc()).first()[0] > archived_id
+
+
+def test_migration_rebuilds_legacy_table_with_autoincrement(tmp_path):
+    legacy = create_engine(f"sqlite:///{tmp_path}/legacy.db")
+    with legacy.begin() as connection:
+        for ddl in (
+            "CREATE TABLE loads (id INTEGER NOT NULL PRIMARY KEY)",
+            "CREATE TABLE drivers (id INTEGER NOT NULL PRIMARY KEY)",
+            "CREATE TABLE detention_events (id INTEGER NOT NULL, load_id INTEGER REFERENCES loads (id), "
+            "driver_id INTEGER REFERENCES drivers (id), checkin_time DATETIME NOT NULL, "
+            "checkout_time DATETIME, free_time_minutes INTEGER, detention_rate FLOAT, "
+            "detention_minutes INTEGER, detention_amount FLOAT, status VARCHAR, notes VARCHAR, "
+            "payment_status VARCHAR, PRIMARY KEY (id))",
+            "CREATE INDEX ix_detention_events_active ON detention_events (checkin_time) WHERE status = 'active'",
+            "CREATE TABLE detention_events_archive (id INTEGER NOT NULL, checkin_time DATETIME NOT NULL)",
+            "INSERT INTO detention_events (id, checkin_time, status) VALUES (1, '2024-01-01', 'active'), "
+            "(2, '2024-01-02', 'active')",
+            "INSERT INTO detention_events_archive (id, checkin_time) VALUES (3, '2023-01-01')",
+        ):
+            connection.execute(text(ddl))
+        event_ids.upgrade(connection)
+
+    with legacy.begin() as connection:
+        assert "AUTOINCREMENT" in connection.execute(text(
+            "SELECT sql FROM sqlite_master WHERE name = 'detention_events'")).scalar()
+        assert connection.execute(text(
+            "SELECT COUNT(*) FROM sqlite_master WHERE name = 'ix_detention_events_active'")).scalar() == 1
+        assert connection.execute(text("SELECT id FROM detention_events ORDER BY id")).scalars().all() == [1, 2]
+        connection.execute(text("INSERT INTO detention_events (checkin_time) VALUES ('2024-02-01')"))
+        assert connection.execute(text("SELECT MAX(id) FROM detention_events")).scalar() == 4
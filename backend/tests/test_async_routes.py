@@ -0,0 +1,67 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+from backend.app import database, models
+from backend.app.core.config import settings
+from conftest import auth_headers
+
+
+@pytest.fixture
+def async_app(monkeypatch):
+    """An app built with ASYNC_DATABASE_URL pointing at the test database through aiosqlite.
+
+    Yields the client and the statements run on the async engine, so a test can
+    tell that the async handlers, not their sync twins, served it.
+    """
+    url = database.engine.url.set(drivername="sqlite+aiosqlite")
+    # NullPool: TestClient runs each request on its own event loop
+    async_engine = create_async_engine(url, poolclass=NullPool)
+    statements = []
+    event.listen(async_engine.sync_engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+    monkeypatch.setattr(settings, "ASYNC_DATABASE_URL", url.render_as_string(hide_password=False))
+    monkeypatch.setattr(database, "AsyncSessionLocal",
+                        async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False))
+
+    from backend.app.main import create_app
+    yield TestClient(create_app()), statements
+
+
+def test_async_routes_serve_a_detention_round_trip(async_app, db):
+    client, statements = async_app
+    driver = models.Driver(name="Async Driver", phone="0", license_number="ASYNC")
+    db.add(driver)
+    db.flush()
+    load = models.Load(load_number="ASYNC-1", shipper_name="Async Shipper", shipper_address="1 Dock Rd",
+                       driver_id=driver.id, status="pending")
+    db.add(load)
+    db.commit()
+    driver_headers = auth_headers(db, "async-driver@example.com", role="driver", driver_id=driver.id)
+    dispatcher_headers = auth_headers(db, "async-dispatcher@example.com")
+
+    # get_current_user resolves through the async override, and drivers only see their own loads
+    loads = client.get("/loads/", headers=driver_headers)
+    assert loads.status_code == 200
+    assert [row["id"] for row in loads.json()] == [load.id]
+    assert any("FROM users" in statement for statement in statements)
+
+    checkin = client.post("/detention/checkin/", headers=driver_headers,
+                          json={"load_id": load.id, "driver_id": driver.id})
+    assert checkin.status_code == 200
+    event_id = checkin.json()["id"]
+    assert client.post("/detention/checkin/", headers=dispatcher_headers,
+                       json={"load_id": load.id, "driver_id": driver.id}).status_code == 403
+
+    active = client.get("/detention/active", headers=dispatcher_headers)
+    assert active.status_code == 200
+    assert event_id in [row["id"] for row in active.json()]
+
+    checkout = client.post(f"/detention/checkout/{event_id}/", headers=driver_headers, json={})
+    assert checkout.status_code == 200
+    assert checkout.json()["status"] == "completed"
+    assert client.post(f"/detention/checkout/{event_id}/", headers=driver_headers, json={}).status_code == 409
+
+    assert any(statement.startswith("INSERT INTO detention_events") for statement in statements)
+    assert any(statement.startswith("UPDATE detention_events") for statement in statements)
@@ -0,0 +1,40 @@
+import asyncio
+from backend.app import models
+from backend.app.core import security
+from backend.app.core.config import settings
+
+ACCOUNT = {"email": "hash-pool@example.com", "username": "hash-pool", "password": "correct horse"}
+
+
+def register(client, db):
+    if db.query(models.User).filter(models.User.email == ACCOUNT["email"]).first() is None:
+        assert client.post("/auth/register", json=ACCOUNT).status_code == 200
+
+
+def test_register_and_login_hash_on_the_process_pool(client, db):
+    register(client, db)
+    assert security._hash_pool is not None
+
+    ok = client.post("/auth/login", data={"username": ACCOUNT["email"], "password": ACCOUNT["password"]})
+    wrong = client.post("/auth/login", data={"username": ACCOUNT["email"], "password": "wrong"})
+
+    assert ok.status_code == 200 and ok.json()["token_type"] == "bearer"
+    assert wrong.status_code == 401
+
+
+def test_argon2_parameters_come_from_settings():
+    hashed = asyncio.run(security.hash_password_async("pw"))
+    assert (f"m={settings.ARGON2_MEMORY_COST},t={settings.ARGON2_TIME_COST},"
+            f"p={settings.ARGON2_PARALLELISM}") in hashed
+    assert security.verify_password("pw", hashed)
+
+
+def test_login_is_shed_when_no_hash_slot_frees_up(client, db, monkeypatch):
+    register(client, db)
+    monkeypatch.setattr(security, "_hash_slots", asyncio.Semaphore(0))
+    monkeypatch.setattr(settings, "PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS", 0.05)
+
+    response = client.post("/auth/login", data={"username": ACCOUNT["email"], "password": ACCOUNT["password"]})
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
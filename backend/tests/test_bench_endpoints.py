@@ -0,0 +1,29 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from backend.benchmarks.bench_endpoints import ENDPOINTS
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def test_suite_covers_every_router_and_writes_json(tmp_path):
+    output = tmp_path / "bench.json"
+    env = {key: value for key, value in os.environ.items()
+           if key not in ("DATABASE_URL", "BENCH_DATABASE_URL")}
+    subprocess.run(
+        [sys.executable, "-m", "backend.benchmarks.bench_endpoints", "--sizes", "20",
+         "--requests", "2", "--warmup", "0", "--output", str(output)],
+        cwd=REPO_ROOT, env=env, check=True, capture_output=True, timeout=120)
+
+    report = json.loads(output.read_text())
+    assert report["database"] == "sqlite"
+    results = {result["endpoint"]: result for result in report["results"]}
+    assert set(results) == {name for name, *_ in ENDPOINTS}
+    assert {name.split(".")[0] for name in results} >= {
+        "auth", "drivers", "warehouses", "customers", "shipments", "loads", "detention"}
+    for name, result in results.items():
+        assert result["errors"] == 0, name
+        assert result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"]
+    assert results["loads.list"]["queries_per_request"] >= 1
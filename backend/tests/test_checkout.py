@@ -0,0 +1,91 @@
+import threading
+from types import SimpleNamespace
+from unittest.mock import patch
+from fastapi import HTTPException
+from backend.app import models, schemas
+from backend.app.database import SessionLocal, engine
+from backend.app.routers import detention
+from backend.app.services.detention_metrics import detention_gauges
+from backend.app.services.driver_earnings import check_earnings
+from backend.app.services.shipper_scorecards import scorecards
+from conftest import auth_headers
+
+
+def checked_in_event(client, db, name: str):
+    driver = models.Driver(name=name, phone="0", license_number=name)
+    db.add(driver)
+    db.flush()
+    load = models.Load(load_number=name, shipper_name=f"{name} Shipper", shipper_address="1 Dock Rd",
+                       driver_id=driver.id)
+    db.add(load)
+    db.commit()
+    headers = auth_headers(db, f"{name}@example.com", role="driver", driver_id=driver.id)
+    response = client.post("/detention/checkin/", headers=headers,
+                           json={"load_id": load.id, "driver_id": driver.id})
+    assert response.status_code == 200
+    return response.json()["id"], headers
+
+
+def test_repeat_checkout_is_rejected_and_not_counted_twice(client, db):
+    event_id, headers = checked_in_event(client, db, "repeat-checkout")
+    detention_gauges.refresh()
+    active = detention_gauges.active
+
+    assert client.post(f"/detention/checkout/{event_id}/", headers=headers, json={}).status_code == 200
+    repeat = client.post(f"/detention/checkout/{event_id}/", headers=headers, json={})
+
+    assert repeat.status_code == 409
+    assert detention_gauges.active == active - 1
+
+
+def overlapping(handler, event_id: int, current_user, **kwargs) -> list:
+    """Run handler twice at once, both calls reading the event before either writes."""
+    read_both = threading.Barrier(2, timeout=5)
+    contribution = detention.earnings_contribution
+
+    def contribution_after_both_read(event):
+        result = contribution(event)
+        read_both.wait()
+        return result
+
+    outcomes = []
+
+    def call():
+        with SessionLocal() as session:
+            try:
+                handler(event_id, db=session, current_user=current_user, **kwargs)
+                outcomes.append(200)
+            except HTTPException as exc:
+                outcomes.append(exc.status_code)
+
+    with patch.object(detention, "earnings_contribution", contribution_after_both_read):
+        threads = [threading.Thread(target=call) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+    return sorted(outcomes)
+
+
+def test_overlapping_state_changes_move_the_ledger_once(client, db):
+    event_id, _ = checked_in_event(client, db, "overlap")
+    driver_id = db.get(models.DetentionEvent, event_id).driver_id
+    driver = SimpleNamespace(role="driver", driver_id=driver_id)
+
+    assert overlapping(detention.checkout, event_id, driver, data=schemas.DetentionCheckout()) == [200, 409]
+    assert overlapping(detention.request_payment, event_id, driver) == [200, 409]
+    assert overlapping(detention.mark_paid, event_id, SimpleNamespace(role="dispatcher")) == [200, 409]
+    assert check_earnings(engine) == []
+
+
+def test_repeat_checkout_adds_one_dwell_sample(client, db):
+    event_id, headers = checked_in_event(client, db, "repeat-dwell")
+    assert client.post(f"/detention/checkout/{event_id}/", headers=headers, json={}).status_code == 200
+    assert client.post(f"/detention/checkout/{event_id}/", headers=headers, json={}).status_code == 409
+
+    event_id, _ = checked_in_event(client, db, "overlap-dwell")
+    driver = SimpleNamespace(role="driver", driver_id=db.get(models.DetentionEvent, event_id).driver_id)
+    assert overlapping(detention.checkout, event_id, driver, data=schemas.DetentionCheckout()) == [200, 409]
+
+    for shipper in ("repeat-dwell Shipper", "overlap-dwell Shipper"):
+        assert [card["events"] for card in scorecards(db, shipper_name=shipper)] == [1]
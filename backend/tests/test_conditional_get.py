@@ -0,0 +1,40 @@
+from backend.app.core.conditional import bump_version
+
+
+def test_matching_etag_is_answered_without_reading_the_table(client, count_statements):
+    first = client.get("/drivers/", params={"limit": 5})
+    etag = first.headers["ETag"]
+    assert first.status_code == 200 and first.headers["Cache-Control"] == "private, no-cache"
+
+    count_statements.clear()
+    cached = client.get("/drivers/", params={"limit": 5}, headers={"If-None-Match": etag})
+
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["ETag"] == etag
+    assert not any("FROM drivers" in statement for statement in count_statements)
+
+
+def test_writes_change_the_etag(client):
+    etag = client.get("/drivers/").headers["ETag"]
+    created = client.post("/drivers/", json={"name": "Versioned", "phone": "0", "license_number": "VER-1"})
+    assert created.status_code == 200
+
+    listing = client.get("/drivers/", headers={"If-None-Match": etag})
+    detail = client.get(f"/drivers/{created.json()['id']}", headers={"If-None-Match": etag})
+
+    assert listing.status_code == 200 and listing.headers["ETag"] != etag
+    assert detail.status_code == 200
+
+
+def test_bump_version_invalidates_if_modified_since(client, db):
+    first = client.get("/warehouses/")
+    last_modified = first.headers["Last-Modified"]
+    assert client.get("/warehouses/", headers={"If-Modified-Since": last_modified}).status_code == 304
+
+    bump_version(db, "warehouses")
+    db.commit()
+    after = client.get("/warehouses/", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert after.status_code == 200
+    assert after.headers["ETag"] != first.headers["ETag"]
@@ -0,0 +1,32 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from backend.app.core.config import settings
+from backend.app.database import InstrumentedQueuePool, stats
+from conftest import auth_headers
+
+
+def test_pool_endpoint_reports_live_pool_and_checkouts(client, db):
+    headers = auth_headers(db, "pool-dispatcher@example.com")
+    checkouts = stats.snapshot()["checkouts"]
+
+    response = client.get("/debug/db-pool", headers=headers)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["pool"]["class"] == "InstrumentedQueuePool"
+    assert body["pool"]["size"] == settings.DB_POOL_SIZE
+    assert body["events"]["checkouts"] > checkouts
+
+
+def test_pool_wait_timeouts_are_counted(tmp_path):
+    small = create_engine(f"sqlite:///{tmp_path}/pool.db", poolclass=InstrumentedQueuePool,
+                          pool_size=1, max_overflow=0, pool_timeout=0.05)
+    timeouts = stats.snapshot()["timeouts"]
+    try:
+        with small.connect():
+            with pytest.raises(PoolTimeoutError):
+                small.connect()
+    finally:
+        small.dispose()
+    assert stats.snapshot()["timeouts"] == timeouts + 1
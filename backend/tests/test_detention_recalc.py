@@ -0,0 +1,100 @@
+import random
+from datetime import datetime, timedelta, timezone
+import numpy as np
+from backend.app import models
+from backend.app.database import engine
+from backend.app.services.detention_recalc import (
+    _utc_naive, calculate_detention, calculate_detention_vectorized, recalculate
+)
+
+EPOCH = np.datetime64(0, "us")
+
+
+def vectorized(cases):
+    """Run (checkin, checkout, free_time_minutes, rate) cases through the array path."""
+    checkins, checkouts, free_times, rates = zip(*cases)
+    checkin_us = (np.array([_utc_naive(v) for v in checkins], dtype="datetime64[us]") - EPOCH).astype(np.int64)
+    checkout_us = (np.array([_utc_naive(v) for v in checkouts], dtype="datetime64[us]") - EPOCH).astype(np.int64)
+    minutes, amounts = calculate_detention_vectorized(
+        checkin_us, checkout_us, np.array(free_times, dtype=np.int64), np.array(rates, dtype=np.float64))
+    return [(int(m), float(a)) for m, a in zip(minutes, amounts)]
+
+
+def assert_matches_scalar(cases):
+    expected = [calculate_detention(*case) for case in cases]
+    assert vectorized(cases) == expected
+
+
+def test_random_inputs_match_the_scalar_formula():
+    rng = random.Random(14)
+    base = datetime(2024, 1, 1)
+    cases = []
+    for _ in range(20_000):
+        checkin = base + timedelta(microseconds=rng.randrange(400 * 86_400 * 10 ** 6))
+        dwell = timedelta(microseconds=rng.randrange(-3_600 * 10 ** 6, 3 * 86_400 * 10 ** 6))
+        cases.append((checkin, checkin + dwell, rng.choice([0, 1, 30, 60, 120, 240]),
+                      rng.choice([rng.uniform(0, 200), round(rng.uniform(0, 200), 3)])))
+    assert_matches_scalar(cases)
+
+
+def test_half_cent_ties_match_the_scalar_formula():
+    checkin = datetime(2024, 3, 1, 8, 0)
+    cases = [(checkin, checkin + timedelta(minutes=minutes), 0, cents / 100 + 0.005)
+             for minutes in range(1, 181) for cents in range(0, 3000, 7)]
+    assert_matches_scalar(cases)
+
+
+def test_near_ties_are_re_rounded_like_python():
+    # 4 minutes at 0.225/h is 0.015: np.round gives 0.02, round() gives 0.01
+    checkin = datetime(2024, 3, 1, 8, 0)
+    raw = (4 / 60) * 0.225
+    assert float(np.round(raw, 2)) != round(raw, 2)
+
+    assert vectorized([(checkin, checkin + timedelta(minutes=4), 0, 0.225)]) == [(4, round(raw, 2))]
+
+
+def test_zero_and_negative_dwell_bill_nothing():
+    checkin = datetime(2024, 3, 1, 8, 0)
+    cases = [(checkin, checkin + timedelta(seconds=seconds), free_time, 75.0)
+             for seconds in (0, 1, 59, -1, -59, -61, -5_400, -86_400) for free_time in (0, 120)]
+    assert_matches_scalar(cases)
+    assert {minutes for minutes, _ in vectorized(cases)} == {0}
+
+
+def test_large_rates_match_the_scalar_formula():
+    checkin = datetime(2024, 3, 1, 8, 0)
+    cases = [(checkin, checkin + timedelta(minutes=minutes, seconds=seconds), 120, rate)
+             for minutes in (121, 179, 1_441, 525_600) for seconds in (0, 59)
+             for rate in (1e6, 123_456.789, 9_999_999.995, 1e12)]
+    assert_matches_scalar(cases)
+
+
+def test_aware_and_naive_timestamps_agree():
+    naive_checkin = datetime(2024, 3, 1, 8, 0)
+    naive_checkout = datetime(2024, 3, 1, 11, 17, 30)
+    offset = timezone(timedelta(hours=5, minutes=30))
+    aware_checkin = naive_checkin.replace(tzinfo=timezone.utc).astimezone(offset)
+    aware_checkout = naive_checkout.replace(tzinfo=timezone.utc)
+
+    cases = [(naive_checkin, naive_checkout, 120, 50.0), (aware_checkin, naive_checkout, 120, 50.0),
+             (naive_checkin, aware_checkout, 120, 50.0), (aware_checkin, aware_checkout, 120, 50.0)]
+    assert_matches_scalar(cases)
+    assert set(vectorized(cases)) == {(77, 64.17)}
+
+
+def test_null_terms_and_results_are_recalculated_with_the_defaults(db):
+    checkin = datetime(2024, 5, 2, 8, 0)
+    # Core insert: the ORM would fill the column defaults in for None
+    event_id = db.execute(models.DetentionEvent.__table__.insert().values(
+        checkin_time=checkin, checkout_time=checkin + timedelta(minutes=200), status="completed",
+        free_time_minutes=None, detention_rate=None, detention_minutes=None, detention_amount=None,
+    )).inserted_primary_key[0]
+    db.commit()
+
+    report = recalculate(engine, event_ids=[event_id], dry_run=False, verify=True)
+
+    event = db.get(models.DetentionEvent, event_id)
+    assert report["scanned"] == 1 and report["changed"] == 1
+    assert (event.free_time_minutes, event.detention_rate) == (120, 50.0)
+    assert (event.detention_minutes, event.detention_amount) == calculate_detention(
+        event.checkin_time, event.checkout_time, 120, 50.0)
@@ -0,0 +1,63 @@
+from datetime import datetime, timezone
+from backend.app.core.config import settings
+from backend.app.services.detention_timers import ACCRUAL_SECONDS, DetentionTimers
+
+CHECKIN = datetime(2026, 1, 5, 8, 0, tzinfo=timezone.utc)
+EXPIRES_AT = CHECKIN.timestamp() + 120 * 60
+
+
+def row(event_id, checkin=CHECKIN, free_time_minutes=120, rate=75.0):
+    return (event_id, 10 + event_id, 20 + event_id, checkin, free_time_minutes, rate)
+
+
+def test_free_time_then_each_billable_hour_fires_once():
+    timers = DetentionTimers()
+    timers.load([row(1)], EXPIRES_AT - 60)
+
+    assert timers.pop_due(EXPIRES_AT - 1) == []
+    assert timers.pop_due(EXPIRES_AT) == [(1, 0)]
+    timers.advance(1, 0)
+    assert timers.pop_due(EXPIRES_AT + ACCRUAL_SECONDS - 1) == []
+    assert timers.pop_due(EXPIRES_AT + ACCRUAL_SECONDS) == [(1, 1)]
+
+
+def test_checked_out_event_is_skipped_and_not_advanced():
+    timers = DetentionTimers()
+    timers.load([row(1), row(2)], EXPIRES_AT - 60)
+    timers._timers.pop(1)
+
+    assert timers.pop_due(EXPIRES_AT) == [(2, 0)]
+    timers.advance(1, 0)
+    assert len(timers) == 1
+    assert all(entry[1] == 2 for entry in timers._heap)
+
+
+def test_loading_the_same_event_twice_tracks_it_once():
+    timers = DetentionTimers()
+    timers.load([row(1)], EXPIRES_AT - 60)
+    timers.load([row(1)], EXPIRES_AT - 30)
+
+    assert len(timers) == 1
+    assert timers.pop_due(EXPIRES_AT) == [(1, 0)]
+
+
+def test_restart_catches_up_on_a_recent_boundary_only(monkeypatch):
+    monkeypatch.setattr(settings, "DETENTION_TIMER_CATCHUP_SECONDS", 300)
+    recent, stale = DetentionTimers(), DetentionTimers()
+
+    recent.load([row(1)], EXPIRES_AT + ACCRUAL_SECONDS + 60)
+    stale.load([row(1)], EXPIRES_AT + ACCRUAL_SECONDS + 600)
+
+    # The first billable hour was crossed a minute before the restart: announce it
+    assert recent.pop_due(EXPIRES_AT + ACCRUAL_SECONDS + 60) == [(1, 1)]
+    # Ten minutes is past the catch-up window: wait for the second hour
+    assert stale.pop_due(EXPIRES_AT + ACCRUAL_SECONDS + 600) == []
+    assert stale.pop_due(EXPIRES_AT + 2 * ACCRUAL_SECONDS) == [(1, 2)]
+
+
+def test_naive_checkin_is_read_as_utc():
+    timers = DetentionTimers()
+    timers.load([row(1, checkin=CHECKIN.replace(tzinfo=None), free_time_minutes=None, rate=None)],
+                CHECKIN.timestamp() - 60)
+
+    assert timers.pop_due(CHECKIN.timestamp()) == [(1, 0)]
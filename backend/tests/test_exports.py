@@ -0,0 +1,100 @@
+import csv
+import gzip
+import io
+import json
+from datetime import datetime, timedelta, timezone
+from backend.app import models
+from backend.app.database import engine
+from backend.app.routers import detention
+from conftest import auth_headers
+
+
+def seed_export(db, shipper_name: str, count: int) -> models.Driver:
+    driver = models.Driver(name=f"{shipper_name} Driver", phone="0", license_number=shipper_name)
+    db.add(driver)
+    db.flush()
+    checkin = datetime(2024, 6, 1, 8, 0)
+    for i in range(count):
+        load = models.Load(load_number=f"{shipper_name}-{i}", shipper_name=shipper_name,
+                           shipper_address="1 Dock Rd", driver_id=driver.id)
+        db.add(load)
+        db.flush()
+        db.add(models.DetentionEvent(
+            load_id=load.id, driver_id=driver.id, checkin_time=checkin + timedelta(days=i),
+            checkout_time=checkin + timedelta(days=i, hours=3), free_time_minutes=120,
+            detention_rate=50.0, detention_minutes=60, detention_amount=50.0,
+            status="completed", payment_status="paid" if i % 2 else "none"))
+    db.commit()
+    return driver
+
+
+def test_csv_export_joins_load_and_driver_fields(client, db):
+    driver = seed_export(db, "Export CSV", 3)
+    headers = auth_headers(db, "export-csv@example.com")
+
+    response = client.get("/detention/export", params={"shipper_name": "Export CSV"}, headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["load_number"] for row in rows] == ["Export CSV-0", "Export CSV-1", "Export CSV-2"]
+    assert {row["driver_name"] for row in rows} == {driver.name}
+    assert rows[0]["checkin_time"] == "2024-06-01T08:00:00"
+
+
+def test_ndjson_export_filters_and_gzips(client, db):
+    seed_export(db, "Export NDJSON", 4)
+    headers = auth_headers(db, "export-ndjson@example.com")
+
+    response = client.get("/detention/export", headers=headers, params={
+        "shipper_name": "Export NDJSON", "payment_status": "paid", "format": "ndjson", "gzip": "true"})
+
+    assert response.status_code == 200
+    assert response.headers["content-disposition"].endswith("detention-events.ndjson.gz")
+    lines = gzip.decompress(response.content).decode().splitlines()
+    events = [json.loads(line) for line in lines]
+    assert [event["load_number"] for event in events] == ["Export NDJSON-1", "Export NDJSON-3"]
+    assert all(event["payment_status"] == "paid" for event in events)
+
+
+def test_empty_csv_export_is_just_the_header(client, db):
+    headers = auth_headers(db, "export-csv@example.com")
+    response = client.get("/detention/export", params={"shipper_name": "Nobody"}, headers=headers)
+    assert len(response.text.splitlines()) == 1
+    assert response.text.startswith("event_id,load_id,load_number")
+
+
+def test_driver_export_is_limited_to_their_own_events(client, db):
+    own = seed_export(db, "Export Own", 1)
+    seed_export(db, "Export Other", 1)
+    headers = auth_headers(db, "export-driver@example.com", role="driver", driver_id=own.id)
+
+    response = client.get("/detention/export", params={"format": "ndjson"}, headers=headers)
+    forbidden = client.get("/detention/export", params={"driver_id": own.id + 1}, headers=headers)
+
+    assert {json.loads(line)["driver_id"] for line in response.text.splitlines()} == {own.id}
+    assert forbidden.status_code == 403
+
+
+def test_export_streams_on_a_single_pooled_connection(client, db, monkeypatch):
+    now = datetime.now(timezone.utc)
+    db.add(models.DetentionEvent(checkin_time=now - timedelta(hours=3), checkout_time=now,
+                                 free_time_minutes=120, detention_rate=50.0, detention_minutes=60,
+                                 detention_amount=50.0, status="completed"))
+    db.commit()
+    headers = auth_headers(db, "export-dispatcher@example.com")
+    db.close()
+    export_batches = detention._export_batches
+    checked_out = []
+
+    def recording_batches(filters):
+        for batch in export_batches(filters):
+            checked_out.append(engine.pool.checkedout())
+            yield batch
+        checked_out.append(engine.pool.checkedout())
+
+    monkeypatch.setattr(detention, "_export_batches", recording_batches)
+    response = client.get("/detention/export", headers=headers)
+    assert response.status_code == 200
+    # Only the export's own session; authentication released its connection
+    assert max(checked_out) == 1
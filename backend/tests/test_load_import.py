@@ -0,0 +1,75 @@
+import io
+from sqlalchemy import event
+from backend.app import models
+from backend.app.database import engine
+from backend.app.services.load_import import import_file
+from conftest import auth_headers
+
+
+def test_csv_import_reports_bad_and_duplicate_rows_without_aborting(client, db):
+    db.add(models.Load(load_number="IMP-EXISTING", shipper_name="Shipper", shipper_address="1 Dock Rd"))
+    db.commit()
+    csv = (
+        "load_number,shipper_name,shipper_address\n"
+        "IMP-1,Import Shipper,1 Dock Rd\n"
+        "IMP-EXISTING,Import Shipper,1 Dock Rd\n"
+        "IMP-2,,1 Dock Rd\n"
+        "IMP-1,Import Shipper,1 Dock Rd\n"
+        "IMP-3,Import Shipper,1 Dock Rd\n"
+    )
+
+    response = client.post("/loads/import", headers=auth_headers(db, "importer@example.com"),
+                           params={"batch_size": 2},
+                           files={"file": ("loads.csv", csv.encode(), "text/csv")})
+
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["rows"], report["inserted"], report["failed"]) == (5, 2, 3)
+    # Row numbers count the header as row 1
+    assert [(error["row"], error["load_number"]) for error in report["errors"]] == [
+        (3, "IMP-EXISTING"), (4, "IMP-2"), (5, "IMP-1")]
+    assert "shipper_name" in report["errors"][1]["error"]
+    imported = db.query(models.Load.load_number).filter(models.Load.load_number.like("IMP-%"))
+    assert sorted(number for number, in imported) == ["IMP-1", "IMP-3", "IMP-EXISTING"]
+
+
+def test_ndjson_import_reports_malformed_lines():
+    ndjson = (
+        b'{"load_number": "NDJ-1", "shipper_name": "Shipper", "shipper_address": "1 Dock Rd"}\n'
+        b'{"load_number": "NDJ-2", "shipper_name": \n'
+        b'\n'
+        b'{"load_number": "NDJ-3", "shipper_name": "Shipper", "shipper_address": "1 Dock Rd"}\n'
+    )
+
+    report = import_file(engine, io.BytesIO(ndjson), "ndjson")
+
+    assert (report["rows"], report["inserted"], report["failed"]) == (3, 2, 1)
+    assert report["errors"][0]["row"] == 2
+    assert report["errors"][0]["error"].startswith("Invalid JSON")
+
+
+def test_batch_that_loses_a_race_falls_back_to_row_by_row():
+    csv = (
+        "load_number,shipper_name,shipper_address\n"
+        "RACE-1,Shipper,1 Dock Rd\n"
+        "RACE-2,Shipper,1 Dock Rd\n"
+        "RACE-3,Shipper,1 Dock Rd\n"
+    )
+    # A concurrent writer stores RACE-2 right after the duplicate check missed it
+    raced = []
+
+    def insert_race_2(conn, cursor, statement, *args):
+        if not raced and statement.startswith("SELECT loads.load_number"):
+            raced.append(True)
+            conn.execute(models.Load.__table__.insert().values(
+                load_number="RACE-2", shipper_name="Other", shipper_address="2 Dock Rd"))
+
+    event.listen(engine, "after_cursor_execute", insert_race_2)
+    try:
+        report = import_file(engine, io.BytesIO(csv.encode()), "csv")
+    finally:
+        event.remove(engine, "after_cursor_execute", insert_race_2)
+
+    assert (report["inserted"], report["failed"]) == (2, 1)
+    assert report["errors"][0]["load_number"] == "RACE-2"
+    assert report["errors"][0]["error"].startswith("Rejected by database")
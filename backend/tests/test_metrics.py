@@ -0,0 +1,47 @@
+import re
+from backend.app.core.metrics import CONTENT_TYPE, Counter, Histogram
+from conftest import auth_headers
+
+
+def sample(text: str, name: str, **labels) -> float:
+    wanted = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    match = re.search(rf"^{name}{{{re.escape(wanted)}}} (\S+)$", text, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+
+def test_requests_are_labelled_by_route_template(client, db):
+    headers = auth_headers(db, "metrics@example.com")
+    labels = {"method": "GET", "route": "/loads/{load_id}", "status": "404"}
+    before = sample(client.get("/metrics").text, "http_requests_total", **labels)
+
+    client.get("/loads/900001", headers=headers)
+    client.get("/loads/900002", headers=headers)
+    client.get("/no/such/path")
+    response = client.get("/metrics")
+
+    assert response.headers["content-type"] == CONTENT_TYPE
+    assert sample(response.text, "http_requests_total", **labels) == before + 2
+    assert "/loads/900001" not in response.text
+    assert sample(response.text, "http_requests_total", method="GET", route="unmatched", status="404") >= 1
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/loads/{load_id}",le="+Inf"}' \
+        in response.text
+
+
+def test_scrape_includes_business_and_pool_gauges(client):
+    text = client.get("/metrics").text
+    for name in ("detention_active_events", "detention_payment_requests_pending",
+                 "db_pool_checked_out", "http_requests_in_flight"):
+        assert re.search(rf"^{name} \S+$", text, re.MULTILINE), name
+
+
+def test_exposition_format():
+    counter = Counter("jobs_total", "Jobs.", ("queue",))
+    counter.inc(queue='a"b')
+    histogram = Histogram("job_seconds", "Job time.", buckets=(0.1, 1.0))
+    histogram.observe(0.5)
+    histogram.observe(2)
+
+    assert counter.samples() == ['jobs_total{queue="a\\"b"} 1']
+    assert histogram.samples() == [
+        'job_seconds_bucket{le="0.1"} 0', 'job_seconds_bucket{le="1"} 1',
+        'job_seconds_bucket{le="+Inf"} 2', "job_seconds_sum 2.5", "job_seconds_count 2"]
@@ -0,0 +1,21 @@
+from backend.app import models
+from conftest import auth_headers
+
+
+def test_desc_order_pages_newest_first_and_name_prefix_filters(client, db):
+    drivers = [models.Driver(name=name, phone="0", license_number="PAGE-" + name)
+               for name in ("Pager_A", "Pager_B", "Pager%C", "Pager_D")]
+    db.add_all(drivers)
+    db.commit()
+    headers = auth_headers(db, "pager@example.com")
+    ids = [driver.id for driver in drivers]
+
+    # "_" must match literally, so Pager%C stays out of the type-ahead
+    params = {"name_prefix": "Pager_", "order": "desc", "limit": 2}
+    first = client.get("/drivers/", headers=headers, params=params)
+    assert [row["id"] for row in first.json()] == [ids[3], ids[1]]
+
+    cursor = first.headers["x-next-cursor"]
+    second = client.get("/drivers/", headers=headers, params={**params, "cursor": cursor})
+    assert [row["id"] for row in second.json()] == [ids[0]]
+    assert "x-next-cursor" not in second.headers
@@ -0,0 +1,39 @@
+from datetime import datetime, timedelta, timezone
+from backend.app import models
+from backend.app.routers.detention import get_payment_requests
+
+
+def seed_requested(db, count: int):
+    driver = models.Driver(name="Driver", phone="0", license_number=f"L-{count}")
+    db.add(driver)
+    db.flush()
+    now = datetime.now(timezone.utc)
+    for i in range(count):
+        load = models.Load(load_number=f"PR-{count}-{i}", shipper_name="Shipper",
+                           shipper_address="1 Dock Rd", driver_id=driver.id)
+        db.add(load)
+        db.flush()
+        db.add(models.DetentionEvent(
+            load_id=load.id, driver_id=driver.id,
+            checkin_time=now - timedelta(hours=4), checkout_time=now,
+            free_time_minutes=120, detention_rate=50.0,
+            detention_minutes=120, detention_amount=100.0,
+            status="completed", payment_status="requested"))
+    db.commit()
+
+
+def test_payment_requests_query_count_is_constant(db, count_statements):
+    seed_requested(db, 3)
+    count_statements.clear()
+    small = get_payment_requests(db=db, current_user=None)
+    small_queries = len(count_statements)
+
+    seed_requested(db, 30)
+    db.expire_all()
+    count_statements.clear()
+    large = get_payment_requests(db=db, current_user=None)
+
+    assert len(large) == len(small) + 30
+    assert all(row["driver_name"] == "Driver" and row["load_number"].startswith("PR-") for row in large)
+    assert small_queries == 1
+    assert len(count_statements) == small_queries
@@ -0,0 +1,95 @@
+import time
+from backend.app import models
+from backend.app.core.cache import TTLCache
+from backend.app.core.dependencies import principal_cache
+from backend.app.database import SessionLocal
+from conftest import auth_headers
+
+PROBE = "/auth/principal-cache"
+
+
+def user_queries(statements):
+    return [statement for statement in statements if "FROM users" in statement]
+
+
+def test_repeat_requests_are_served_from_the_cache(client, db, count_statements):
+    headers = auth_headers(db, "cache-hit@example.com")
+    count_statements.clear()
+
+    assert client.get(PROBE, headers=headers).status_code == 200
+    assert len(user_queries(count_statements)) == 1
+    assert client.get(PROBE, headers=headers).status_code == 200
+    assert len(user_queries(count_statements)) == 1
+
+
+def test_principal_cached_before_the_commit_is_evicted_after_it(client, db):
+    headers = auth_headers(db, "cache-demoted@example.com")
+    user = db.query(models.User).filter(models.User.email == "cache-demoted@example.com").one()
+
+    with SessionLocal() as session:
+        session.get(models.User, user.id).role = "driver"
+        session.flush()
+        # Still committed as a dispatcher, so this request caches the old role
+        assert client.get(PROBE, headers=headers).status_code == 200
+        session.commit()
+
+    assert client.get(PROBE, headers=headers).status_code == 403
+
+
+def test_rolled_back_change_does_not_linger_on_the_session(db):
+    auth_headers(db, "cache-rollback@example.com")
+    with SessionLocal() as session:
+        session.query(models.User).filter(models.User.email == "cache-rollback@example.com").one().role = "driver"
+        session.flush()
+        assert session.info
+        session.rollback()
+        assert not any(session.info.values())
+
+
+def test_deactivated_user_gets_401(client, db):
+    dispatcher = auth_headers(db, "cache-admin@example.com")
+    headers = auth_headers(db, "cache-leaver@example.com")
+    user = db.query(models.User).filter(models.User.email == "cache-leaver@example.com").one()
+    assert client.get(PROBE, headers=headers).status_code == 200
+
+    deactivated = client.post(f"/auth/users/{user.id}/deactivate", headers=dispatcher)
+    assert deactivated.status_code == 200 and deactivated.json()["is_active"] is False
+
+    response = client.get(PROBE, headers=headers)
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Inactive user"
+    assert principal_cache.get(headers["Authorization"].split()[1]) is None
+
+
+def test_lookup_that_raced_an_invalidation_is_not_cached():
+    cache = TTLCache(maxsize=10, ttl=60)
+    generation = cache.generation
+    cache.invalidate_where(lambda value: value == "stale")
+
+    cache.set("token", "stale", generation=generation)
+    assert cache.get("token") is None
+    cache.set("token", "fresh", generation=cache.generation)
+    assert cache.get("token") == "fresh"
+
+
+def test_entries_expire_by_the_shorter_ttl():
+    cache = TTLCache(maxsize=10, ttl=0.01)
+    cache.set("default", 1)
+    cache.set("token-expiry", 2, ttl=0.005)
+    cache.set("already-expired", 3, ttl=-1)
+    cache.set("capped", 4, ttl=3600)
+
+    assert cache.get("already-expired") is None
+    time.sleep(0.02)
+    assert [cache.get(key) for key in ("default", "token-expiry", "capped")] == [None, None, None]
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+    assert cache.evictions == 1
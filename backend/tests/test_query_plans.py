@@ -0,0 +1,28 @@
+from sqlalchemy import create_engine, text
+from backend.app import migrations
+from backend.app.migrations.plan_check import _explain, check_plans, hot_queries
+
+
+def migrated(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/plans.db")
+    migrations.upgrade(engine)
+    return engine
+
+
+def test_hot_queries_use_an_index(tmp_path):
+    engine = migrated(tmp_path)
+    with engine.connect() as connection:
+        for name, stmt in hot_queries().items():
+            with connection.begin():
+                plan = [line.strip() for line in _explain(connection, stmt)]
+            # Every table access is an index or primary-key lookup, never a bare SCAN
+            accesses = [line for line in plan if line.startswith(("SCAN", "SEARCH"))]
+            assert accesses and all("USING" in line for line in accesses), f"{name}: {plan}"
+    assert check_plans(engine) == {}
+
+
+def test_dropped_index_is_reported_as_a_full_scan(tmp_path):
+    engine = migrated(tmp_path)
+    with engine.begin() as connection:
+        connection.execute(text("DROP INDEX ix_detention_events_active"))
+    assert "get_active" in check_plans(engine)
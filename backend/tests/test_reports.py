@@ -0,0 +1,84 @@
+import io
+import zipfile
+from datetime import datetime, timedelta
+from backend.app import models
+from backend.app.services.detention_report import report_cache
+from conftest import auth_headers
+
+
+def completed_event(db, name: str, shipper_name: str = "Report Shipper") -> int:
+    driver = models.Driver(name=name, phone="0", license_number=name)
+    db.add(driver)
+    db.flush()
+    load = models.Load(load_number=name, shipper_name=shipper_name, shipper_address="1 Dock Rd",
+                       driver_id=driver.id)
+    db.add(load)
+    db.flush()
+    checkin = datetime(2024, 5, 1, 8, 0)
+    event = models.DetentionEvent(
+        load_id=load.id, driver_id=driver.id, checkin_time=checkin,
+        checkout_time=checkin + timedelta(hours=3), free_time_minutes=120, detention_rate=50.0,
+        detention_minutes=60, detention_amount=50.0, status="completed")
+    db.add(event)
+    db.commit()
+    return event.id
+
+
+def test_report_is_served_from_cache_and_revalidated(client, db):
+    event_id = completed_event(db, "report-cache")
+    headers = auth_headers(db, "reports@example.com")
+    url = f"/detention/{event_id}/report"
+
+    first = client.get(url, headers=headers)
+    assert first.status_code == 200
+    assert first.content.startswith(b"%PDF")
+    etag = first.headers["ETag"]
+
+    hits = report_cache.hits
+    again = client.get(url, headers=headers)
+    assert again.content == first.content
+    assert report_cache.hits == hits + 1
+
+    not_modified = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+
+def test_report_etag_changes_with_printed_fields(client, db):
+    event_id = completed_event(db, "report-edit")
+    headers = auth_headers(db, "reports@example.com")
+    url = f"/detention/{event_id}/report"
+    etag = client.get(url, headers=headers).headers["ETag"]
+
+    event = db.get(models.DetentionEvent, event_id)
+    event.notes = "Dock 4 was closed"
+    db.commit()
+    changed = client.get(url, headers={**headers, "If-None-Match": etag})
+
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_report_export_zips_one_pdf_per_matching_event(client, db):
+    event_ids = [completed_event(db, f"zip-{i}", shipper_name="Zip Shipper") for i in range(3)]
+    headers = auth_headers(db, "zip-export@example.com")
+
+    response = client.get("/detention/reports/export", params={"shipper_name": "Zip Shipper"},
+                          headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+        assert sorted(archive.namelist()) == sorted(f"detention-report-{i}.pdf" for i in event_ids)
+        assert all(archive.read(name).startswith(b"%PDF") for name in archive.namelist())
+
+
+def test_driver_cannot_export_another_drivers_reports(client, db):
+    event_id = completed_event(db, "zip-other")
+    driver_id = db.get(models.DetentionEvent, event_id).driver_id
+    headers = auth_headers(db, "zip-driver@example.com", role="driver", driver_id=driver_id)
+
+    response = client.get("/detention/reports/export", params={"driver_id": driver_id + 1000},
+                          headers=headers)
+
+    assert response.status_code == 403
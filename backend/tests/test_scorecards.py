@@ -0,0 +1,31 @@
+import importlib
+from datetime import datetime, timedelta
+from sqlalchemy import text
+from backend.app import models
+from backend.app.database import engine
+from backend.app.services.shipper_scorecards import rebuild_scorecards
+
+dwell_sketches = importlib.import_module("backend.app.migrations.0007_shipper_dwell_sketches")
+
+SKETCHES = "SELECT shipper_name, day, bucket, events, over_free_time FROM shipper_dwell_sketches ORDER BY 1, 2, 3"
+
+
+def test_migration_backfill_matches_rebuild(db):
+    load = models.Load(load_number="backfill", shipper_name="Backfill Shipper", shipper_address="1 Dock Rd")
+    db.add(load)
+    db.flush()
+    checkin = datetime(2024, 3, 1, 23, 30)
+    for minutes, detention in ((0, 0), (45, 0), (150, 30), (150, 30), (600, 480)):
+        db.add(models.DetentionEvent(load_id=load.id, checkin_time=checkin,
+                                     checkout_time=checkin + timedelta(minutes=minutes),
+                                     detention_minutes=detention, status="completed"))
+    db.add(models.DetentionEvent(load_id=load.id, checkin_time=checkin, status="active"))
+    db.commit()
+
+    with engine.begin() as connection:
+        rebuild_scorecards(connection)
+        rebuilt = connection.execute(text(SKETCHES)).all()
+        connection.execute(text("DELETE FROM shipper_dwell_sketches"))
+        dwell_sketches.upgrade(connection)
+        assert connection.execute(text(SKETCHES)).all() == rebuilt
+    assert sum(row.events for row in rebuilt if row.shipper_name == "Backfill Shipper") == 5
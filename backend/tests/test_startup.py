@@ -0,0 +1,55 @@
+import asyncio
+import os
+import subprocess
+import sys
+from pathlib import Path
+from backend.app.core.config import settings
+from backend.app.database import engine
+from backend.app.main import create_app
+from backend.app.warmup import warm_up
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Prints the number of tables after importing the app, then after its startup hooks
+BOOT = """
+import sqlite3, sys
+from fastapi.testclient import TestClient
+from backend.app.main import app
+tables = lambda: sqlite3.connect(sys.argv[1]).execute(
+    "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table'").fetchone()[0]
+print(tables())
+if sys.argv[2] == "start":
+    with TestClient(app) as client:
+        print(tables(), client.get("/").status_code)
+"""
+
+
+def boot(tmp_path, start: bool, **env) -> list:
+    database = tmp_path / "startup.db"
+    result = subprocess.run(
+        [sys.executable, "-c", BOOT, str(database), "start" if start else "import"],
+        cwd=REPO_ROOT, check=True, capture_output=True, text=True, timeout=120,
+        env={**os.environ, "DATABASE_URL": f"sqlite:///{database}", "WARMUP_ON_STARTUP": "false", **env})
+    return result.stdout.split()
+
+
+def test_importing_the_app_does_not_touch_the_schema(tmp_path):
+    assert boot(tmp_path, start=False) == ["0"]
+
+
+def test_migrate_on_startup_brings_the_schema_up(tmp_path):
+    before, after, status = boot(tmp_path, start=True, MIGRATE_ON_STARTUP="true")
+    assert before == "0" and int(after) > 0 and status == "200"
+
+
+def test_create_app_builds_independent_apps():
+    first, second = create_app(), create_app()
+    assert first is not second
+    assert {route.path for route in first.routes} == {route.path for route in second.routes}
+
+
+def test_warm_up_primes_hashing_reportlab_and_pool():
+    timings = asyncio.run(warm_up())
+    assert set(timings) == {"password_hash_pool", "reportlab", "db_pool"}
+    assert timings["reportlab"] is not None
+    assert engine.pool.checkedin() >= min(settings.WARMUP_DB_CONNECTIONS, settings.DB_POOL_SIZE)
@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import event
+from backend.app import models
+from backend.app.database import engine
+from conftest import auth_headers
+
+
+def test_key_stored_by_concurrent_retry_is_a_duplicate(client, db):
+    driver = models.Driver(name="Sync Driver", phone="0", license_number="SYNC")
+    db.add(driver)
+    db.flush()
+    load = models.Load(load_number="SYNC-1", shipper_name="Shipper", shipper_address="1 Dock Rd",
+                       driver_id=driver.id)
+    db.add(load)
+    db.commit()
+    headers = auth_headers(db, "sync-driver@example.com", role="driver", driver_id=driver.id)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+
+    # Store the key right after the handler's idempotency lookup missed it, as
+    # a retry that is still in flight would
+    stored = []
+
+    def store_key(conn, cursor, statement, *args):
+        if not stored and statement.startswith("SELECT") and "FROM detention_sync_operations" in statement:
+            stored.append(True)
+            conn.execute(models.DetentionSyncOperation.__table__.insert().values(
+                driver_id=driver.id, idempotency_key="k-1", op="checkin", client_seq=1,
+                client_time=now, received_at=now, event_id=None))
+
+    event.listen(engine, "after_cursor_execute", store_key)
+    try:
+        response = client.post("/detention/sync", headers=headers, json={"operations": [
+            {"op": "checkin", "idempotency_key": "k-1", "client_seq": 1,
+             "client_time": now.isoformat() + "Z", "load_id": load.id},
+        ]})
+    finally:
+        event.remove(engine, "after_cursor_execute", store_key)
+
+    assert response.status_code == 200
+    assert response.json()[0]["status"] == "duplicate"
+    assert db.query(models.DetentionEvent).filter(models.DetentionEvent.load_id == load.id).count() == 0
+
+
+def test_checkout_before_checkin_is_rejected(client, db):
+    driver = models.Driver(name="Skewed Driver", phone="0", license_number="SKEW")
+    db.add(driver)
+    db.flush()
+    load = models.Load(load_number="SKEW-1", shipper_name="Shipper", shipper_address="1 Dock Rd",
+                       driver_id=driver.id)
+    db.add(load)
+    db.commit()
+    headers = auth_headers(db, "skewed-driver@example.com", role="driver", driver_id=driver.id)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+
+    # The device's clock was set back between check-in and check-out
+    response = client.post("/detention/sync", headers=headers, json={"operations": [
+        {"op": "checkin", "idempotency_key": "skew-in", "client_seq": 1,
+         "client_time": (now - timedelta(minutes=30)).isoformat() + "Z", "load_id": load.id},
+        {"op": "checkout", "idempotency_key": "skew-out", "client_seq": 2, "checkin_key": "skew-in",
+         "client_time": (now - timedelta(minutes=90)).isoformat() + "Z"},
+    ]})
+
+    assert response.status_code == 200
+    checkin, checkout = response.json()
+    assert checkin["status"] == "applied"
+    assert checkout == {"idempotency_key": "skew-out", "client_seq": 2, "status": "rejected",
+                        "event_id": None, "error": "Checkout time is before the check-in time"}
+    event = db.get(models.DetentionEvent, checkin["event_id"])
+    assert event.status == "active" and event.detention_minutes == 0
@@ -0,0 +1,43 @@
+import logging
+import re
+from backend.app.core.config import settings
+from backend.app.core.timing import parameter_shape
+from conftest import auth_headers
+
+
+def test_server_timing_breaks_down_db_serialize_render(client, db):
+    response = client.get("/loads/", params={"limit": 5}, headers=auth_headers(db, "timing@example.com"))
+
+    timing = response.headers["Server-Timing"]
+    phases = dict(re.findall(r"(\w+);dur=([\d.]+)", timing))
+    assert set(phases) == {"db", "serialize", "render", "total"}
+    queries = int(re.search(r'desc="(\d+) queries"', timing).group(1))
+    assert queries >= 1
+    assert float(phases["total"]) >= float(phases["db"])
+
+
+def test_slow_statements_are_logged_with_route_and_parameter_shape(client, db, caplog, monkeypatch):
+    headers = auth_headers(db, "timing@example.com")
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 0)
+    with caplog.at_level(logging.WARNING, logger="backend.app.core.timing"):
+        client.get("/loads/", params={"shipper_name": "Confidential Shipper"}, headers=headers)
+
+    slow = [record.getMessage() for record in caplog.records if record.getMessage().startswith("Slow query")]
+    assert any("route=get_loads" in message for message in slow)
+    assert not any("Confidential Shipper" in message for message in slow)
+
+
+def test_requests_over_the_query_budget_are_logged(client, db, caplog, monkeypatch):
+    headers = auth_headers(db, "timing@example.com")
+    monkeypatch.setattr(settings, "SLOW_REQUEST_QUERY_COUNT", 0)
+    with caplog.at_level(logging.WARNING, logger="backend.app.core.timing"):
+        client.get("/loads/", headers=headers)
+
+    assert any(record.getMessage().startswith("Slow request GET /loads/ route=get_loads")
+               for record in caplog.records)
+
+
+def test_parameter_shape_never_includes_values():
+    assert parameter_shape({"email": "a@b.c", "limit": 5}) == "{email: str, limit: int}"
+    assert parameter_shape(("secret", 1.5)) == "(str, float)"
+    assert parameter_shape([{"id": 1}, {"id": 2}], executemany=True) == "2 x {id: int}"
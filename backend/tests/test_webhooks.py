@@ -0,0 +1,63 @@
+import asyncio
+import hashlib
+import hmac
+import json
+from backend.app.core.config import settings
+from backend.app.services import webhooks as webhooks_module
+from backend.app.services.webhooks import WebhookSender, webhook_deliveries
+
+real_sleep = asyncio.sleep
+
+
+def configure(monkeypatch, posts, failures=0):
+    monkeypatch.setattr(settings, "DETENTION_WEBHOOK_URLS", "http://hooks.test/a, http://hooks.test/b")
+    monkeypatch.setattr(settings, "DETENTION_WEBHOOK_SECRET", "s3cret")
+    monkeypatch.setattr(settings, "WEBHOOK_WORKERS", 1)
+    monkeypatch.setattr(settings, "WEBHOOK_MAX_ATTEMPTS", 3)
+    remaining = [failures]
+
+    def post(url, body, headers):
+        if remaining[0]:
+            remaining[0] -= 1
+            raise OSError("connection refused")
+        posts.append((url, body, headers))
+
+    monkeypatch.setattr(webhooks_module, "_post", post)
+    monkeypatch.setattr(webhooks_module.asyncio, "sleep", lambda _: real_sleep(0))
+
+
+async def send(expected_posts, posts):
+    sender = WebhookSender()
+    sender.start()
+    sender.deliver("free_time_expired", {"id": 7, "load_id": 3}, "7:0")
+    for _ in range(200):
+        if len(posts) >= expected_posts:
+            break
+        await real_sleep(0.01)
+    sender.stop()
+
+
+def test_payload_is_signed_and_sent_to_every_url(monkeypatch):
+    posts = []
+    configure(monkeypatch, posts)
+
+    asyncio.run(send(2, posts))
+
+    assert [url for url, _, _ in posts] == ["http://hooks.test/a", "http://hooks.test/b"]
+    _, body, headers = posts[0]
+    assert json.loads(body) == {"type": "free_time_expired", "idempotency_key": "7:0",
+                                "data": {"id": 7, "load_id": 3}}
+    assert headers["Idempotency-Key"] == "7:0"
+    assert headers["X-Signature-SHA256"] == hmac.new(b"s3cret", body, hashlib.sha256).hexdigest()
+
+
+def test_failed_post_is_retried(monkeypatch):
+    posts = []
+    configure(monkeypatch, posts, failures=2)
+    delivered = webhook_deliveries._values.get(("delivered",), 0)
+
+    asyncio.run(send(2, posts))
+
+    # Both failures hit the first URL, which succeeds on its third attempt
+    assert [url for url, _, _ in posts] == ["http://hooks.test/a", "http://hooks.test/b"]
+    assert webhook_deliveries._values.get(("delivered",), 0) == delivered + 2
@@ -12,4 +12,28 @@ api.interceptors.request.use((config) => {
   return config
 })
 
-export default api
\ No newline at end of file
+export default api
+
+export const PAGE_SIZE = 100
+
+// List endpoints return one page at a time and put the cursor for the next
+// page in X-Next-Cursor; nextCursor is null on the last page.
+export async function getPage(url, params = {}, cursor = null) {
+  const res = await api.get(url, {
+    params: { limit: PAGE_SIZE, ...params, ...(cursor ? { cursor } : {}) },
+  })
+  return { rows: res.data, nextCursor: res.headers['x-next-cursor'] || null }
+}
+
+// Follows X-Next-Cursor to the last page. Only for small, filtered lists such
+// as the driver pickers; list pages show one page at a time (usePagedList).
+export async function getAll(url, params = {}) {
+  const rows = []
+  let cursor = null
+  do {
+    const page = await getPage(url, { limit: 500, ...params }, cursor)
+    rows.push(...page.rows)
+    cursor = page.nextCursor
+  } while (cursor)
+  return rows
+}
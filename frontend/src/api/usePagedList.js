@@ -0,0 +1,42 @@
+import { useCallback, useEffect, useRef, useState } from 'react'
+import { getPage } from './axios'
+
+// One page of a list endpoint at a time. loadMore() appends the next page
+// from the cursor the server returned; changing params starts over.
+export default function usePagedList(url, params = {}) {
+  const [rows, setRows] = useState([])
+  const [cursor, setCursor] = useState(null)
+  const [loading, setLoading] = useState(true)
+  const request = useRef(0)
+  const query = JSON.stringify(params)
+
+  const fetchPage = useCallback(async (from) => {
+    // Only the latest request may update the list, so a slow page fetched
+    // for old filters cannot overwrite the new ones
+    const id = ++request.current
+    setLoading(true)
+    try {
+      const page = await getPage(url, JSON.parse(query), from)
+      if (id !== request.current) return
+      setRows((prev) => (from ? [...prev, ...page.rows] : page.rows))
+      setCursor(page.nextCursor)
+    } catch (err) {
+      console.error(err)
+    }
+    if (id === request.current) setLoading(false)
+  }, [url, query])
+
+  useEffect(() => {
+    fetchPage(null)
+  }, [fetchPage])
+
+  return {
+    rows,
+    loading,
+    hasMore: cursor !== null,
+    loadMore: () => fetchPage(cursor),
+    reload: () => fetchPage(null),
+    // Patch one loaded row in place, keeping the pages already shown
+    update: (id, changes) => setRows((prev) => prev.map((row) => (row.id === id ? { ...row, ...changes } : row))),
+  }
+}
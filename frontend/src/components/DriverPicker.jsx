@@ -0,0 +1,56 @@
+import { useEffect, useState } from 'react'
+import { getAll, getPage } from '../api/axios'
+
+const SEARCH_DELAY_MS = 250
+
+// Driver <select> with a name search. Without a search it offers the first
+// page of drivers; with one, every driver whose name starts with it.
+export default function DriverPicker({ value, onChange, emptyLabel, showLicense = false }) {
+  const [search, setSearch] = useState('')
+  const [drivers, setDrivers] = useState([])
+
+  useEffect(() => {
+    let stale = false
+    const timer = setTimeout(async () => {
+      const prefix = search.trim()
+      try {
+        const rows = prefix
+          ? await getAll('/drivers/', { name_prefix: prefix })
+          : (await getPage('/drivers/')).rows
+        if (!stale) setDrivers(rows)
+      } catch (err) {
+        console.error(err)
+      }
+    }, search ? SEARCH_DELAY_MS : 0)
+    return () => {
+      stale = true
+      clearTimeout(timer)
+    }
+  }, [search])
+
+  return (
+    <div className="space-y-2">
+      <input
+        type="text"
+        placeholder="Search drivers by name"
+        value={search}
+        onChange={(e) => setSearch(e.target.value)}
+        style={{ background: '#0f1420', border: '1px solid #2a3147', color: '#e2e8f0' }}
+        className="w-full rounded-lg px-3 py-2.5 text-sm outline-none"
+      />
+      <select
+        value={value}
+        onChange={(e) => onChange(e.target.value)}
+        style={{ background: '#0f1420', border: '1px solid #2a3147', color: '#e2e8f0' }}
+        className="w-full rounded-lg px-3 py-2.5 text-sm outline-none"
+      >
+        <option value="">{emptyLabel}</option>
+        {drivers.map((d) => (
+          <option key={d.id} value={d.id}>
+            {showLicense ? d.name + ' — ' + d.license_number : d.name}
+          </option>
+        ))}
+      </select>
+    </div>
+  )
+}
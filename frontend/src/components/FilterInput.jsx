@@ -0,0 +1,20 @@
+import { useState } from 'react'
+
+// Text filter that applies on Enter or when the field loses focus, so a list
+// is not refetched on every keystroke.
+export default function FilterInput({ placeholder, onApply }) {
+  const [value, setValue] = useState('')
+  const apply = () => onApply(value.trim())
+  return (
+    <input
+      type="text"
+      placeholder={placeholder}
+      value={value}
+      onChange={(e) => setValue(e.target.value)}
+      onKeyDown={(e) => e.key === 'Enter' && apply()}
+      onBlur={apply}
+      style={{ background: '#0f1420', border: '1px solid #2a3147', color: '#e2e8f0' }}
+      className="rounded-lg px-3 py-2 text-sm outline-none"
+    />
+  )
+}
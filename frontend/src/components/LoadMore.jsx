@@ -0,0 +1,16 @@
+// "Load more" footer for a usePagedList list; hidden on the last page.
+export default function LoadMore({ list }) {
+  if (!list.hasMore) return null
+  return (
+    <div style={{ borderTop: '1px solid #2a3147' }} className="text-center py-4">
+      <button
+        onClick={list.loadMore}
+        disabled={list.loading}
+        style={{ color: '#60a5fa' }}
+        className="text-sm font-semibold hover:opacity-70 transition"
+      >
+        {list.loading ? 'Loading...' : 'Load more'}
+      </button>
+    </div>
+  )
+}
@@ -1,9 +1,9 @@
-import { useEffect, useState } from 'react'
+import { useState } from 'react'
 import Layout from '../components/Layout'
+import DriverPicker from '../components/DriverPicker'
 import api from '../api/axios'
 
 export default function CreateDriverAccount() {
-  const [drivers, setDrivers] = useState([])
   const [form, setForm] = useState({
     email: '',
     username: '',
@@ -14,18 +14,6 @@ export default function CreateDriverAccount() {
   const [success, setSuccess] = useState('')
   const [error, setError] = useState('')
 
-  useEffect(() => {
-    const fetchDrivers = async () => {
-      try {
-        const res = await api.get('/drivers/')
-        setDrivers(res.data)
-      } catch (err) {
-        console.error(err)
-      }
-    }
-    fetchDrivers()
-  }, [])
-
   const handleSubmit = async () => {
     setError('')
     setSuccess('')
@@ -79,19 +67,12 @@ export default function CreateDriverAccount() {
             <label style={{ color: '#8892a4' }} className="text-xs uppercase tracking-widest font-semibold block mb-2">
               Assign to Driver
             </label>
-            <select
+            <DriverPicker
               value={form.driver_id}
-              onChange={(e) => setForm({ ...form, driver_id: e.target.value })}
-              style={{ background: '#0f1420', border: '1px solid #2a3147', color: '#e2e8f0' }}
-              className="w-full rounded-lg px-3 py-2.5 text-sm outline-none"
-            >
-              <option value="">-- Select Driver --</option>
-              {drivers.map((d) => (
-                <option key={d.id} value={d.id}>
-                  {d.name} — {d.license_number}
-                </option>
-              ))}
-            </select>
+              onChange={(driverId) => setForm({ ...form, driver_id: driverId })}
+              emptyLabel="-- Select Driver --"
+              showLicense
+            />
           </div>
 
           <div>
@@ -1,27 +1,18 @@
-import { useEffect, useState } from 'react'
+import { useState } from 'react'
 import Layout from '../components/Layout'
+import FilterInput from '../components/FilterInput'
+import LoadMore from '../components/LoadMore'
 import api from '../api/axios'
+import usePagedList from '../api/usePagedList'
 
 export default function Customers() {
-  const [customers, setCustomers] = useState([])
+  const [filters, setFilters] = useState({})
+  const customers = usePagedList('/customers/', filters)
   const [showForm, setShowForm] = useState(false)
   const [form, setForm] = useState({ full_name: '', email: '', phone: '' })
   const [loading, setLoading] = useState(false)
   const [error, setError] = useState('')
 
-  const fetchCustomers = async () => {
-    try {
-      const res = await api.get('/customers/')
-      setCustomers(res.data)
-    } catch (err) {
-      console.error(err)
-    }
-  }
-
-  useEffect(() => {
-    fetchCustomers()
-  }, [])
-
   const handleCreate = async () => {
     setError('')
     if (!form.full_name || !form.email) {
@@ -33,7 +24,7 @@ export default function Customers() {
       await api.post('/customers/', form)
       setForm({ full_name: '', email: '', phone: '' })
       setShowForm(false)
-      fetchCustomers()
+      customers.reload()
     } catch (err) {
       setError(err.response?.data?.detail || 'Something went wrong')
     }
@@ -43,7 +34,7 @@ export default function Customers() {
   const handleDelete = async (id) => {
     try {
       await api.delete('/customers/' + id)
-      fetchCustomers()
+      customers.reload()
     } catch (err) {
       console.error(err)
     }
@@ -123,6 +114,10 @@ export default function Customers() {
           </div>
         )}
 
+        <div className="mb-4">
+          <FilterInput placeholder="Filter by exact name" onApply={(name) => setFilters(name ? { name } : {})} />
+        </div>
+
         <div style={{ background: '#1a1f2e', border: '1px solid #2a3147' }} className="rounded-xl overflow-hidden">
           <table className="w-full">
             <thead style={{ background: '#0f1420' }}>
@@ -133,12 +128,12 @@ export default function Customers() {
               </tr>
             </thead>
             <tbody>
-              {customers.length === 0 ? (
+              {customers.rows.length === 0 ? (
                 <tr>
                   <td colSpan="5" style={{ color: '#8892a4' }} className="text-center py-12 text-sm">No customers yet</td>
                 </tr>
               ) : (
-                customers.map((c) => (
+                customers.rows.map((c) => (
                   <tr key={c.id} style={{ borderTop: '1px solid #2a3147' }}>
                     <td style={{ color: '#60a5fa' }} className="px-5 py-4 font-mono text-sm font-bold">#{c.id}</td>
                     <td className="px-5 py-4">
@@ -165,6 +160,7 @@ export default function Customers() {
               )}
             </tbody>
           </table>
+          <LoadMore list={customers} />
         </div>
 
       </div>
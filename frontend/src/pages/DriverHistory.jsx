@@ -1,24 +1,25 @@
 import { useEffect, useState } from 'react'
 import Layout from '../components/Layout'
+import LoadMore from '../components/LoadMore'
 import api from '../api/axios'
+import usePagedList from '../api/usePagedList'
+
+const NEWEST_FIRST = { order: 'desc' }
 
 export default function DriverHistory() {
-  const [events, setEvents] = useState([])
-  const [loading, setLoading] = useState(true)
+  const [totals, setTotals] = useState(null)
 
   const driverId = parseInt(localStorage.getItem('driver_id'))
+  const events = usePagedList('/detention/driver/' + driverId, NEWEST_FIRST)
+
+  const fetchTotals = async () => {
+    // Balances come from the server-side ledger, not from summing every event
+    const res = await api.get('/detention/driver/' + driverId + '/earnings')
+    setTotals(res.data.totals)
+  }
 
   useEffect(() => {
-    const fetchHistory = async () => {
-      try {
-        const res = await api.get('/detention/driver/' + driverId)
-        setEvents(res.data.reverse())
-      } catch (err) {
-        console.error(err)
-      }
-      setLoading(false)
-    }
-    fetchHistory()
+    fetchTotals().catch((err) => console.error(err))
   }, [])
 
   const formatDate = (dateStr) => {
@@ -50,20 +51,16 @@ export default function DriverHistory() {
   const handleRequestPayment = async (eventId) => {
     try {
       await api.post('/detention/' + eventId + '/request-payment')
-      const res = await api.get('/detention/driver/' + driverId)
-      setEvents(res.data.reverse())
+      events.update(eventId, { payment_status: 'requested' })
+      await fetchTotals()
     } catch (err) {
       alert(err.response?.data?.detail || 'Something went wrong')
     }
   }
 
-  const totalEarned = events
-    .filter((e) => e.status === 'completed')
-    .reduce((sum, e) => sum + e.detention_amount, 0)
-
-  const totalDetentionMinutes = events
-    .filter((e) => e.status === 'completed')
-    .reduce((sum, e) => sum + e.detention_minutes, 0)
+  const totalEvents = totals ? totals.events : 0
+  const totalEarned = totals ? totals.amount_owed : 0
+  const totalDetentionMinutes = totals ? totals.detention_minutes : 0
 
   return (
     <Layout>
@@ -76,8 +73,8 @@ export default function DriverHistory() {
 
         <div className="grid grid-cols-3 gap-4 mb-8">
           <div style={{ background: '#1a1f2e', border: '1px solid #2a3147' }} className="rounded-xl p-5">
-            <div style={{ color: '#8892a4' }} className="text-xs uppercase tracking-widest font-semibold mb-2">Total Events</div>
-            <div style={{ color: '#e2e8f0' }} className="text-3xl font-bold">{events.length}</div>
+            <div style={{ color: '#8892a4' }} className="text-xs uppercase tracking-widest font-semibold mb-2">Completed Events</div>
+            <div style={{ color: '#e2e8f0' }} className="text-3xl font-bold">{totalEvents}</div>
           </div>
           <div style={{ background: '#1a1f2e', border: '1px solid #2a3147' }} className="rounded-xl p-5">
             <div style={{ color: '#8892a4' }} className="text-xs uppercase tracking-widest font-semibold mb-2">Total Detention</div>
@@ -89,9 +86,9 @@ export default function DriverHistory() {
           </div>
         </div>
 
-        {loading ? (
+        {events.loading && events.rows.length === 0 ? (
           <div style={{ color: '#8892a4' }} className="text-center py-16 text-sm">Loading...</div>
-        ) : events.length === 0 ? (
+        ) : events.rows.length === 0 ? (
           <div style={{ background: '#1a1f2e', border: '1px solid #2a3147' }} className="rounded-xl p-16 text-center">
             <div className="text-4xl mb-3">📋</div>
             <div style={{ color: '#e2e8f0' }} className="font-bold text-lg">No detention events yet</div>
@@ -99,7 +96,7 @@ export default function DriverHistory() {
           </div>
         ) : (
           <div className="space-y-4">
-            {events.map((event) => {
+            {events.rows.map((event) => {
               const isActive = event.status === 'active'
               return (
                 <div
@@ -184,6 +181,7 @@ export default function DriverHistory() {
                 </div>
               )
             })}
+            <LoadMore list={events} />
           </div>
         )}
 
@@ -1,9 +1,13 @@
 import { useEffect, useState } from 'react'
 import Layout from '../components/Layout'
+import LoadMore from '../components/LoadMore'
 import api from '../api/axios'
+import usePagedList from '../api/usePagedList'
+
+const PENDING = { status: 'pending' }
 
 export default function DriverView() {
-  const [loads, setLoads] = useState([])
+  const loads = usePagedList('/loads/', PENDING)
   const [activeEvent, setActiveEvent] = useState(null)
   const [elapsed, setElapsed] = useState(0)
   const [loading, setLoading] = useState(false)
@@ -12,15 +16,6 @@ export default function DriverView() {
 
   const driverId = parseInt(localStorage.getItem('driver_id'))
 
-  const fetchLoads = async () => {
-    try {
-      const res = await api.get('/loads/')
-      setLoads(res.data.filter((l) => l.status === 'pending'))
-    } catch (err) {
-      console.error(err)
-    }
-  }
-
   const fetchActive = async () => {
     try {
       const res = await api.get('/detention/active')
@@ -37,7 +32,6 @@ export default function DriverView() {
   }
 
   useEffect(() => {
-    fetchLoads()
     fetchActive()
   }, [])
 
@@ -80,7 +74,7 @@ export default function DriverView() {
       })
       setActiveEvent({ ...res.data, elapsed_minutes: 0, free_time_remaining: 120 })
       setElapsed(0)
-      fetchLoads()
+      loads.reload()
     } catch (err) {
       console.error(err)
     }
@@ -95,7 +89,7 @@ export default function DriverView() {
       setActiveEvent(null)
       setElapsed(0)
       setAlert(null)
-      fetchLoads()
+      loads.reload()
     } catch (err) {
       console.error(err)
     }
@@ -155,7 +149,7 @@ export default function DriverView() {
         {!activeEvent ? (
           <div style={{ background: '#1a1f2e', border: '1px solid #2a3147' }} className="rounded-xl p-6 space-y-4">
             <h3 style={{ color: '#e2e8f0' }} className="font-semibold text-lg">Select a Load to Check In</h3>
-            {loads.length === 0 ? (
+            {loads.rows.length === 0 ? (
               <div style={{ color: '#8892a4' }} className="text-sm py-4 text-center">No loads assigned to you yet.</div>
             ) : (
               <select
@@ -165,13 +159,14 @@ export default function DriverView() {
                 className="w-full rounded-lg px-3 py-2.5 text-sm outline-none"
               >
                 <option value="">-- Select Load --</option>
-                {loads.map((load) => (
+                {loads.rows.map((load) => (
                   <option key={load.id} value={load.id}>
                     {load.load_number} — {load.shipper_name}
                   </option>
                 ))}
               </select>
             )}
+            <LoadMore list={loads} />
             <button
               onClick={handleCheckin}
               disabled={loading}
@@ -1,27 +1,18 @@
-import { useEffect, useState } from 'react'
+import { useState } from 'react'
 import Layout from '../components/Layout'
+import FilterInput from '../components/FilterInput'
+import LoadMore from '../components/LoadMore'
 import api from '../api/axios'
+import usePagedList from '../api/usePagedList'
 
 export default function Drivers() {
-  const [drivers, setDrivers] = useState([])
+  const [filters, setFilters] = useState({})
+  const drivers = usePagedList('/drivers/', filters)
   const [showForm, setShowForm] = useState(false)
   const [form, setForm] = useState({ name: '', phone: '', license_number: '' })
   const [loading, setLoading] = useState(false)
   const [error, setError] = useState('')
 
-  const fetchDrivers = async () => {
-    try {
-      const res = await api.get('/drivers/')
-      setDrivers(res.data)
-    } catch (err) {
-      console.error(err)
-    }
-  }
-
-  useEffect(() => {
-    fetchDrivers()
-  }, [])
-
   const handleCreate = async () => {
     setError('')
     if (!form.name || !form.phone || !form.license_number) {
@@ -33,7 +24,7 @@ export default function Drivers() {
       await api.post('/drivers/', form)
       setForm({ name: '', phone: '', license_number: '' })
       setShowForm(false)
-      fetchDrivers()
+      drivers.reload()
     } catch (err) {
       setError(err.response?.data?.detail || 'Something went wrong')
     }
@@ -43,7 +34,7 @@ export default function Drivers() {
   const handleDelete = async (id) => {
     try {
       await api.delete('/drivers/' + id)
-      fetchDrivers()
+      drivers.reload()
     } catch (err) {
       console.error(err)
     }
@@ -123,13 +114,17 @@ export default function Drivers() {
           </div>
         )}
 
+        <div className="mb-4">
+          <FilterInput placeholder="Name starts with" onApply={(prefix) => setFilters(prefix ? { name_prefix: prefix } : {})} />
+        </div>
+
         <div className="grid grid-cols-1 md:grid-cols-3 gap-4">
-          {drivers.length === 0 ? (
+          {drivers.rows.length === 0 ? (
             <div style={{ color: '#8892a4' }} className="col-span-3 text-center py-16 text-sm">
               No drivers yet. Add your first driver above.
             </div>
           ) : (
-            drivers.map((d) => (
+            drivers.rows.map((d) => (
               <div key={d.id} style={{ background: '#1a1f2e', border: '1px solid #2a3147' }} className="rounded-xl p-5">
                 <div className="flex items-center justify-between mb-4">
                   <div className="flex items-center gap-3">
@@ -163,6 +158,7 @@ export default function Drivers() {
             ))
           )}
         </div>
+        <LoadMore list={drivers} />
 
       </div>
     </Layout>
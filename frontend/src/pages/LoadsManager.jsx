@@ -1,38 +1,40 @@
 import { useEffect, useState } from 'react'
 import Layout from '../components/Layout'
+import DriverPicker from '../components/DriverPicker'
+import FilterInput from '../components/FilterInput'
+import LoadMore from '../components/LoadMore'
 import api from '../api/axios'
+import usePagedList from '../api/usePagedList'
+
+const STATUSES = ['pending', 'in_transit', 'completed']
 
 export default function LoadsManager() {
-  const [loads, setLoads] = useState([])
-  const [drivers, setDrivers] = useState([])
+  const [filters, setFilters] = useState({})
+  const loads = usePagedList('/loads/', filters)
+  const [driverNames, setDriverNames] = useState({})
   const [showForm, setShowForm] = useState(false)
   const [form, setForm] = useState({ load_number: '', shipper_name: '', shipper_address: '', driver_id: '' })
   const [loading, setLoading] = useState(false)
   const [error, setError] = useState('')
 
-  const fetchLoads = async () => {
-    try {
-      const res = await api.get('/loads/')
-      setLoads(res.data)
-    } catch (err) {
-      console.error(err)
-    }
-  }
+  // Only the drivers on the loaded pages are needed; look up names not seen yet
+  useEffect(() => {
+    const missing = [...new Set(loads.rows.map((load) => load.driver_id))]
+      .filter((id) => id && !(id in driverNames))
+    if (missing.length === 0) return
+    Promise.all(missing.map((id) => api.get('/drivers/' + id).then(
+      (res) => [id, res.data.name],
+      () => [id, null],
+    ))).then((names) => setDriverNames((prev) => ({ ...prev, ...Object.fromEntries(names) })))
+  }, [loads.rows, driverNames])
 
-  const fetchDrivers = async () => {
-    try {
-      const res = await api.get('/drivers/')
-      setDrivers(res.data)
-    } catch (err) {
-      console.error(err)
-    }
+  const setFilter = (name, value) => {
+    const next = { ...filters }
+    if (value) next[name] = value
+    else delete next[name]
+    setFilters(next)
   }
 
-  useEffect(() => {
-    fetchLoads()
-    fetchDrivers()
-  }, [])
-
   const handleCreate = async () => {
     setError('')
     if (!form.load_number || !form.shipper_name || !form.shipper_address) {
@@ -47,7 +49,7 @@ export default function LoadsManager() {
       })
       setForm({ load_number: '', shipper_name: '', shipper_address: '', driver_id: '' })
       setShowForm(false)
-      fetchLoads()
+      loads.reload()
     } catch (err) {
       setError(err.response?.data?.detail || 'Something went wrong')
     }
@@ -57,7 +59,7 @@ export default function LoadsManager() {
   const handleDelete = async (id) => {
     try {
       await api.delete('/loads/' + id)
-      fetchLoads()
+      loads.reload()
     } catch (err) {
       console.error(err)
     }
@@ -136,17 +138,11 @@ export default function LoadsManager() {
               </div>
               <div>
                 <label style={{ color: '#8892a4' }} className="text-xs uppercase tracking-widest font-semibold block mb-2">Assign Driver</label>
-                <select
+                <DriverPicker
                   value={form.driver_id}
-                  onChange={(e) => setForm({ ...form, driver_id: e.target.value })}
-                  style={{ background: '#0f1420', border: '1px solid #2a3147', color: '#e2e8f0' }}
-                  className="w-full rounded-lg px-3 py-2.5 text-sm outline-none"
-                >
-                  <option value="">-- Unassigned --</option>
-                  {drivers.map((d) => (
-                    <option key={d.id} value={d.id}>{d.name}</option>
-                  ))}
-                </select>
+                  onChange={(driverId) => setForm({ ...form, driver_id: driverId })}
+                  emptyLabel="-- Unassigned --"
+                />
               </div>
             </div>
             <button
@@ -160,6 +156,21 @@ export default function LoadsManager() {
           </div>
         )}
 
+        <div className="flex items-center gap-3 mb-4">
+          <select
+            value={filters.status || ''}
+            onChange={(e) => setFilter('status', e.target.value)}
+            style={{ background: '#0f1420', border: '1px solid #2a3147', color: '#e2e8f0' }}
+            className="rounded-lg px-3 py-2 text-sm outline-none"
+          >
+            <option value="">All statuses</option>
+            {STATUSES.map((status) => (
+              <option key={status} value={status}>{status.replace('_', ' ')}</option>
+            ))}
+          </select>
+          <FilterInput placeholder="Shipper name" onApply={(value) => setFilter('shipper_name', value)} />
+        </div>
+
         <div style={{ background: '#1a1f2e', border: '1px solid #2a3147' }} className="rounded-xl overflow-hidden">
           <table className="w-full">
             <thead style={{ background: '#0f1420' }}>
@@ -170,18 +181,18 @@ export default function LoadsManager() {
               </tr>
             </thead>
             <tbody>
-              {loads.length === 0 ? (
+              {loads.rows.length === 0 ? (
                 <tr>
                   <td colSpan="6" style={{ color: '#8892a4' }} className="text-center py-12 text-sm">No loads found</td>
                 </tr>
               ) : (
-                loads.map((load) => (
+                loads.rows.map((load) => (
                   <tr key={load.id} style={{ borderTop: '1px solid #2a3147' }}>
                     <td style={{ color: '#60a5fa' }} className="px-5 py-4 font-mono text-sm font-bold">{load.load_number}</td>
                     <td style={{ color: '#e2e8f0' }} className="px-5 py-4 font-medium text-sm">{load.shipper_name}</td>
                     <td style={{ color: '#8892a4' }} className="px-5 py-4 text-sm">{load.shipper_address}</td>
                     <td style={{ color: '#e2e8f0' }} className="px-5 py-4 text-sm">
-                      {drivers.find((d) => d.id === load.driver_id)?.name || 'Unassigned'}
+                      {load.driver_id ? driverNames[load.driver_id] || '—' : 'Unassigned'}
                     </td>
                     <td className="px-5 py-4">
                       <span style={statusStyle(load.status)} className="px-2 py-0.5 rounded text-xs font-semibold uppercase tracking-wide">
@@ -202,6 +213,7 @@ export default function LoadsManager() {
               )}
             </tbody>
           </table>
+          <LoadMore list={loads} />
         </div>
 
       </div>
@@ -1,27 +1,17 @@
-import { useEffect, useState } from 'react'
+import { useState } from 'react'
 import Layout from '../components/Layout'
+import LoadMore from '../components/LoadMore'
 import api from '../api/axios'
+import usePagedList from '../api/usePagedList'
 
 export default function Shipments() {
-  const [shipments, setShipments] = useState([])
+  const [filters, setFilters] = useState({})
+  const shipments = usePagedList('/shipments/', filters)
   const [showForm, setShowForm] = useState(false)
   const [form, setForm] = useState({ origin: '', destination: '', status: 'pending' })
   const [loading, setLoading] = useState(false)
   const [error, setError] = useState('')
 
-  const fetchShipments = async () => {
-    try {
-      const res = await api.get('/shipments/')
-      setShipments(res.data)
-    } catch (err) {
-      console.error(err)
-    }
-  }
-
-  useEffect(() => {
-    fetchShipments()
-  }, [])
-
   const handleCreate = async () => {
     setError('')
     if (!form.origin || !form.destination) {
@@ -33,7 +23,7 @@ export default function Shipments() {
       await api.post('/shipments/', form)
       setForm({ origin: '', destination: '', status: 'pending' })
       setShowForm(false)
-      fetchShipments()
+      shipments.reload()
     } catch (err) {
       setError(err.response?.data?.detail || 'Something went wrong')
     }
@@ -43,7 +33,7 @@ export default function Shipments() {
   const handleDelete = async (id) => {
     try {
       await api.delete('/shipments/' + id)
-      fetchShipments()
+      shipments.reload()
     } catch (err) {
       console.error(err)
     }
@@ -134,6 +124,20 @@ export default function Shipments() {
           </div>
         )}
 
+        <div className="mb-4">
+          <select
+            value={filters.status || ''}
+            onChange={(e) => setFilters(e.target.value ? { status: e.target.value } : {})}
+            style={{ background: '#0f1420', border: '1px solid #2a3147', color: '#e2e8f0' }}
+            className="rounded-lg px-3 py-2 text-sm outline-none"
+          >
+            <option value="">All statuses</option>
+            <option value="pending">Pending</option>
+            <option value="in_transit">In Transit</option>
+            <option value="delivered">Delivered</option>
+          </select>
+        </div>
+
         <div style={{ background: '#1a1f2e', border: '1px solid #2a3147' }} className="rounded-xl overflow-hidden">
           <table className="w-full">
             <thead style={{ background: '#0f1420' }}>
@@ -144,12 +148,12 @@ export default function Shipments() {
               </tr>
             </thead>
             <tbody>
-              {shipments.length === 0 ? (
+              {shipments.rows.length === 0 ? (
                 <tr>
                   <td colSpan="5" style={{ color: '#8892a4' }} className="text-center py-12 text-sm">No shipments found</td>
                 </tr>
               ) : (
-                shipments.map((s) => (
+                shipments.rows.map((s) => (
                   <tr key={s.id} style={{ borderTop: '1px solid #2a3147' }}>
                     <td style={{ color: '#60a5fa' }} className="px-5 py-4 font-mono text-sm font-bold">#{s.id}</td>
                     <td style={{ color: '#e2e8f0' }} className="px-5 py-4 text-sm">{s.origin}</td>
@@ -173,6 +177,7 @@ export default function Shipments() {
               )}
             </tbody>
           </table>
+          <LoadMore list={shipments} />
         </div>
 
       </div>
@@ -1,27 +1,18 @@
-import { useEffect, useState } from 'react'
+import { useState } from 'react'
 import Layout from '../components/Layout'
+import FilterInput from '../components/FilterInput'
+import LoadMore from '../components/LoadMore'
 import api from '../api/axios'
+import usePagedList from '../api/usePagedList'
 
 export default function Warehouses() {
-  const [warehouses, setWarehouses] = useState([])
+  const [filters, setFilters] = useState({})
+  const warehouses = usePagedList('/warehouses/', filters)
   const [showForm, setShowForm] = useState(false)
   const [form, setForm] = useState({ warehouse_name: '', city: '', country: '' })
   const [loading, setLoading] = useState(false)
   const [error, setError] = useState('')
 
-  const fetchWarehouses = async () => {
-    try {
-      const res = await api.get('/warehouses/')
-      setWarehouses(res.data)
-    } catch (err) {
-      console.error(err)
-    }
-  }
-
-  useEffect(() => {
-    fetchWarehouses()
-  }, [])
-
   const handleCreate = async () => {
     setError('')
     if (!form.warehouse_name || !form.city || !form.country) {
@@ -33,7 +24,7 @@ export default function Warehouses() {
       await api.post('/warehouses/', form)
       setForm({ warehouse_name: '', city: '', country: '' })
       setShowForm(false)
-      fetchWarehouses()
+      warehouses.reload()
     } catch (err) {
       setError(err.response?.data?.detail || 'Something went wrong')
     }
@@ -43,7 +34,7 @@ export default function Warehouses() {
   const handleDelete = async (id) => {
     try {
       await api.delete('/warehouses/' + id)
-      fetchWarehouses()
+      warehouses.reload()
     } catch (err) {
       console.error(err)
     }
@@ -123,15 +114,19 @@ export default function Warehouses() {
           </div>
         )}
 
+        <div className="mb-4">
+          <FilterInput placeholder="Filter by exact name" onApply={(name) => setFilters(name ? { name } : {})} />
+        </div>
+
         <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-4">
-          {warehouses.length === 0 ? (
+          {warehouses.rows.length === 0 ? (
             <div style={{ background: '#1a1f2e', border: '1px solid #2a3147' }} className="rounded-xl p-16 text-center col-span-3">
               <div className="text-4xl mb-3">🏢</div>
               <div style={{ color: '#e2e8f0' }} className="font-bold text-lg">No warehouses yet</div>
               <div style={{ color: '#8892a4' }} className="text-sm mt-1">Add your first warehouse location.</div>
             </div>
           ) : (
-            warehouses.map((w) => (
+            warehouses.rows.map((w) => (
               <div key={w.warehouse_id} style={{ background: '#1a1f2e', border: '1px solid #2a3147' }} className="rounded-xl p-5">
                 <div className="flex items-start justify-between mb-4">
                   <div style={{ background: '#fbbf2420', color: '#fbbf24', width: '48px', height: '48px', fontSize: '22px' }} className="rounded-xl flex items-center justify-center flex-shrink-0">
@@ -156,6 +151,7 @@ export default function Warehouses() {
             ))
           )}
         </div>
+        <LoadMore list={warehouses} />
 
       </div>
     </Layout>